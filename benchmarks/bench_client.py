@@ -0,0 +1,194 @@
+"""
+End-to-end benchmark of the client against a local mock of the Modrinth API.
+
+The mock server runs in a separate process (see ``mock_server.py``), so CPU time is measured for the
+client alone. Every scenario reports throughput, p50/p99 latency, CPU time per request and peak
+traced memory, and the results are written as JSON to track regressions between releases::
+
+    python benchmarks/bench_client.py --requests 500 --concurrency 32 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bench_models  # noqa: E402
+from mock_server import MockConfig, serve  # noqa: E402
+from modrinthpy import HedgePolicy, ModrinthClient, RateLimiter, RetryPolicy  # noqa: E402
+from modrinthpy.codec import default_codec  # noqa: E402
+from modrinthpy.models import Project, SearchResult, Version  # noqa: E402
+from payloads import project, search_hit, version  # noqa: E402
+
+SCENARIOS = ("search_projects", "get_project", "get_projects", "get_project_versions", "create_version")
+
+
+def percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def make_call(client: ModrinthClient, scenario: str, args):
+    upload = os.urandom(args.upload_size)
+    version_data = {"name": "Bench", "version_number": "1.0.0", "changelog": None, "dependencies": [],
+                    "game_versions": ["1.20.1"], "version_type": "release", "loaders": ["fabric"],
+                    "featured": False, "status": "listed", "requested_status": None,
+                    "project_id": "P0000001", "file_parts": ["file_0"]}
+    calls = {
+        "search_projects": lambda index: client.search_projects("mod", limit=args.hits, offset=index * args.hits),
+        "get_project": lambda index: client.get_project(id=f"P{index:07d}"),
+        "get_projects": lambda index: client.get_projects(
+            [f"P{index * args.ids + offset:07d}" for offset in range(args.ids)]),
+        "get_project_versions": lambda index: client.get_project_versions(id=f"P{index:07d}"),
+        "create_version": lambda index: client.create_version(
+            version_data, [("bench.jar", upload, "application/java-archive")]),
+    }
+    return calls[scenario]
+
+
+async def drive(client: ModrinthClient, call, requests: int, concurrency: int):
+    latencies = []
+    counter = iter(range(requests))
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                await call(index)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies, errors
+
+
+def run_scenario(scenario: str, base_url: str, args) -> dict:
+    async def run(traced: bool):
+        client = ModrinthClient(api_key="bench", connection_limit=args.concurrency,
+                                retry=RetryPolicy(max_attempts=3, backoff_base=0.01, backoff_cap=0.1,
+                                                  methods={"GET", "POST"}),
+                                rate_limiter=RateLimiter() if args.rate_limit_rate else None,
+                                hedge=HedgePolicy(budget=args.hedge_budget) if args.hedge else None)
+        client.BASE_URL = base_url
+        call = make_call(client, scenario, args)
+        async with client:
+            # Warm the connection pool so the first requests do not pay for connecting.
+            await drive(client, call, min(args.concurrency, args.requests), args.concurrency)
+            if traced:
+                tracemalloc.start()
+            cpu = time.process_time()
+            started = time.perf_counter()
+            latencies, errors = await drive(client, call, args.requests, args.concurrency)
+            elapsed = time.perf_counter() - started
+            cpu = time.process_time() - cpu
+            peak = tracemalloc.get_traced_memory()[1] if traced else None
+            if traced:
+                tracemalloc.stop()
+            retries = client.retry.retries
+            hedge = client.hedge.stats() if client.hedge else None
+        return latencies, errors, elapsed, cpu, peak, retries, hedge
+
+    latencies, errors, elapsed, cpu, _, retries, hedge = asyncio.run(run(False))
+    result = {
+        "scenario": scenario,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "retries": retries,
+        "seconds": elapsed,
+        "requests_per_sec": args.requests / elapsed,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p99": percentile(latencies, 0.99),
+        "cpu_per_request": cpu / args.requests,
+    }
+    if hedge is not None:
+        result["hedge"] = {key: hedge[key] for key in ("hedged", "wins", "denied", "throttled", "hedge_rate",
+                                                   "win_rate")}
+    if args.memory:
+        # Tracing slows everything down, so memory is measured in a separate run.
+        result["peak_memory_bytes"] = asyncio.run(run(True))[4]
+    return result
+
+
+def model_results(count: int) -> list:
+    results = []
+    factories = ((SearchResult, search_hit), (Project, project), (Version, version))
+    for model, factory in factories:
+        payloads = [factory(index) for index in range(count)]
+        result = max((bench_models.measure(model, payloads) for _ in range(3)),
+                     key=lambda run: run["objects_per_sec"])
+        results.append({"scenario": f"model_{model.__name__}", **result})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS + ("models",),
+                        default=list(SCENARIOS) + ["models"])
+    parser.add_argument("--requests", type=int, default=300, help="measured calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="calls in flight")
+    parser.add_argument("--latency", type=float, default=0.005, help="server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra server latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="fraction of responses delayed further")
+    parser.add_argument("--slow-latency", type=float, default=0.25, help="extra seconds of a slow response")
+    parser.add_argument("--hedge", action="store_true", help="hedge slow GET requests")
+    parser.add_argument("--hedge-budget", type=float, default=0.05, help="fraction of requests that may be hedged")
+    parser.add_argument("--hits", type=int, default=100, help="search hits per page")
+    parser.add_argument("--ids", type=int, default=50, help="projects per get_projects call")
+    parser.add_argument("--versions", type=int, default=20, help="versions per project listing")
+    parser.add_argument("--body-size", type=int, default=2000, help="characters in every project body")
+    parser.add_argument("--upload-size", type=int, default=1 << 20, help="bytes per uploaded file")
+    parser.add_argument("--model-count", type=int, default=10000, help="models built per model benchmark")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip the traced memory runs")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    config = MockConfig(args.latency, args.jitter, args.error_rate, args.rate_limit_rate,
+                        args.versions, args.body_size, slow_rate=args.slow_rate, slow_latency=args.slow_latency)
+    context = multiprocessing.get_context("spawn")
+    ready = context.Queue()
+    server = context.Process(target=serve, args=(0, config, ready), daemon=True)
+    server.start()
+    try:
+        base_url = f"http://127.0.0.1:{ready.get(timeout=30)}/v2"
+        results = [run_scenario(scenario, base_url, args) for scenario in args.scenarios if scenario != "models"]
+    finally:
+        server.terminate()
+        server.join()
+    if "models" in args.scenarios:
+        results += model_results(args.model_count)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "json_codec": default_codec().name,
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "scenarios")},
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Import-time benchmark.
+
+Runs each import statement in a fresh interpreter several times and reports the median wall time,
+plus which heavy dependencies the statement loaded. Results are printed as JSON::
+
+    python benchmarks/bench_import.py --repeat 15 --output import.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+STATEMENTS = (
+    "import modrinthpy",
+    "from modrinthpy import Project, Version",
+    "from modrinthpy import ModrinthClient",
+    "from modrinthpy import SyncModrinthClient",
+    # What the first network request adds on top.
+    "from modrinthpy import ModrinthClient; import aiohttp",
+)
+HEAVY_MODULES = ("asyncio", "aiohttp", "sqlite3", "concurrent.futures", "modrinthpy.models")
+
+PROBE = """
+import sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(elapsed, ",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure(statement: str, repeat: int) -> dict:
+    timings = []
+    loaded = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(statement=statement, heavy=HEAVY_MODULES)],
+                                cwd=ROOT, check=True, capture_output=True, text=True).stdout.split()
+        timings.append(float(output[0]))
+        loaded = output[1].split(",") if len(output) > 1 else []
+    return {
+        "statement": statement,
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "loaded": loaded,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=9, help="fresh interpreters per statement")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": [measure(statement, args.repeat) for statement in STATEMENTS],
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
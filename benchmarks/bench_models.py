@@ -0,0 +1,74 @@
+"""
+Micro-benchmark of model construction.
+
+Measures how many models are built per second from decoded API payloads and how much memory one
+instance takes, compared with a :class:`ColumnarResult` of the same payloads. Run from the repository root::
+
+    python benchmarks/bench_models.py --count 20000
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modrinthpy.columns import ColumnarResult  # noqa: E402
+from modrinthpy.models import SearchResult, Version  # noqa: E402
+from payloads import search_hit, version  # noqa: E402
+
+
+def measure(model, payloads) -> dict:
+    started = time.perf_counter()
+    for payload in payloads:
+        model(payload)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [model(payload) for payload in payloads]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the instances is not part of an instance's footprint.
+    per_object = (after - before - sys.getsizeof(kept)) / len(kept)
+    return {"model": model.__name__, "objects_per_sec": len(payloads) / elapsed, "bytes_per_object": per_object}
+
+
+def measure_retained(model, payloads) -> dict:
+    """
+    Memory kept per row once the decoded payloads are gone, as models and as one columnar result.
+    """
+    encoded = [json.dumps(payload) for payload in payloads]
+    results = {}
+    for name, build in (("models", lambda items: [model(item) for item in items]),
+                        ("columnar", lambda items: ColumnarResult.from_dicts(model, items))):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build([json.loads(item) for item in encoded])
+        results[f"{name}_bytes_per_row"] = (tracemalloc.get_traced_memory()[0] - before) / len(encoded)
+        tracemalloc.stop()
+        del kept
+    return {"model": model.__name__, **results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000, help="models built per run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per model, the best one is reported")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    for model, factory in ((SearchResult, search_hit), (Version, version)):
+        payloads = [factory(index) for index in range(args.count)]
+        best = max((measure(model, payloads) for _ in range(args.repeat)), key=lambda run: run["objects_per_sec"])
+        print(f"{best['model']:<14} {best['objects_per_sec']:>12,.0f} objects/sec {best['bytes_per_object']:>8,.0f} bytes/object")
+        retained = measure_retained(model, payloads)
+        print(f"{'':<14} {retained['models_bytes_per_row']:>8,.0f} bytes/row as models "
+              f"{retained['columnar_bytes_per_row']:>8,.0f} bytes/row columnar")
+
+
+if __name__ == "__main__":
+    main()
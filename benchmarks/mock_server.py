@@ -0,0 +1,180 @@
+"""
+Local stand-in for the Modrinth v2 endpoints used by the benchmarks.
+
+Serves ``search``, ``project/{id}``, ``projects``, ``project/{id}/version``, ``version/{id}``, ``versions``
+and ``POST version`` with configurable latency, payload sizes, error rate and 429 rate. Responses are
+encoded once per payload size and reused, so the server spends as little CPU as possible. Can be run
+on its own::
+
+    python benchmarks/mock_server.py --port 8765 --latency 0.02
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from typing import Optional
+
+from aiohttp import web
+
+from payloads import project, search_hit, version
+
+
+class MockConfig:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, versions_per_project: int = 20, body_size: int = 2000,
+                 seed: int = 0, slow_rate: float = 0.0, slow_latency: float = 0.0):
+        """
+        :param latency: Seconds every response is delayed by.
+        :param jitter: Random extra delay of up to this many seconds.
+        :param error_rate: Fraction of requests answered with 500.
+        :param rate_limit_rate: Fraction of requests answered with 429.
+        :param versions_per_project: Versions listed by ``project/{id}/version``.
+        :param body_size: Characters in the ``body`` of every project.
+        :param seed: Seed of the random failures and jitter, for reproducible runs.
+        :param slow_rate: Fraction of requests delayed by ``slow_latency`` on top, to produce a latency tail.
+        :param slow_latency: Extra seconds a slow request takes.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.versions_per_project = versions_per_project
+        self.body_size = body_size
+        self.seed = seed
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+
+
+def _json(data) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def create_app(config: Optional[MockConfig] = None) -> web.Application:
+    config = config or MockConfig()
+    rng = random.Random(config.seed)
+    app = web.Application(client_max_size=1 << 30)
+    app["config"] = config
+    app["requests"] = 0
+    rate_headers = {"X-Ratelimit-Limit": "1000000", "X-Ratelimit-Remaining": "999999", "X-Ratelimit-Reset": "60"}
+
+    versions_body = _json([version(index) for index in range(config.versions_per_project)])
+    search_pages = {}
+
+    def respond(body: bytes, status: int = 200) -> web.Response:
+        return web.Response(body=body, status=status, content_type="application/json", headers=rate_headers)
+
+    @web.middleware
+    async def faults(request, handler):
+        app["requests"] += 1
+        delay = config.latency + (rng.random() * config.jitter if config.jitter else 0.0)
+        if config.slow_rate and rng.random() < config.slow_rate:
+            delay += config.slow_latency
+        if delay:
+            await asyncio.sleep(delay)
+        roll = rng.random()
+        if roll < config.rate_limit_rate + config.error_rate:
+            # Consume the upload first, as the real API does, so the client sees the response and not a reset.
+            await request.release()
+        if roll < config.rate_limit_rate:
+            return web.Response(status=429, content_type="application/json", body=b'{"error":"ratelimited"}',
+                                headers={"X-Ratelimit-Limit": "300", "X-Ratelimit-Remaining": "0",
+                                         "X-Ratelimit-Reset": "0", "Retry-After": "0"})
+        if roll < config.rate_limit_rate + config.error_rate:
+            return web.Response(status=500, content_type="application/json",
+                                body=b'{"error":"internal","description":"injected failure"}')
+        return await handler(request)
+
+    async def search(request):
+        limit = int(request.query.get("limit", 10))
+        offset = int(request.query.get("offset", 0))
+        page = search_pages.get((offset, limit))
+        if page is None:
+            hits = [search_hit(index) for index in range(offset, offset + limit)]
+            page = search_pages[(offset, limit)] = _json(
+                {"hits": hits, "offset": offset, "limit": limit, "total_hits": 100000})
+        return respond(page)
+
+    async def get_project(request):
+        return respond(_json(project(_index(request.match_info["id"]), config.body_size)))
+
+    async def get_projects(request):
+        ids = json.loads(request.query["ids"])
+        return respond(_json([project(_index(item), config.body_size) for item in ids]))
+
+    async def get_project_versions(request):
+        return respond(versions_body)
+
+    async def get_version(request):
+        return respond(_json(version(_index(request.match_info["id"]))))
+
+    async def get_versions(request):
+        return respond(_json([version(_index(item)) for item in json.loads(request.query["ids"])]))
+
+    async def create_version(request):
+        reader = await request.multipart()
+        data = {}
+        files = []
+        async for part in reader:
+            if part.name == "data":
+                data = json.loads(await part.read())
+                continue
+            hasher = hashlib.sha1()
+            size = 0
+            while True:
+                chunk = await part.read_chunk(1 << 16)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                size += len(chunk)
+            files.append({"hashes": {"sha1": hasher.hexdigest()}, "url": f"https://cdn.modrinth.com/{part.filename}",
+                          "filename": part.filename, "primary": not files, "size": size, "file_type": None})
+        created = version(app["requests"])
+        created.update({key: value for key, value in data.items() if key in created})
+        created["files"] = files
+        return respond(_json(created))
+
+    app.middlewares.append(faults)
+    app.router.add_get("/v2/search", search)
+    app.router.add_get("/v2/project/{id}", get_project)
+    app.router.add_get("/v2/projects", get_projects)
+    app.router.add_get("/v2/project/{id}/version", get_project_versions)
+    app.router.add_get("/v2/version/{id}", get_version)
+    app.router.add_get("/v2/versions", get_versions)
+    app.router.add_post("/v2/version", create_version)
+    return app
+
+
+def _index(identifier: str) -> int:
+    digits = "".join(character for character in identifier if character.isdigit())
+    return int(digits) if digits else 0
+
+
+def serve(port: int, config: MockConfig, ready=None):
+    """
+    Runs the server until the process is terminated. ``ready`` receives the bound port.
+    """
+    async def main():
+        runner = web.AppRunner(create_app(config), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", port)
+        await site.start()
+        if ready is not None:
+            ready.put(site._server.sockets[0].getsockname()[1])
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock of the Modrinth v2 API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-latency", type=float, default=0.0)
+    args = parser.parse_args()
+    serve(args.port, MockConfig(args.latency, args.jitter, args.error_rate, args.rate_limit_rate,
+                                slow_rate=args.slow_rate, slow_latency=args.slow_latency))
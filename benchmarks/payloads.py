@@ -0,0 +1,52 @@
+"""
+Decoded API payloads shaped like real Modrinth v2 responses, shared by the benchmarks.
+"""
+
+
+def search_hit(index: int) -> dict:
+    return {
+        "slug": f"project-{index}", "title": f"Project {index}", "description": "A mod " * 8,
+        "categories": ["technology", "utility"], "client_side": "required", "server_side": "optional",
+        "project_type": "mod", "downloads": index * 7, "icon_url": "https://cdn.modrinth.com/icon.png",
+        "color": 123456, "thread_id": f"t{index}", "monetization_status": "monetized",
+        "project_id": f"P{index:07d}", "author": "someone", "display_categories": ["technology"],
+        "versions": ["1.20.1", "1.20.4"], "follows": index, "date_created": "2023-01-01T00:00:00Z",
+        "date_modified": "2024-01-01T00:00:00Z", "latest_version": "1.20.4", "license": "MIT",
+        "gallery": [], "featured_gallery": None,
+        # Fields the models do not declare, as returned by newer API versions.
+        "organization": None, "project_id_v3": f"P{index:07d}",
+    }
+
+
+def project(index: int, body_size: int = 2000) -> dict:
+    return {
+        "id": f"P{index:07d}", "slug": f"project-{index}", "title": f"Project {index}",
+        "description": "A mod " * 8, "categories": ["technology", "utility"], "client_side": "required",
+        "server_side": "optional", "body": ("Long description. " * (body_size // 18 + 1))[:body_size],
+        "status": "approved", "requested_status": None, "additional_categories": [],
+        "issues_url": "https://example.com/issues", "source_url": "https://example.com/source",
+        "wiki_url": None, "discord_url": None,
+        "donation_urls": [{"id": "patreon", "platform": "Patreon", "url": "https://patreon.com/x"}],
+        "project_type": "mod", "downloads": index * 7, "icon_url": "https://cdn.modrinth.com/icon.png",
+        "color": 123456, "thread_id": f"t{index}", "monetization_status": "monetized", "team": f"T{index:07d}",
+        "body_url": None, "moderator_message": None, "published": "2023-01-01T00:00:00Z",
+        "updated": "2024-01-01T00:00:00Z", "approved": "2023-01-02T00:00:00Z", "queued": None,
+        "followers": index, "license": {"id": "MIT", "name": "MIT License", "url": None},
+        "versions": [f"V{index:07d}"], "game_versions": ["1.20.1", "1.20.4"], "loaders": ["fabric"],
+        "gallery": [{"url": "https://cdn.modrinth.com/g.png", "featured": True, "title": "Screenshot",
+                     "description": None, "created": "2023-01-01T00:00:00Z", "ordering": 0}],
+    }
+
+
+def version(index: int, project_index: int = 2) -> dict:
+    return {
+        "name": f"Release {index}", "version_number": f"1.0.{index}", "changelog": "Fixes " * 20,
+        "dependencies": [{"version_id": None, "project_id": "P0000001", "file_name": None,
+                          "dependency_type": "required"}],
+        "game_versions": ["1.20.1"], "version_type": "release", "loaders": ["fabric"], "featured": False,
+        "status": "listed", "requested_status": None, "id": f"V{index:07d}", "project_id": f"P{project_index:07d}",
+        "author_id": "U0000001", "date_published": "2024-01-01T00:00:00Z", "downloads": index,
+        "changelog_url": None,
+        "files": [{"hashes": {"sha1": "0" * 40, "sha512": "0" * 128}, "url": "https://cdn.modrinth.com/f.jar",
+                   "filename": "f.jar", "primary": True, "size": 1024, "file_type": None}],
+    }
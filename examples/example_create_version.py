@@ -25,12 +25,16 @@ version_data = {
     }
 
 
-with open("test.jar", "rb") as f:
-        file_content = f.read()
-        files = [
-            ('test.jar', file_content, 'application/java-archive')
-        ]
+# Files are streamed from disk while the request is sent, so large jars are never loaded into memory.
+files = [
+    ('test.jar', 'test.jar', 'application/java-archive')
+]
 
-new_version = client.run(client.create_version(version_data, files))
+
+def show_progress(filename, sent, total):
+    print(f"{filename}: {sent}/{total} bytes")
+
+
+new_version = client.run(client.create_version(version_data, files, progress=show_progress))
 print(new_version)
 
@@ -1,5 +1,81 @@
-from .client import ModrinthClient
-from .utils import create_version_payload, create_project_payload
-from .models import User, Project, Version, Notification 
-from .objects import CreatableProject
-from .decorators import check_project
\ No newline at end of file
+"""
+Asynchronous client for the Modrinth API.
+
+Public names are imported on first access, so ``import modrinthpy`` does not load aiohttp or the
+models until they are used.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+_EXPORTS = {
+    "ModrinthClient": ".client",
+    "SyncModrinthClient": ".sync",
+    "BulkMutator": ".bulk",
+    "BulkReport": ".bulk",
+    "Mutation": ".bulk",
+    "ResponseCache": ".cache",
+    "SQLiteCache": ".cache",
+    "JSONCodec": ".codec",
+    "Instrumentation": ".instrumentation",
+    "RequestEvent": ".instrumentation",
+    "Priority": ".ratelimit",
+    "RateLimiter": ".ratelimit",
+    "RetryPolicy": ".retry",
+    "HedgePolicy": ".hedge",
+    "SearchIterator": ".pagination",
+    "SearchIndex": ".index",
+    "ColumnarResult": ".columns",
+    "ProjectMirror": ".mirror",
+    "Change": ".mirror",
+    "DownloadResult": ".download",
+    "HashCache": ".updates",
+    "ModUpdate": ".updates",
+    "DependencyResolver": ".resolver",
+    "Resolution": ".resolver",
+    "create_version_payload": ".utils",
+    "create_project_payload": ".utils",
+    "User": ".models",
+    "Project": ".models",
+    "Version": ".models",
+    "Notification": ".models",
+    "BulkResult": ".models",
+    "CreatableProject": ".objects",
+    "check_project": ".decorators",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .client import ModrinthClient
+    from .sync import SyncModrinthClient
+    from .bulk import BulkMutator, BulkReport, Mutation
+    from .cache import ResponseCache, SQLiteCache
+    from .codec import JSONCodec
+    from .instrumentation import Instrumentation, RequestEvent
+    from .ratelimit import Priority, RateLimiter
+    from .retry import RetryPolicy
+    from .hedge import HedgePolicy
+    from .pagination import SearchIterator
+    from .index import SearchIndex
+    from .columns import ColumnarResult
+    from .mirror import Change, ProjectMirror
+    from .download import DownloadResult
+    from .updates import HashCache, ModUpdate
+    from .resolver import DependencyResolver, Resolution
+    from .utils import create_version_payload, create_project_payload
+    from .models import User, Project, Version, Notification, BulkResult
+    from .objects import CreatableProject
+    from .decorators import check_project
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,284 @@
+import asyncio
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .exceptions import ModrinthAPIError
+from .ratelimit import Priority
+from .retry import RetryPolicy
+
+UPDATE_PROJECT = "update_project"
+DELETE_PROJECT = "delete_project"
+UPDATE_VERSION = "update_version"
+DELETE_VERSION = "delete_version"
+
+# Fields the ``PATCH projects`` endpoint can change on many projects with one request.
+BULK_PROJECT_FIELDS = frozenset({
+    "categories", "add_categories", "remove_categories",
+    "additional_categories", "add_additional_categories", "remove_additional_categories",
+    "donation_urls", "add_donation_urls", "remove_donation_urls",
+    "issues_url", "source_url", "wiki_url", "discord_url",
+})
+
+
+class Mutation:
+    """
+    One change to apply, e.g. ``Mutation.update_version("AABBCCDD", {"featured": False})``.
+    """
+
+    __slots__ = ("action", "target", "data")
+
+    METHODS = {UPDATE_PROJECT: "PATCH", DELETE_PROJECT: "DELETE", UPDATE_VERSION: "PATCH", DELETE_VERSION: "DELETE"}
+
+    def __init__(self, action: str, target: str, data: Optional[Dict[str, Any]] = None):
+        """
+        :param action: ``update_project``, ``delete_project``, ``update_version`` or ``delete_version``.
+        :param target: Project ID or slug, or version ID.
+        :param data: Fields to change, for updates.
+        """
+        if action not in self.METHODS:
+            raise ValueError(f"Unknown mutation {action!r}, expected one of {', '.join(self.METHODS)}")
+        self.action = action
+        self.target = target
+        self.data = data
+
+    @classmethod
+    def update_project(cls, project_id: str, data: Dict[str, Any]) -> "Mutation":
+        return cls(UPDATE_PROJECT, project_id, data)
+
+    @classmethod
+    def delete_project(cls, project_id: str) -> "Mutation":
+        return cls(DELETE_PROJECT, project_id)
+
+    @classmethod
+    def update_version(cls, version_id: str, data: Dict[str, Any]) -> "Mutation":
+        return cls(UPDATE_VERSION, version_id, data)
+
+    @classmethod
+    def delete_version(cls, version_id: str) -> "Mutation":
+        return cls(DELETE_VERSION, version_id)
+
+    @property
+    def method(self) -> str:
+        return self.METHODS[self.action]
+
+    @property
+    def bulk_key(self) -> Optional[Tuple]:
+        """
+        Key shared by project updates that can be sent together to the bulk endpoint, or None.
+        """
+        if self.action != UPDATE_PROJECT or not self.data or not BULK_PROJECT_FIELDS.issuperset(self.data):
+            return None
+        try:
+            return tuple(sorted((key, repr(value)) for key, value in self.data.items()))
+        except TypeError:
+            return None
+
+    def __repr__(self) -> str:
+        return f"<Mutation {self.action} {self.target}>"
+
+
+class MutationResult:
+    """
+    Outcome of one mutation.
+
+    :ivar status: ``"success"``, ``"error"`` or ``"pending"`` while the mutation has not finished.
+    :ivar result: Value returned by the client method, None for bulk and delete requests.
+    :ivar error: Exception of the last attempt when the mutation failed.
+    :ivar attempts: Number of requests made, retries included.
+    :ivar bulk: The mutation was sent together with others to a bulk endpoint.
+    """
+
+    __slots__ = ("mutation", "status", "result", "error", "attempts", "bulk")
+
+    def __init__(self, mutation: Mutation):
+        self.mutation = mutation
+        self.status = "pending"
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.attempts = 0
+        self.bulk = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "success"
+
+    @property
+    def retried(self) -> bool:
+        return self.attempts > 1
+
+    def __repr__(self) -> str:
+        return f"<MutationResult {self.status} {self.mutation.action} {self.mutation.target} attempts={self.attempts}>"
+
+
+class BulkReport(list):
+    """
+    List of :class:`MutationResult` in the order the mutations were given.
+    """
+
+    @property
+    def succeeded(self) -> List[MutationResult]:
+        return [result for result in self if result.ok]
+
+    @property
+    def failed(self) -> List[MutationResult]:
+        return [result for result in self if not result.ok]
+
+    @property
+    def retried(self) -> List[MutationResult]:
+        return [result for result in self if result.retried]
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self)
+
+    def __repr__(self) -> str:
+        return f"<BulkReport total={len(self)} failed={len(self.failed)} retried={len(self.retried)}>"
+
+
+class BulkMutator:
+    """
+    Applies a stream of mutations with bounded concurrency and reports the outcome of each one.
+
+    Project updates that only touch fields of the bulk endpoint and share the same changes are
+    grouped into ``PATCH projects`` requests. Everything else is sent one request per mutation.
+    Failed requests are retried by the mutator's retry policy only; the client's own retry policy
+    is not used for them, so ``attempts`` counts every request. A retried delete answered with 404
+    succeeded on an earlier attempt. Mutations that still fail are recorded in the report and do
+    not stop the others. Requests go through the client, so its rate limiter queues them, with
+    background priority by default.
+    """
+
+    def __init__(self, client, concurrency: int = 8, retry: Optional[RetryPolicy] = None,
+                 use_bulk_endpoints: bool = True, bulk_size: int = 500,
+                 priority: Priority = Priority.BACKGROUND):
+        """
+        :param client: Client the mutations are made with.
+        :param concurrency: Maximum number of requests in flight.
+        :param retry: Policy for retrying failed mutations. Defaults to three attempts of PATCH and DELETE
+            requests on 429, 5xx and connection errors.
+        :param use_bulk_endpoints: Group eligible project updates into bulk requests.
+        :param bulk_size: Project IDs collected before a bulk request is sent. The request is split
+            further when the IDs do not fit into one URL.
+        :param priority: Rate limiter priority of the requests.
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.retry = retry or RetryPolicy(methods=("PATCH", "DELETE"))
+        self.use_bulk_endpoints = use_bulk_endpoints
+        self.bulk_size = bulk_size
+        self.priority = priority
+        retryable_errors = getattr(client, "_retryable_errors", None)
+        self._connection_errors = retryable_errors() if retryable_errors else (ConnectionError, asyncio.TimeoutError)
+
+    def _call(self, mutation: Mutation):
+        client = self.client
+        if mutation.action == UPDATE_PROJECT:
+            return client.update_project(mutation.data, id=mutation.target)
+        if mutation.action == DELETE_PROJECT:
+            return client.delete_project(id=mutation.target)
+        if mutation.action == UPDATE_VERSION:
+            return client.update_version(mutation.target, mutation.data)
+        return client.delete_version(mutation.target)
+
+    async def _attempt(self, method: str, call, results: List[MutationResult]):
+        attempt = 0
+        while True:
+            attempt += 1
+            for result in results:
+                result.attempts = attempt
+            try:
+                with self.client.options(priority=self.priority, retry=False):
+                    value = await call()
+            except Exception as error:
+                if not _already_deleted(method, attempt, error):
+                    status = retry_after = None
+                    if isinstance(error, ModrinthAPIError):
+                        status, retry_after = error.status_code, error.retry_after
+                        retry = self.retry.retryable(method, status)
+                    else:
+                        retry = isinstance(error, self._connection_errors) and self.retry.retryable(method)
+                    if retry and attempt >= self.retry.max_attempts:
+                        self.retry.exhausted += 1
+                        retry = False
+                    if not retry:
+                        for result in results:
+                            result.status = "error"
+                            result.error = error
+                        return
+                    self.retry.retries += 1
+                    await asyncio.sleep(self.retry.backoff(attempt, retry_after))
+                    continue
+                value = None
+            for result in results:
+                result.status = "success"
+                result.result = value
+            return
+
+    async def _execute(self, results: List[MutationResult]):
+        first = results[0].mutation
+        if len(results) == 1 and not results[0].bulk:
+            await self._attempt(first.method, lambda: self._call(first), results)
+        else:
+            ids = [result.mutation.target for result in results]
+            await self._attempt("PATCH", lambda: self.client.bulk_update_projects(ids, first.data), results)
+
+    async def run(self, mutations: Union[Iterable[Mutation], AsyncIterable[Mutation]]) -> BulkReport:
+        """
+        :param mutations: Mutations to apply. An iterator or async iterator is consumed while earlier
+            mutations are running, so mutations can be streamed from a crawl or a file.
+        :return: One result per mutation, in input order.
+        """
+        report = BulkReport()
+        queue: asyncio.Queue = asyncio.Queue(self.concurrency * 2)
+        groups: Dict[Tuple, List[MutationResult]] = {}
+
+        async def worker():
+            while True:
+                job = await queue.get()
+                if job is None:
+                    return
+                await self._execute(job)
+
+        async def produce():
+            async for mutation in _aiter(mutations):
+                result = MutationResult(mutation)
+                report.append(result)
+                key = mutation.bulk_key if self.use_bulk_endpoints else None
+                if key is None:
+                    await queue.put([result])
+                    continue
+                result.bulk = True
+                group = groups.setdefault(key, [])
+                group.append(result)
+                if len(group) >= self.bulk_size:
+                    del groups[key]
+                    await queue.put(group)
+            for group in groups.values():
+                await queue.put(group)
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        try:
+            await produce()
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        return report
+
+
+def _already_deleted(method: str, attempt: int, error: Exception) -> bool:
+    """
+    A retried delete answered with 404: the server deleted the target, but the response to an
+    earlier attempt was lost.
+    """
+    return method == "DELETE" and attempt > 1 and isinstance(error, ModrinthAPIError) and error.status_code == 404
+
+
+async def _aiter(items: Union[Iterable[Any], AsyncIterable[Any]]):
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
@@ -0,0 +1,336 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .codec import JSONCodec, default_codec
+
+
+def make_cache_key(endpoint: str, params: Optional[Dict[str, Any]] = None, token: Optional[str] = None) -> str:
+    """
+    Builds a stable key for a request from its endpoint and query parameters.
+
+    :param endpoint: Endpoint relative to the API base URL.
+    :param params: Query parameters of the request.
+    :param token: Token the request is sent with. Responses to different tokens get different keys,
+        which contain a hash of the token rather than the token itself.
+    :return: Key string, e.g. ``project/sodium?a=1&b=2``.
+    """
+    key = endpoint
+    if params:
+        query = "&".join(f"{name}={params[name]}" for name in sorted(params) if params[name] is not None)
+        if query:
+            key = f"{endpoint}?{query}"
+    if token:
+        key = f"{key}#{hashlib.sha256(token.encode()).hexdigest()[:16]}"
+    return key
+
+
+class CacheEntry:
+    __slots__ = ("data", "expires_at", "etag", "last_modified")
+
+    def __init__(self, data: Any, expires_at: float,
+                 etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.data = data
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class BaseResponseCache:
+    """
+    Common part of the response caches: TTL lookup and counters.
+
+    Entries expire after a TTL chosen by the longest matching endpoint prefix in ``ttls``
+    (falling back to ``default_ttl``). Expired entries that carry an ETag or Last-Modified
+    value are kept until evicted so the client can revalidate them with a conditional request.
+    """
+
+    def __init__(self, default_ttl: float = 60.0, ttls: Optional[Dict[str, float]] = None):
+        """
+        :param default_ttl: Time to live in seconds for endpoints without an explicit TTL.
+        :param ttls: Per-endpoint TTLs keyed by endpoint prefix, e.g. ``{"project/": 300, "search": 30}``.
+        """
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def ttl_for(self, key: str) -> float:
+        best: Tuple[int, float] = (-1, self.default_ttl)
+        for prefix, ttl in self.ttls.items():
+            if key.startswith(prefix) and len(prefix) > best[0]:
+                best = (len(prefix), ttl)
+        return best[1]
+
+    def _count(self, entry: Optional[CacheEntry]) -> Optional[CacheEntry]:
+        if entry is not None and entry.fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Returns the entry stored under ``key``, fresh or stale, or None.
+        Hit and miss counters only count fresh entries as hits.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, data: Any, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> CacheEntry:
+        raise NotImplementedError
+
+    def refresh(self, key: str) -> Optional[CacheEntry]:
+        """
+        Extends the lifetime of a stale entry after the server answered 304 Not Modified.
+        """
+        raise NotImplementedError
+
+    def invalidate(self, *prefixes: str) -> int:
+        """
+        Drops every entry whose key starts with one of ``prefixes``.
+
+        :return: Number of dropped entries.
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+        }
+
+
+class ResponseCache(BaseResponseCache):
+    """
+    In-memory LRU cache for API responses.
+
+    Bodies are kept encoded and every lookup decodes its own copy, so changing a returned
+    response does not change what later lookups return.
+    """
+
+    def __init__(self, max_entries: int = 1024, default_ttl: float = 60.0,
+                 ttls: Optional[Dict[str, float]] = None, codec: Optional[JSONCodec] = None):
+        """
+        :param max_entries: Maximum number of entries kept before the least recently used is evicted.
+        :param default_ttl: Time to live in seconds for endpoints without an explicit TTL.
+        :param ttls: Per-endpoint TTLs keyed by endpoint prefix, e.g. ``{"project/": 300, "search": 30}``.
+        :param codec: JSON codec used to store the response bodies.
+        """
+        super().__init__(default_ttl, ttls)
+        self.max_entries = max_entries
+        self.codec = codec or default_codec()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        stored = self._entries.get(key)
+        if stored is None:
+            return self._count(None)
+        self._entries.move_to_end(key)
+        return self._count(CacheEntry(self.codec.loads(stored.data), stored.expires_at,
+                                      stored.etag, stored.last_modified))
+
+    def set(self, key: str, data: Any, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> CacheEntry:
+        ttl = self.ttl_for(key)
+        entry = CacheEntry(data, time.time() + ttl, etag, last_modified)
+        if ttl <= 0 and not entry.revalidatable:
+            return entry
+        self._entries[key] = CacheEntry(self.codec.dumps_bytes(data), entry.expires_at, etag, last_modified)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def refresh(self, key: str) -> Optional[CacheEntry]:
+        stored = self._entries.get(key)
+        if stored is None:
+            return None
+        stored.expires_at = time.time() + self.ttl_for(key)
+        self.revalidations += 1
+        return CacheEntry(self.codec.loads(stored.data), stored.expires_at, stored.etag, stored.last_modified)
+
+    def invalidate(self, *prefixes: str) -> int:
+        stale = [key for key in self._entries if key.startswith(prefixes)]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+
+class SQLiteCache(BaseResponseCache):
+    """
+    Persistent response cache stored in a local SQLite database.
+
+    The database runs in WAL mode, so several processes can read it while one writes, and a freshly
+    started process serves cached responses straight from disk. When the stored bodies exceed
+    ``max_bytes`` or ``max_entries``, the least recently used entries are evicted.
+    """
+
+    # Access times are written at most this often per entry, so reads rarely need a write lock.
+    TOUCH_INTERVAL = 60.0
+    # Writes between recounts of the database size, which other processes may have changed.
+    RECOUNT_INTERVAL = 256
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, max_entries: Optional[int] = None,
+                 default_ttl: float = 300.0, ttls: Optional[Dict[str, float]] = None,
+                 codec: Optional[JSONCodec] = None):
+        """
+        :param path: Database file, created if needed.
+        :param max_bytes: Maximum total size of the stored response bodies.
+        :param max_entries: Maximum number of entries, None for no limit.
+        :param default_ttl: Time to live in seconds for endpoints without an explicit TTL.
+        :param ttls: Per-endpoint TTLs keyed by endpoint prefix, e.g. ``{"project/": 3600}``.
+        :param codec: JSON codec used to store the response bodies.
+        """
+        import sqlite3
+
+        super().__init__(default_ttl, ttls)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.codec = codec or default_codec()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, expires_at REAL NOT NULL, "
+            "etag TEXT, last_modified TEXT, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._writes = 0
+        self._recount()
+
+    def _recount(self):
+        self._entry_count, self._total_bytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data, expires_at, etag, last_modified, accessed_at FROM responses WHERE key = ?",
+                (key,)).fetchone()
+            if row is None:
+                return self._count(None)
+            now = time.time()
+            if now - row[4] > self.TOUCH_INTERVAL:
+                self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return self._count(CacheEntry(self.codec.loads(row[0]), row[1], row[2], row[3]))
+
+    def set(self, key: str, data: Any, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> CacheEntry:
+        ttl = self.ttl_for(key)
+        now = time.time()
+        entry = CacheEntry(data, now + ttl, etag, last_modified)
+        if ttl <= 0 and not entry.revalidatable:
+            return entry
+        body = self.codec.dumps_bytes(data)
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, data, size, expires_at, etag, last_modified, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, body, len(body), entry.expires_at, etag, last_modified, now))
+            if previous is None:
+                self._entry_count += 1
+            self._total_bytes += len(body) - (previous[0] if previous else 0)
+            self._writes += 1
+            if self._writes % self.RECOUNT_INTERVAL == 0:
+                self._recount()
+            self._evict()
+        return entry
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes or (self.max_entries is not None
+                                                     and self._entry_count > self.max_entries):
+            # Evict in batches so a full cache does not pay for one DELETE per insert.
+            excess = self._entry_count - self.max_entries if self.max_entries is not None else 0
+            batch = max(excess, self._entry_count // 20, 1)
+            rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at LIMIT ?",
+                                    (batch,)).fetchall()
+            if not rows:
+                self._recount()
+                break
+            self._db.executemany("DELETE FROM responses WHERE key = ?", [(row[0],) for row in rows])
+            self._entry_count -= len(rows)
+            self._total_bytes -= sum(row[1] for row in rows)
+            self.evictions += len(rows)
+
+    def refresh(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            now = time.time()
+            self._db.execute("UPDATE responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                             (now + self.ttl_for(key), now, key))
+        self.revalidations += 1
+        return None
+
+    def invalidate(self, *prefixes: str) -> int:
+        dropped = 0
+        with self._lock:
+            for prefix in prefixes:
+                # Keys starting with the prefix sort between the prefix and the prefix followed by U+10FFFF.
+                dropped += self._db.execute("DELETE FROM responses WHERE key >= ? AND key < ?",
+                                            (prefix, prefix + "\U0010ffff")).rowcount
+            if dropped:
+                self._recount()
+        return dropped
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._recount()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __len__(self) -> int:
+        return self._entry_count
+
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats()
+        stats["bytes"] = self._total_bytes
+        return stats
@@ -1,63 +1,359 @@
 import asyncio
-import json
-import logging
-from typing import Dict, List, Tuple, Any, Optional
-
-import aiohttp
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, AsyncIterable, Callable, Dict, Iterable, List, Tuple, Any, Optional, Union
 
+from .bulk import BulkMutator, BulkReport, Mutation
+from .cache import BaseResponseCache, make_cache_key
+from .codec import JSONCodec, default_codec
+from .columns import ColumnarResult
 from .decorators import check_project
-from .exceptions import ModrinthAPIError, UnauthorizedError
-from .models import Project, Version, User, Notification, SearchResult
-from .utils import create_project_payload, create_version_payload
+from .download import DownloadResult, Downloader
+from .exceptions import DeadlineExceededError, HashMismatchError, ModrinthAPIError, UnauthorizedError
+from .hedge import HedgePolicy
+from .instrumentation import Instrumentation, RequestEvent, endpoint_name
+from .models import BulkResult, File, ModelProxy, Project, Version, User, Notification, SearchResult
+from .utils import chunk_ids, create_project_payload, create_version_payload
 from .objects import CreatableProject, CreatableVersion
+from .pagination import SearchIterator
+from .ratelimit import Priority, RateLimiter
+from .resolver import DependencyResolver, Resolution
+from .retry import RetryPolicy, parse_retry_after
+from .upload import ProgressCallback, UploadFile, UploadSource
+
+if TYPE_CHECKING:
+    import aiohttp
+
+    from .updates import ModUpdate
+
+# aiohttp, the upload payload and the update checker are imported on first use, so importing the
+# client stays cheap for tools that only need models or are served from a persistent cache.
+
+_call_options: ContextVar[Dict[str, Any]] = ContextVar("modrinthpy_call_options", default={})
+
+# What API methods return: models, ModelProxy views, the decoded JSON or the undecoded body.
+RESPONSE_FORMATS = ("model", "proxy", "json", "bytes")
+
+
+def _merge_hedge(event: RequestEvent, shadow: RequestEvent, won: bool):
+    """
+    Adds the work of a hedged copy to the event of the request, and its response when it won.
+    """
+    event.attempts += shadow.attempts
+    event.queue_wait += shadow.queue_wait
+    event.bytes_in += shadow.bytes_in
+    if won:
+        event.hedge_won = True
+        event.status = shadow.status
+        event.ttfb = shadow.ttfb
+        event.decode = shadow.decode
 
-logging.basicConfig(level=logging.DEBUG)
+
+def _body_size(data: Any) -> int:
+    """
+    Size of a request body in bytes, 0 when it is only known once the body is written.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    return getattr(data, "size", None) or 0
 
 
 class BaseModrinthClient:
     BASE_URL = "https://api.modrinth.com/v2"
+    # Longest encoded ``ids`` parameter sent by bulk fetches, well below common 8 KiB URL limits.
+    MAX_IDS_PARAM_LENGTH = 4000
+    # Hashes sent in one body to the bulk ``version_files`` endpoints.
+    MAX_HASHES_PER_REQUEST = 1000
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, coalesce_requests: bool = True,
+                 json_codec: Optional[JSONCodec] = None, instrumentation: Optional[Instrumentation] = None,
+                 response_format: str = "model"):
+        """
+        :param api_key: Modrinth personal access token.
+        :param coalesce_requests: Share one network call between concurrent identical GET requests.
+        :param json_codec: JSON functions for request and response bodies. Defaults to orjson or ujson
+            when installed, otherwise the standard library.
+        :param instrumentation: Opt-in request hooks and metrics, e.g. ``Instrumentation()``.
+        :param response_format: What methods return by default: ``"model"``, ``"proxy"`` for
+            :class:`ModelProxy` views, ``"json"`` for the decoded payload or ``"bytes"`` for the body as
+            received. Can be changed per call with :meth:`options`.
+        """
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"Unknown response format {response_format!r}, expected one of "
+                             f"{', '.join(RESPONSE_FORMATS)}")
         self.api_key = api_key
+        self.response_format = response_format
+        self.json_codec = json_codec or default_codec()
+        self.instrumentation = instrumentation
+        self.coalesce_requests = coalesce_requests
+        self.coalesced_requests = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
 
     def _require_api_token(self):
         """Helper method to check if API token is present"""
         if not self.api_key:
             raise UnauthorizedError("API token is required for this request")
 
-    def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+    @contextmanager
+    def options(self, **overrides):
+        """
+        Applies per-call options to every request made inside the block.
+
+        ``priority`` - :class:`Priority` used by the rate limiter queue.
+        ``deadline`` - overall time limit in seconds, overriding the client deadline. None for no limit.
+        ``hedge`` - False to never send a second copy of the requests, see :class:`HedgePolicy`.
+        ``retry`` - False to send the requests without the client's retry policy.
+        ``response_format`` - ``"model"``, ``"proxy"``, ``"json"`` or ``"bytes"``, see :class:`ModrinthClient`.
+
+        :param overrides: Option names and values.
+        """
+        token = _call_options.set({**_call_options.get(), **overrides})
+        try:
+            yield self
+        finally:
+            _call_options.reset(token)
+
+    @staticmethod
+    def _option(name: str, default: Any = None) -> Any:
+        return _call_options.get().get(name, default)
+
+    def _response_format(self) -> str:
+        return _call_options.get().get("response_format", self.response_format)
+
+    def _deadline(self) -> Optional[float]:
+        """
+        Time limit of the current call in seconds, None for no limit.
+        """
+        return self._option("deadline")
+
+    def _decoding(self):
+        """
+        Makes requests inside the block return decoded JSON in ``bytes`` format, for methods that
+        combine or inspect responses. Their result is then returned as in ``json`` format.
+        """
+        if self._response_format() == "bytes":
+            return self.options(response_format="json")
+        return nullcontext()
+
+    def _coalescing_key(self, endpoint: str, params: Any) -> str:
+        """
+        Identical requests sent with different options that change how they are sent are not shared.
+        Deadlines are not part of the key, every caller applies its own.
+        """
+        key = make_cache_key(endpoint, params)
+        if self._response_format() == "bytes":
+            key = "bytes:" + key
+        options = _call_options.get()
+        if "priority" in options or "hedge" in options:
+            key = f"{key}#{int(options.get('priority', Priority.NORMAL))}#{bool(options.get('hedge', True))}"
+        return key
+
+    async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        """
+        Performs a request. Concurrent identical GET requests are coalesced: only the first one reaches
+        :meth:`_perform_request` and every caller receives its result or exception, within its own deadline.
+        """
+        if method != "GET" or not self.coalesce_requests:
+            return await self._perform_request(method, endpoint, **kwargs)
+
+        key = self._coalescing_key(endpoint, kwargs.get("params"))
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._perform_request(method, endpoint, **kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._request_done(key, done))
+            # The deadline of the first caller is applied inside the request.
+            # A cancelled caller must not cancel the request other callers are waiting for.
+            return await asyncio.shield(task)
+
+        self.coalesced_requests += 1
+        deadline = self._deadline()
+        if deadline is None:
+            return await self._follow(task, None, method, endpoint, kwargs)
+        loop = asyncio.get_event_loop()
+        expires = loop.time() + deadline
+        try:
+            return await asyncio.wait_for(self._follow(task, expires, method, endpoint, kwargs), deadline)
+        except asyncio.TimeoutError:
+            if loop.time() >= expires:
+                raise DeadlineExceededError(deadline) from None
+            raise
+
+    async def _follow(self, task: asyncio.Future, expires: Optional[float], method: str, endpoint: str,
+                      kwargs: Dict[str, Any]) -> Any:
+        """
+        Waits for a request started by another caller. When it ran out of that caller's time while
+        this one has time left, the request is sent again for this caller alone.
+        """
+        try:
+            return await asyncio.shield(task)
+        except DeadlineExceededError:
+            if expires is not None and asyncio.get_event_loop().time() >= expires:
+                raise
+        return await self._perform_request(method, endpoint, **kwargs)
+
+    def _request_done(self, key: str, task: asyncio.Future):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _perform_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         raise NotImplementedError
 
-    async def search_projects(self, query: str, **kwargs) -> List[SearchResult]:
+    def _build(self, model: type, data: Dict[str, Any]) -> Any:
+        response_format = self._response_format()
+        if response_format != "model":
+            return ModelProxy(model, data) if response_format == "proxy" and isinstance(data, dict) else data
+        if self.instrumentation is None:
+            return model(data)
+        started = time.perf_counter()
+        result = model(data)
+        self.instrumentation.observe_build(model.__name__, time.perf_counter() - started)
+        return result
+
+    def _build_list(self, model: type, items: List[Dict[str, Any]],
+                    columnar: bool = False) -> Union[List[Any], ColumnarResult]:
+        if not columnar:
+            response_format = self._response_format()
+            if response_format == "proxy":
+                return [ModelProxy(model, item) for item in items]
+            if response_format != "model":
+                return items
+        if self.instrumentation is None:
+            return ColumnarResult.from_dicts(model, items) if columnar else [model(item) for item in items]
+        started = time.perf_counter()
+        if columnar:
+            result = ColumnarResult.from_dicts(model, items)
+            name = f"{model.__name__}[columnar]"
+        else:
+            result = [model(item) for item in items]
+            name = f"{model.__name__}[]"
+        self.instrumentation.observe_build(name, time.perf_counter() - started)
+        return result
+
+    async def search_projects(self, query: str, columnar: bool = False,
+                              **kwargs) -> Union[List[SearchResult], ColumnarResult, Dict[str, Any], bytes]:
+        """
+        :param query: Search query.
+        :param columnar: Return a :class:`ColumnarResult` instead of a list of models.
+        :param kwargs: Additional search parameters, e.g. ``facets``, ``index``, ``offset`` or ``limit``.
+        :return: The hits, or in ``json`` and ``bytes`` format the whole search response,
+            including ``total_hits``.
+        """
         response = await self._request("GET", "search", params={"query": query, **kwargs})
-        return [SearchResult(item) for item in response.get("hits", [])]
+        if isinstance(response, bytes) or (not columnar and self._response_format() == "json"):
+            return response
+        return self._build_list(SearchResult, response.get("hits", []), columnar)
+
+    def iter_search(self, query: str, page_size: int = 100, prefetch: int = 2,
+                    max_results: Optional[int] = None, **kwargs) -> SearchIterator:
+        """
+        Iterates over all search results with ``async for``, fetching following pages ahead of time.
+
+        :param query: Search query.
+        :param page_size: Hits per request, at most 100.
+        :param prefetch: Number of pages fetched ahead of the consumer.
+        :param max_results: Stop after this many hits.
+        :param kwargs: Additional search parameters, e.g. ``facets`` or ``index``.
+        """
+        return SearchIterator(self, query, page_size, prefetch, max_results, kwargs)
 
     @check_project
     async def get_project(self, id: str = None, slug: str = None) -> Project:
         response = await self._request("GET", f"project/{id or slug}")
-        return Project(response)
+        return self._build(Project, response)
+
+    async def _get_many(self, endpoint: str, ids: List[str], model: type, keys: Tuple[str, ...],
+                        concurrency: int, columnar: bool = False) -> Union[BulkResult, ColumnarResult]:
+        """
+        Fetches IDs from a bulk endpoint in URL-safe chunks with bounded parallelism.
+
+        :param keys: Response fields an item can be matched to a requested ID by.
+        :return: Models in input order with duplicates removed, plus the IDs that were not found.
+        """
+        unique = list(dict.fromkeys(ids))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(chunk: List[str]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                with self._decoding():
+                    return await self._request("GET", endpoint, params={"ids": self.json_codec.dumps(chunk)})
 
-    async def get_projects(self, ids: List[str]) -> List[Project]:
-        response = await self._request("GET", "projects", params={"ids": json.dumps(ids)})
-        return [Project(proj_data) for proj_data in response]
+        responses = await asyncio.gather(*[fetch(chunk) for chunk in chunk_ids(unique, self.MAX_IDS_PARAM_LENGTH)])
+        found = {}
+        for response in responses:
+            for item in response:
+                for key in keys:
+                    if item.get(key) is not None:
+                        found[item[key]] = item
+
+        missing = []
+        items = []
+        seen = set()
+        for item_id in unique:
+            item = found.get(item_id)
+            if item is None:
+                missing.append(item_id)
+            elif id(item) not in seen:
+                seen.add(id(item))
+                items.append(item)
+        if columnar:
+            result = self._build_list(model, items, columnar=True)
+            result.missing = missing
+            return result
+        return BulkResult(self._build_list(model, items), missing)
+
+    async def get_projects(self, ids: List[str], concurrency: int = 4,
+                           columnar: bool = False) -> Union[BulkResult, ColumnarResult]:
+        """
+        Fetches many projects by ID or slug.
+
+        :param ids: Project IDs or slugs. Long lists are split over several concurrent requests.
+        :param concurrency: Maximum number of requests in flight.
+        :param columnar: Return a :class:`ColumnarResult` instead of a list of models.
+        :return: Projects in input order; ``missing`` holds the IDs that were not found.
+        """
+        return await self._get_many("projects", ids, Project, ("id", "slug"), concurrency, columnar)
 
     @check_project
-    async def get_project_versions(self, id: str = None, slug: str = None) -> List[Version]:
-        response = await self._request("GET", f"project/{id or slug}/version")
-        return [Version(item) for item in response]
+    async def get_project_versions(self, id: str = None, slug: str = None, loaders: Optional[List[str]] = None,
+                                   game_versions: Optional[List[str]] = None,
+                                   featured: Optional[bool] = None,
+                                   columnar: bool = False) -> Union[List[Version], ColumnarResult]:
+        """
+        Lists the versions of a project, newest first.
+
+        :param loaders: Only versions supporting one of these loaders, e.g. ``["fabric"]``.
+        :param game_versions: Only versions supporting one of these game versions, e.g. ``["1.20.1"]``.
+        :param featured: Only featured or only non-featured versions.
+        :param columnar: Return a :class:`ColumnarResult` instead of a list of models.
+        """
+        params = {}
+        if loaders:
+            params["loaders"] = self.json_codec.dumps(loaders)
+        if game_versions:
+            params["game_versions"] = self.json_codec.dumps(game_versions)
+        if featured is not None:
+            params["featured"] = self.json_codec.dumps(featured)
+        response = await self._request("GET", f"project/{id or slug}/version", params=params or None)
+        return self._build_list(Version, response, columnar)
 
     async def create_project(self, data: Dict[str, Any]) -> Project:
         self._require_api_token()
-        payload = create_project_payload(data)
+        payload = create_project_payload(data, self.json_codec)
         response = await self._request("POST", "project", data=payload)
-        return Project(response)
+        return self._build(Project, response)
 
     @check_project
     async def add_gallery_image(self, ext: str, featured: bool,
                                 id: str = None, slug: str = None, **kwargs) -> Dict[str, Any]:
         self._require_api_token()
         response = await self._request("POST", f"project/{id or slug}/gallery",
-                                       params={"ext": json.dumps(ext), "featured": json.dumps(featured),
+                                       params={"ext": self.json_codec.dumps(ext),
+                                               "featured": self.json_codec.dumps(featured),
                                                "title": kwargs.get("title"), "description": kwargs.get("description"),
                                                "ordering": kwargs.get("ordering")})
         return response
@@ -66,27 +362,70 @@ class BaseModrinthClient:
     async def update_project(self, data: Dict[str, Any], id: str = None, slug: str = None) -> Project:
         self._require_api_token()
         response = await self._request("PATCH", f"project/{id or slug}", json=data)
-        return Project(response)
+        return self._build(Project, response)
 
     @check_project
-    async def update_project_icon(self, icon_file: bytes, id: str = None, slug: str = None) -> Project:
+    async def update_project_icon(self, icon_file: UploadSource, id: str = None, slug: str = None,
+                                  ext: Optional[str] = None, progress: Optional[ProgressCallback] = None) -> Project:
+        """
+        Uploads a new project icon, streaming it from disk when a path or file object is given.
+
+        :param icon_file: Path, binary file object or bytes of the image.
+        :param ext: Image extension, e.g. ``png``. Taken from the file name when omitted.
+        :param progress: Called as ``progress(name, bytes_sent, total_bytes)`` while uploading.
+        """
         self._require_api_token()
-        response = await self._request("PATCH", f"project/{id or slug}/icon", data={"icon": icon_file})
-        return Project(response)
+        from .upload import UploadPayload
+
+        icon = UploadFile(icon_file, progress=progress)
+        ext = (ext or os.path.splitext(icon.name)[1].lstrip(".") or "png").lower()
+        try:
+            response = await self._request("PATCH", f"project/{id or slug}/icon", params={"ext": ext},
+                                           data=UploadPayload(icon, content_type=f"image/{ext}"))
+        finally:
+            icon.close()
+        return self._build(Project, response)
 
     async def update_gallery_image(self, image_id: str, image_data: Dict[str, Any],
                                    id: str = None, slug: str = None) -> Dict[str, Any]:
         response = await self._request("PATCH", f"project/{id or slug}/gallery", json=image_data)
         return response
 
-    async def bulk_update_projects(self, ids: List[str], data: List[Dict[str, Any]]) -> List[Project]:
+    async def bulk_update_projects(self, ids: List[str], data: Dict[str, Any], concurrency: int = 4):
+        """
+        Applies the same changes to many projects.
+
+        :param ids: Project IDs or slugs. Long lists are split over several concurrent requests.
+        :param data: Changes supported by the bulk endpoint, e.g. ``{"add_categories": ["utility"]}``;
+            see :data:`modrinthpy.bulk.BULK_PROJECT_FIELDS`.
+        :param concurrency: Maximum number of requests in flight.
+        """
         self._require_api_token()
-        response = await self._request("PATCH", "projects", params={"ids": [",".join(ids)]}, json=data)
-        return [Project(item) for item in response]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(chunk: List[str]):
+            async with semaphore:
+                await self._request("PATCH", "projects", params={"ids": self.json_codec.dumps(chunk)}, json=data)
+
+        await asyncio.gather(*[send(chunk) for chunk in chunk_ids(list(dict.fromkeys(ids)),
+                                                                  self.MAX_IDS_PARAM_LENGTH)])
+
+    async def bulk_mutate(self, mutations: Union[Iterable[Mutation], AsyncIterable[Mutation]],
+                          concurrency: int = 8, **kwargs) -> BulkReport:
+        """
+        Applies many project and version changes, reporting the outcome of each one instead of
+        stopping at the first error. See :class:`BulkMutator` for the keyword arguments.
+
+        :param mutations: :class:`Mutation` objects, e.g. ``Mutation.update_version(id, {"featured": False})``.
+        :param concurrency: Maximum number of requests in flight.
+        :return: One :class:`MutationResult` per mutation, in input order.
+        """
+        self._require_api_token()
+        return await BulkMutator(self, concurrency, **kwargs).run(mutations)
 
     async def get_random_projects(self, count: int) -> List[Project]:
         response = await self._request("GET", "projects_random", params={"count": count})
-        return [Project(item) for item in response]
+        return self._build_list(Project, response)
 
     @check_project
     async def delete_project_icon(self, id: str = None, slug: str = None) -> Dict[str, Any]:
@@ -103,41 +442,152 @@ class BaseModrinthClient:
 
     async def get_version(self, version_id: str) -> Version:
         response = await self._request("GET", f"version/{version_id}")
-        return Version(response)
+        return self._build(Version, response)
+
+    async def get_versions(self, ids: List[str], concurrency: int = 4,
+                           columnar: bool = False) -> Union[BulkResult, ColumnarResult]:
+        """
+        Fetches many versions by ID.
+
+        :param ids: Version IDs. Long lists are split over several concurrent requests.
+        :param concurrency: Maximum number of requests in flight.
+        :param columnar: Return a :class:`ColumnarResult` instead of a list of models.
+        :return: Versions in input order; ``missing`` holds the IDs that were not found.
+        """
+        return await self._get_many("versions", ids, Version, ("id",), concurrency, columnar)
+
+    async def create_version(self, version_data: Dict[str, Any], files: List[Tuple[str, UploadSource, str]],
+                             progress: Optional[ProgressCallback] = None) -> Version:
+        """
+        Creates a version and uploads its files.
+
+        Files are streamed into the request while it is sent and hashed on the fly; the hashes are
+        compared with the ones Modrinth reports for the created version.
 
-    async def create_version(self, version_data: Dict[str, Any],
-                             files: List[Tuple[str, Tuple[str, bytes, str]]]) -> Version:
+        :param version_data: Version fields, see :class:`CreatableVersion`.
+        :param files: ``(filename, content, mime_type)`` tuples. The content may be a path, an open
+            binary file, bytes or an ``mmap``.
+        :param progress: Called as ``progress(filename, bytes_sent, total_bytes)`` while uploading.
+        :raises HashMismatchError: A file arrived with a different sha1 than was sent. The version was
+            created nonetheless; it is attached as ``error.version`` and should be deleted by the caller.
+        """
         self._require_api_token()
         version = CreatableVersion(**version_data)
-        payload = create_version_payload(version.to_dict(), files)
-        response = await self._request("POST", "version", data=payload)
-        return Version(response)
+        uploads = [(filename, UploadFile(content, name=filename, algorithms=("sha1",), progress=progress), mime_type)
+                   for filename, content, mime_type in files]
+        try:
+            payload = create_version_payload(version.to_dict(), uploads, self.json_codec)
+            with self._decoding():
+                response = await self._request("POST", "version", data=payload)
+        finally:
+            for _, upload, _ in uploads:
+                upload.close()
+
+        created = self._build(Version, response)
+        sent = {filename: upload.hexdigests()["sha1"] for filename, upload, _ in uploads}
+        for file in response.get("files") or []:
+            expected = sent.get(file.get("filename"))
+            actual = (file.get("hashes") or {}).get("sha1")
+            if expected and actual and expected != actual:
+                raise HashMismatchError(file.get("filename"), "sha1", expected, actual, version=created)
+        return created
 
     async def update_version(self, version_id: str, data: Dict[str, Any]) -> Version:
         self._require_api_token()
         response = await self._request("PATCH", f"version/{version_id}", json=data)
-        return Version(response)
+        return self._build(Version, response)
 
     async def delete_version(self, version_id: str) -> Dict[str, Any]:
         self._require_api_token()
         return await self._request("DELETE", f"version/{version_id}")
 
+    async def get_version_from_hash(self, hash: str, algorithm: str = "sha1") -> Version:
+        response = await self._request("GET", f"version_file/{hash}", params={"algorithm": algorithm})
+        return self._build(Version, response)
+
+    async def _lookup_hashes(self, endpoint: str, hashes: List[str], body: Dict[str, Any],
+                             concurrency: int = 4) -> Dict[str, Version]:
+        semaphore = asyncio.Semaphore(concurrency)
+        step = self.MAX_HASHES_PER_REQUEST
+
+        async def fetch(chunk: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                with self._decoding():
+                    return await self._request("POST", endpoint, json={**body, "hashes": chunk})
+
+        responses = await asyncio.gather(*[fetch(hashes[i:i + step]) for i in range(0, len(hashes), step)])
+        digests = [digest for response in responses for digest in response]
+        versions = self._build_list(Version, [item for response in responses for item in response.values()])
+        return dict(zip(digests, versions))
+
+    async def get_versions_from_hashes(self, hashes: List[str], algorithm: str = "sha1") -> Dict[str, Version]:
+        """
+        Finds the versions files with the given hashes belong to.
+
+        :param hashes: File hashes.
+        :param algorithm: ``sha1`` or ``sha512``.
+        :return: Versions keyed by hash; unknown hashes are left out.
+        """
+        return await self._lookup_hashes("version_files", hashes, {"algorithm": algorithm})
+
+    async def get_latest_versions_from_hashes(self, hashes: List[str], algorithm: str = "sha1",
+                                              loaders: Optional[List[str]] = None,
+                                              game_versions: Optional[List[str]] = None) -> Dict[str, Version]:
+        """
+        Finds the newest version of the project each file belongs to that matches the filters.
+
+        :param hashes: File hashes.
+        :param algorithm: ``sha1`` or ``sha512``.
+        :param loaders: Loaders the version must support, e.g. ``["fabric"]``.
+        :param game_versions: Game versions the version must support, e.g. ``["1.20.1"]``.
+        :return: Versions keyed by hash; unknown hashes are left out.
+        """
+        body = {"algorithm": algorithm, "loaders": loaders or [], "game_versions": game_versions or []}
+        return await self._lookup_hashes("version_files/update", hashes, body)
+
+    async def check_mod_updates(self, directory: str, loaders: Optional[List[str]] = None,
+                                game_versions: Optional[List[str]] = None, **kwargs) -> List["ModUpdate"]:
+        """
+        Checks every mod in a directory for updates. See :func:`modrinthpy.updates.check_updates`.
+        """
+        from .updates import check_updates
+
+        return await check_updates(self, directory, loaders, game_versions, **kwargs)
+
+    async def resolve_dependencies(self, projects: List[str] = (), versions: List[str] = (),
+                                   loaders: Optional[List[str]] = None, game_versions: Optional[List[str]] = None,
+                                   include_optional: bool = False) -> Resolution:
+        """
+        Resolves the transitive dependencies of projects or versions. See :class:`DependencyResolver`.
+
+        :param projects: Root project IDs or slugs; their latest compatible version is used.
+        :param versions: Root version IDs, used as they are.
+        :param loaders: Target loaders, e.g. ``["fabric"]``.
+        :param game_versions: Target game versions, e.g. ``["1.20.1"]``.
+        :param include_optional: Follow optional dependencies as well.
+        """
+        resolver = DependencyResolver(self, loaders, game_versions, include_optional)
+        return await resolver.resolve(projects, versions)
+
     async def get_user(self, user_id: str) -> User:
         response = await self._request("GET", f"user/{user_id}")
-        return User(response)
+        return self._build(User, response)
 
     async def get_user_projects(self, user_id: str) -> List[Project]:
         response = await self._request("GET", f"user/{user_id}/projects")
-        return [Project(item) for item in response]
+        return self._build_list(Project, response)
 
-    async def get_user_versions(self, user_id: str) -> List[Version]:
+    async def get_user_versions(self, user_id: str, columnar: bool = False) -> Union[List[Version], ColumnarResult]:
+        """
+        :param columnar: Return a :class:`ColumnarResult` instead of a list of models.
+        """
         response = await self._request("GET", f"user/{user_id}/versions")
-        return [Version(item) for item in response]
+        return self._build_list(Version, response, columnar)
 
     async def get_notifications(self) -> List[Notification]:
         self._require_api_token()
         response = await self._request("GET", "notifications")
-        return [Notification(item) for item in response]
+        return self._build_list(Notification, response)
 
     async def mark_notification_read(self, notification_id: str) -> Dict[str, Any]:
         self._require_api_token()
@@ -157,65 +607,433 @@ class BaseModrinthClient:
 
 
 class ModrinthClient(BaseModrinthClient):
-    def __init__(self, api_key: Optional[str] = None, default_output: Optional[bool] = None):
-        super().__init__(api_key)
-        self.session = None
+    # Cached endpoint prefixes that may change when an endpoint with the given first path segment is mutated.
+    # Slugs and IDs address the same resources, so whole families are dropped rather than single keys.
+    CACHE_INVALIDATION = {
+        "project": ("project/", "projects", "search", "user/", "version_file/", "version_files"),
+        "projects": ("project/", "projects", "search", "user/"),
+        "version": ("version/", "versions", "version_file/", "version_files", "project/", "user/"),
+        "notification": ("notification",),
+        "user": ("user/",),
+    }
+
+    def __init__(self, api_key: Optional[str] = None, default_output: Optional[bool] = None,
+                 cache: Optional[BaseResponseCache] = None, rate_limiter: Optional[RateLimiter] = None,
+                 max_rate_limit_waits: int = 3, retry: Optional[RetryPolicy] = None,
+                 session: Optional["aiohttp.ClientSession"] = None, connection_limit: int = 100,
+                 connection_limit_per_host: int = 0, keepalive_timeout: float = 15.0,
+                 dns_cache_ttl: Optional[int] = 300, timeout: Optional["aiohttp.ClientTimeout"] = None,
+                 coalesce_requests: bool = True, json_codec: Optional[JSONCodec] = None,
+                 instrumentation: Optional[Instrumentation] = None, response_format: str = "model",
+                 deadline: Optional[float] = None, hedge: Optional[HedgePolicy] = None):
+        """
+        :param api_key: Modrinth personal access token.
+        :param default_output: Print every decoded response.
+        :param cache: Opt-in response cache for GET requests, e.g. ``ResponseCache(ttls={"project/": 300})``
+            or the persistent ``SQLiteCache("modrinth.db")``.
+        :param rate_limiter: Opt-in scheduler that queues requests according to the ``X-Ratelimit-*`` headers.
+            A single limiter may be shared by several clients using the same token.
+        :param max_rate_limit_waits: How many times a request answered with 429 is queued again
+            before the error is raised. Only used with ``rate_limiter``.
+        :param retry: Opt-in policy for retrying transient failures, e.g. ``RetryPolicy(max_attempts=5)``.
+        :param session: Existing session to share with other code. It is not closed by :meth:`close`
+            and the connection settings below are ignored.
+        :param connection_limit: Maximum number of open connections in the pool, 0 for no limit.
+        :param connection_limit_per_host: Maximum number of open connections per host, 0 for no limit.
+        :param keepalive_timeout: Seconds an idle connection is kept open for reuse.
+        :param dns_cache_ttl: Seconds resolved addresses are cached, None to cache forever.
+        :param timeout: HTTP timeouts of the session, e.g. ``aiohttp.ClientTimeout(total=30, connect=5)``.
+        :param coalesce_requests: Share one network call between concurrent identical GET requests.
+        :param json_codec: JSON functions for request and response bodies, e.g. ``JSONCodec.stdlib()``.
+        :param instrumentation: Opt-in request hooks and metrics, e.g. ``Instrumentation()``.
+        :param response_format: What methods return: ``"model"`` (default), ``"proxy"`` for lazy
+            :class:`ModelProxy` views, ``"json"`` for the decoded payload, or ``"bytes"`` for the response
+            body as received, e.g. to forward it. Methods that combine several responses return JSON in
+            ``bytes`` format. Can be set per call with :meth:`options`. JSON and proxies share the
+            decoded data with coalesced callers, so copy it before changing it.
+        :param deadline: Time limit in seconds for every call, retries and rate limiter waits included.
+            Takes precedence over the retry policy deadline and can be set per call with :meth:`options`.
+            A call that runs out of time is cancelled and raises :class:`DeadlineExceededError`.
+        :param hedge: Opt-in policy for sending a second copy of slow reads and using whichever answers
+            first, e.g. ``HedgePolicy(percentile=0.95, budget=0.05)``.
+        """
+        super().__init__(api_key, coalesce_requests, json_codec, instrumentation, response_format)
+        self.session = session
+        self._owns_session = session is None
+        self._session_lock: Optional[asyncio.Lock] = None
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
         self.default_output = default_output
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.max_rate_limit_waits = max_rate_limit_waits
+        self.retry = retry
+        self.deadline = deadline
+        self.hedge = hedge
 
-    async def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            if self.api_key:
-                self.session.headers.update({"Authorization": self.api_key})
+    def _deadline(self) -> Optional[float]:
+        deadline = self.deadline
+        if deadline is None and self.retry is not None:
+            deadline = self.retry.deadline
+        return self._option("deadline", deadline)
+
+    @staticmethod
+    def _retryable_errors() -> Tuple[type, ...]:
+        import aiohttp
+
+        return aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError
+
+    def _create_session(self) -> "aiohttp.ClientSession":
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.connection_limit,
+                                         limit_per_host=self.connection_limit_per_host,
+                                         keepalive_timeout=self.keepalive_timeout,
+                                         ttl_dns_cache=self.dns_cache_ttl,
+                                         use_dns_cache=True)
+        return aiohttp.ClientSession(connector=connector, timeout=self.timeout or aiohttp.client.DEFAULT_TIMEOUT)
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        session = self.session
+        if session is not None and not session.closed:
+            return session
+        if not self._owns_session:
+            raise RuntimeError("The session passed to ModrinthClient is closed")
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            if self.session is None or self.session.closed:
+                self.session = self._create_session()
+        return self.session
+
+    def _invalidate_cache(self, endpoint: str):
+        prefixes = self.CACHE_INVALIDATION.get(endpoint.split("/", 1)[0])
+        if prefixes:
+            self.cache.invalidate(*prefixes)
+
+    async def _perform_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return await self._fetch(method, endpoint, None, **kwargs)
+        event = instrumentation.start(method, endpoint)
+        try:
+            return await self._fetch(method, endpoint, event, **kwargs)
+        except BaseException as error:
+            event.error = error
+            raise
+        finally:
+            instrumentation.finish(event)
+
+    async def _fetch(self, method: str, endpoint: str, event: Optional[RequestEvent], **kwargs) -> Dict[str, Any]:
+        if self.api_key:
+            kwargs["headers"] = {"Authorization": self.api_key, **kwargs.get("headers", {})}
+        if "json" in kwargs:
+            kwargs["data"] = self.json_codec.dumps_bytes(kwargs.pop("json"))
+            kwargs["headers"] = {"Content-Type": "application/json", **kwargs.get("headers", {})}
+        if event is not None:
+            event.bytes_out = _body_size(kwargs.get("data"))
+
+        cache_key = None
+        cached = None
+        if self.cache is not None and method == "GET":
+            cache_key = make_cache_key(endpoint, kwargs.get("params"), self.api_key)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if cached.fresh:
+                    if event is not None:
+                        event.cached = True
+                    return self._cached_response(cached.data)
+                if cached.revalidatable:
+                    kwargs["headers"] = {**cached.conditional_headers(), **kwargs.get("headers", {})}
+                else:
+                    cached = None
 
         url = f"{self.BASE_URL}/{endpoint}"
-        logging.debug(f"Request URL: {url}")
-        logging.debug(f"Request Method: {method}")
-        logging.debug(f"Request Headers: {kwargs.get('headers', {})}")
-        logging.debug(f"Request Data: {kwargs.get('data', {})}")
-        async with self.session.request(method, url, **kwargs) as response:
-            if response.status == 401:
-                raise UnauthorizedError((await response.json()).get("description"))
-            if response.status not in (200, 204):
-                try:
-                    error_message = (await response.json()).get("description", "No description")
-                except aiohttp.ContentTypeError:
-                    error_message = await response.text()
-                raise ModrinthAPIError(response.status, error_message)
+        try:
+            status, headers, json_data = await self._send(method, url, event, **kwargs)
+        finally:
+            if self.cache is not None and method != "GET":
+                self._invalidate_cache(endpoint)
+
+        if status == 304 and cached is not None:
+            self.cache.refresh(cache_key)
+            return self._cached_response(cached.data)
+        # Undecoded bodies are not cached, the cache holds decoded responses only.
+        if cache_key is not None and status == 200 and not isinstance(json_data, bytes):
+            self.cache.set(cache_key, json_data,
+                           etag=headers.get("ETag"),
+                           last_modified=headers.get("Last-Modified"))
+
+        if self.default_output and json_data:
+            if isinstance(json_data, list):
+                for item in json_data:
+                    print(item)
+            else:
+                print(json_data)
+
+        return json_data
+
+    def _cached_response(self, data: Any) -> Any:
+        if self._response_format() == "bytes":
+            return self.json_codec.dumps_bytes(data)
+        return data
+
+    async def _send(self, method: str, url: str, event: Optional[RequestEvent] = None,
+                    **kwargs) -> Tuple[int, Any, Any]:
+        """
+        Sends a request, retrying it according to the retry policy within the call deadline.
+
+        :return: Status code, response headers and decoded body.
+        """
+        deadline = self._deadline()
+        if deadline is None:
+            return await self._send_with_retries(method, url, None, event, **kwargs)
+
+        loop = asyncio.get_event_loop()
+        expires = loop.time() + deadline
+        try:
+            return await asyncio.wait_for(self._send_with_retries(method, url, expires, event, **kwargs), deadline)
+        except asyncio.TimeoutError:
+            if loop.time() >= expires:
+                raise DeadlineExceededError(deadline) from None
+            raise
+
+    async def _send_with_retries(self, method: str, url: str, expires: Optional[float],
+                                 event: Optional[RequestEvent] = None, **kwargs) -> Tuple[int, Any, Any]:
+        policy = self.retry if self._option("retry", True) else None
+        attempt = 0
+        while True:
+            attempt += 1
             try:
-                json_data = await response.json()
-            except aiohttp.ContentTypeError:
-                json_data = {}
-
-            if self.default_output and json_data:
-                if isinstance(json_data, list):
-                    for item in json_data:
-                        print(item)
-                else:
-                    print(json_data)
+                if self.hedge is None:
+                    return await self._send_once(method, url, event, **kwargs)
+                return await self._send_hedged(method, url, event, **kwargs)
+            except ModrinthAPIError as error:
+                delay = self._retry_delay(policy, method, attempt, error.status_code, error.retry_after)
+                if delay is None or (expires is not None and asyncio.get_event_loop().time() + delay >= expires):
+                    raise
+            except self._retryable_errors():
+                delay = self._retry_delay(policy, method, attempt)
+                if delay is None or (expires is not None and asyncio.get_event_loop().time() + delay >= expires):
+                    raise
+            policy.retries += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _retry_delay(policy: Optional[RetryPolicy], method: str, attempt: int, status: Optional[int] = None,
+                     retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Backoff before the next attempt of a failed request, None when it is not retried.
+        Retryable failures that used up every attempt are counted as exhausted.
+        """
+        if policy is None or not policy.retryable(method, status):
+            return None
+        if attempt >= policy.max_attempts:
+            policy.exhausted += 1
+            return None
+        return policy.backoff(attempt, retry_after)
+
+    async def _send_hedged(self, method: str, url: str, event: Optional[RequestEvent] = None,
+                           **kwargs) -> Tuple[int, Any, Any]:
+        """
+        Sends one request, and a second copy of it when the first one is slower than the hedge delay.
+        Returns the first successful response and cancels the other copy.
+
+        The delay starts once the first request got its rate limiter slot, so time spent queued is
+        not taken for a slow response, and no copy is sent while the rate limiter is queueing requests.
+
+        :return: Status code, response headers and decoded body.
+        """
+        policy = self.hedge
+        route = event.endpoint if event is not None else endpoint_name(method, url[len(self.BASE_URL) + 1:])
+        if not policy.applies(method, route) or not self._option("hedge", True):
+            return await self._send_once(method, url, event, **kwargs)
+
+        loop = asyncio.get_event_loop()
+        sent = loop.create_future()
+
+        def on_send():
+            if not sent.done():
+                sent.set_result(loop.time())
+
+        def observe(task: asyncio.Future):
+            # A copy cancelled because the other one won still tells that the latency was at least this long.
+            if sent.done() and (task.cancelled() or task.exception() is None):
+                policy.observe(route, loop.time() - sent.result())
+
+        delay = policy.delay(route)
+        primary = asyncio.ensure_future(self._send_once(method, url, event, on_send=on_send, **kwargs))
+        primary.add_done_callback(observe)
+        tasks = [primary]
+        shadow = None
+        try:
+            done, _ = await asyncio.wait([primary, sent], return_when=asyncio.FIRST_COMPLETED)
+            if primary not in done:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+            limiter = self.rate_limiter
+            if not done and limiter is not None and limiter.saturated:
+                policy.throttled += 1
+            elif not done and policy.acquire():
+                # The copy records into its own event, so the two responses do not mix their timings.
+                if event is not None:
+                    shadow = RequestEvent(method, event.path)
+                    event.hedged = True
+                tasks.append(asyncio.ensure_future(self._send_once(method, url, shadow, **kwargs)))
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task not in done:
+                        continue
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    if task is not primary:
+                        policy.wins += 1
+                    if shadow is not None:
+                        _merge_hedge(event, shadow, task is not primary)
+                    return task.result()
+            if shadow is not None:
+                _merge_hedge(event, shadow, False)
+            raise error
+        finally:
+            if not sent.done():
+                sent.cancel()
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Marks a failure of the losing copy as retrieved.
+                    task.exception()
 
-            return json_data
+    async def _send_once(self, method: str, url: str, event: Optional[RequestEvent] = None,
+                         on_send: Optional[Callable[[], Any]] = None, **kwargs) -> Tuple[int, Any, Any]:
+        """
+        Sends one request through the rate limiter, queueing it again when the server answers 429.
+
+        :param on_send: Called every time the request leaves the rate limiter queue.
+        :return: Status code, response headers and decoded body.
+        """
+        session = await self._get_session()
+        limiter = self.rate_limiter
+        priority = self._option("priority", Priority.NORMAL)
+        waits = 0
+        while True:
+            if event is not None:
+                event.attempts += 1
+                queued = time.perf_counter()
+            if limiter is not None:
+                await limiter.acquire(priority)
+            if on_send is not None:
+                on_send()
+            if event is not None:
+                sent = time.perf_counter()
+                event.queue_wait += sent - queued
+            released = False
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    if event is not None:
+                        event.ttfb = time.perf_counter() - sent
+                        event.status = response.status
+                    if limiter is not None:
+                        limiter.release(response.headers, limited=response.status == 429)
+                        released = True
+                        if response.status == 429 and waits < self.max_rate_limit_waits:
+                            waits += 1
+                            continue
+                    return response.status, response.headers, await self._read_response(response, event)
+            finally:
+                if limiter is not None and not released:
+                    limiter.release()
+
+    async def _read_response(self, response: "aiohttp.ClientResponse", event: Optional[RequestEvent] = None) -> Any:
+        """
+        Reads the body once as bytes and decodes it with the client's JSON codec, unless the
+        response format is ``bytes``.
+        """
+        if response.status == 304:
+            return None
+        body = await response.read()
+        if event is not None:
+            event.bytes_in += len(body)
+        is_json = response.content_type.endswith("json")
+        if response.status == 401 or response.status not in (200, 204):
+            try:
+                error = self.json_codec.loads(body) if is_json else None
+            except ValueError:
+                error = None
+            if isinstance(error, dict):
+                error_message = error.get("description", "No description")
+            else:
+                error_message = body.decode(response.charset or "utf-8", "replace")
+            if response.status == 401:
+                raise UnauthorizedError(error_message)
+            raise ModrinthAPIError(response.status, error_message, parse_retry_after(response.headers))
+        if self._response_format() == "bytes":
+            return body
+        if not body or not is_json:
+            return {}
+        if event is None:
+            return self.json_codec.loads(body)
+        started = time.perf_counter()
+        data = self.json_codec.loads(body)
+        event.decode = time.perf_counter() - started
+        return data
+
+    async def download_files(self, files: List[File], directory: str, concurrency: int = 4,
+                             verify: bool = True, resume: bool = True) -> List[DownloadResult]:
+        """
+        Streams files to disk over the client's connection pool, verifying their hashes on the fly.
+
+        :param files: :class:`File` models or raw file dictionaries, e.g. ``version.files``.
+        :param directory: Target directory, created if needed.
+        :param concurrency: Maximum number of files downloaded at the same time.
+        :param verify: Check the sha512 or sha1 hash of every file.
+        :param resume: Continue ``.part`` files left by an interrupted download with a Range request.
+        :return: One :class:`DownloadResult` per file, in input order.
+        """
+        downloader = Downloader(await self._get_session(), concurrency, verify=verify, resume=resume)
+        return await downloader.download(files, directory)
+
+    async def download_version(self, version: Version, directory: str, primary_only: bool = False,
+                               **kwargs) -> List[DownloadResult]:
+        """
+        Downloads the files of a version. See :meth:`download_files` for the keyword arguments.
+
+        :param version: Version to download.
+        :param directory: Target directory, created if needed.
+        :param primary_only: Download only the primary file.
+        """
+        files = version.files or []
+        if primary_only:
+            files = [file for file in files if file.primary] or files[:1]
+        return await self.download_files(files, directory, **kwargs)
 
     async def start(self):
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            if self.api_key:
-                self.session.headers.update({"Authorization": self.api_key})
+        await self._get_session()
 
     async def close(self):
-        if self.session:
+        if self.session is not None and self._owns_session:
             await self.session.close()
+            self.session = None
+        self._session_lock = None
 
     def run(self, coro):
-        try:
-            asyncio.run(coro)
-        finally:
-            if self.session and not self.session.closed:
-                asyncio.run(self.close())
+        async def runner():
+            try:
+                return await coro
+            finally:
+                await self.close()
+
+        return asyncio.run(runner())
 
     async def __aenter__(self):
+        await self.start()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        await self.close()
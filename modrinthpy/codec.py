@@ -0,0 +1,69 @@
+import json
+from typing import Any, Callable, Optional, Union
+
+
+class JSONCodec:
+    """
+    Pair of JSON functions used for every request and response body.
+
+    ``loads`` must accept ``bytes``; ``dumps`` may return ``str`` or ``bytes``.
+    """
+
+    def __init__(self, loads: Callable[[Union[bytes, str]], Any], dumps: Callable[[Any], Union[str, bytes]],
+                 name: str = "custom"):
+        """
+        :param loads: Function decoding a JSON document.
+        :param dumps: Function encoding an object as a compact JSON document.
+        :param name: Name shown in ``repr``.
+        """
+        self._loads = loads
+        self._dumps = dumps
+        self.name = name
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        data = self._dumps(obj)
+        return data.decode() if isinstance(data, bytes) else data
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        data = self._dumps(obj)
+        return data if isinstance(data, bytes) else data.encode()
+
+    def __repr__(self) -> str:
+        return f"<JSONCodec {self.name}>"
+
+    @classmethod
+    def stdlib(cls) -> "JSONCodec":
+        return cls(json.loads, lambda obj: json.dumps(obj, separators=(",", ":"), ensure_ascii=False), "json")
+
+    @classmethod
+    def orjson(cls) -> "JSONCodec":
+        import orjson
+        return cls(orjson.loads, orjson.dumps, "orjson")
+
+    @classmethod
+    def ujson(cls) -> "JSONCodec":
+        import ujson
+        return cls(ujson.loads, lambda obj: ujson.dumps(obj, ensure_ascii=False), "ujson")
+
+
+_default_codec: Optional[JSONCodec] = None
+
+
+def default_codec() -> JSONCodec:
+    """
+    Returns the fastest installed codec: orjson, then ujson, then the standard library.
+    """
+    global _default_codec
+    if _default_codec is None:
+        for factory in (JSONCodec.orjson, JSONCodec.ujson):
+            try:
+                _default_codec = factory()
+                break
+            except ImportError:
+                continue
+        else:
+            _default_codec = JSONCodec.stdlib()
+    return _default_codec
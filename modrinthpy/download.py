@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .exceptions import HashMismatchError
+from .models import File
+
+# Strongest algorithm first; the first one present in ``File.hashes`` is verified.
+HASH_ALGORITHMS = ("sha512", "sha1")
+CHUNK_SIZE = 1 << 16
+
+
+class DownloadResult:
+    """
+    Outcome of downloading one file.
+
+    ``status`` is ``"downloaded"``, ``"resumed"`` (continued from a partial download) or
+    ``"skipped"`` (the file on disk already had the expected hash).
+    """
+
+    __slots__ = ("file", "path", "status", "bytes_downloaded")
+
+    def __init__(self, file: File, path: str, status: str, bytes_downloaded: int = 0):
+        self.file = file
+        self.path = path
+        self.status = status
+        self.bytes_downloaded = bytes_downloaded
+
+    def __repr__(self) -> str:
+        return f"<DownloadResult {self.status} path={self.path} bytes={self.bytes_downloaded}>"
+
+
+def _expected_hash(file: File) -> Tuple[Optional[str], Optional[str]]:
+    hashes = file.hashes or {}
+    for algorithm in HASH_ALGORITHMS:
+        if hashes.get(algorithm):
+            return algorithm, hashes[algorithm].lower()
+    return None, None
+
+
+def _hash_file(path: str, algorithm: str, limit: Optional[int] = None) -> "hashlib._Hash":
+    hasher = hashlib.new(algorithm)
+    remaining = limit
+    with open(path, "rb") as stream:
+        while remaining is None or remaining > 0:
+            chunk = stream.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return hasher
+
+
+class Downloader:
+    """
+    Streams version files to disk over a shared session.
+
+    Files are written in chunks and hashed while they stream, so no file is held in memory.
+    A partial download is kept as ``<name>.part`` and continued with an HTTP Range request
+    the next time, and files already on disk with the expected hash are not downloaded again.
+    """
+
+    def __init__(self, session, concurrency: int = 4, chunk_size: int = CHUNK_SIZE,
+                 verify: bool = True, resume: bool = True):
+        """
+        :param session: ``aiohttp.ClientSession`` used for the downloads.
+        :param concurrency: Maximum number of files downloaded at the same time.
+        :param chunk_size: Bytes read from the network and written to disk at a time.
+        :param verify: Check the sha512 or sha1 hash of every file.
+        :param resume: Continue partial downloads instead of starting over.
+        """
+        self.session = session
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self.verify = verify
+        self.resume = resume
+
+    async def download(self, files: Iterable[Union[File, Dict[str, Any]]], directory: str) -> List[DownloadResult]:
+        """
+        Downloads files into ``directory``, which is created if needed.
+
+        :raises HashMismatchError: A downloaded file does not match its expected hash.
+        :return: One result per file, in input order.
+        """
+        os.makedirs(directory, exist_ok=True)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(file: File) -> DownloadResult:
+            async with semaphore:
+                return await self.download_file(file, directory)
+
+        tasks = [asyncio.ensure_future(run(file if isinstance(file, File) else File(file))) for file in files]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def download_file(self, file: File, directory: str) -> DownloadResult:
+        loop = asyncio.get_event_loop()
+        path = os.path.join(directory, os.path.basename(file.filename or file.url.rsplit("/", 1)[-1]))
+        partial = path + ".part"
+        algorithm, expected = _expected_hash(file) if self.verify else (None, None)
+
+        if expected and os.path.exists(path) and (file.size is None or os.path.getsize(path) == file.size):
+            existing = await loop.run_in_executor(None, _hash_file, path, algorithm)
+            if existing.hexdigest() == expected:
+                return DownloadResult(file, path, "skipped")
+
+        offset = 0
+        hasher = hashlib.new(algorithm) if expected else None
+        if self.resume and os.path.exists(partial):
+            offset = os.path.getsize(partial)
+            if file.size is not None and offset > file.size:
+                offset = 0
+            elif hasher is not None and offset:
+                hasher = await loop.run_in_executor(None, _hash_file, partial, algorithm, offset)
+
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        async with self.session.get(file.url, headers=headers) as response:
+            if response.status == 416 and offset:
+                # The server can't serve the range, so the partial file is unusable.
+                response.release()
+                os.remove(partial)
+                return await self.download_file(file, directory)
+            response.raise_for_status()
+            resumed = offset > 0 and response.status == 206
+            if not resumed:
+                offset = 0
+                hasher = hashlib.new(algorithm) if expected else None
+
+            downloaded = 0
+            with open(partial, "ab" if resumed else "wb") as stream:
+                async for chunk in response.content.iter_chunked(self.chunk_size):
+                    stream.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    downloaded += len(chunk)
+
+        if hasher is not None and hasher.hexdigest() != expected:
+            os.remove(partial)
+            raise HashMismatchError(path, algorithm, expected, hasher.hexdigest())
+        os.replace(partial, path)
+        return DownloadResult(file, path, "resumed" if resumed else "downloaded", downloaded)
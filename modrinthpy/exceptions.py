@@ -1,7 +1,8 @@
 class ModrinthAPIError(Exception):
-    def __init__(self, status_code, message):
+    def __init__(self, status_code, message, retry_after=None):
         self.status_code = status_code
         self.message = message
+        self.retry_after = retry_after
         super().__init__(f"Modrinth API Error ({status_code}) - {message}")
 
 
@@ -14,3 +15,20 @@ class MissingArguments(Exception):
 class UnauthorizedError(Exception):
     def __init__(self, message):
         super().__init__(message)
+
+
+class DeadlineExceededError(Exception):
+    def __init__(self, deadline):
+        self.deadline = deadline
+        super().__init__(f"Request did not complete within {deadline} seconds")
+
+
+class HashMismatchError(Exception):
+    def __init__(self, path, algorithm, expected, actual, version=None):
+        self.path = path
+        self.algorithm = algorithm
+        self.expected = expected
+        self.actual = actual
+        # Version that was created with the corrupt file, when raised by an upload.
+        self.version = version
+        super().__init__(f"{algorithm} of {path} is {actual}, expected {expected}")
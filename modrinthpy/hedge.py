@@ -0,0 +1,114 @@
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Optional
+
+
+class _Latencies:
+    __slots__ = ("samples", "pending", "delay")
+
+    def __init__(self, window: int):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.pending = 0
+        self.delay: Optional[float] = None
+
+
+class HedgePolicy:
+    """
+    Decides when a slow read is sent a second time.
+
+    When no response arrived after the hedge delay, the same request is sent again and whichever copy
+    answers first is used; the other one is cancelled. The delay is a percentile of the latencies
+    recently observed for the endpoint, clamped between ``min_delay`` and ``max_delay``, so only the
+    slowest requests are duplicated. Until ``min_samples`` latencies were seen, ``max_delay`` is used.
+
+    Hedges are paid from a budget: every eligible request earns ``budget`` tokens, up to ``burst``,
+    and every hedge spends one, so no more than that fraction of the traffic is ever sent twice.
+    The delay counts from when the request left the client's rate limiter, and no hedge is sent
+    while the rate limiter is queueing requests.
+    """
+
+    def __init__(self, percentile: float = 0.95, min_delay: float = 0.01, max_delay: float = 1.0,
+                 budget: float = 0.05, burst: float = 10.0, methods: Iterable[str] = ("GET",),
+                 endpoints: Optional[Iterable[str]] = None, window: int = 500, min_samples: int = 20):
+        """
+        :param percentile: Fraction of requests expected to answer before a hedge is sent.
+        :param min_delay: Lower bound in seconds of the hedge delay.
+        :param max_delay: Upper bound in seconds of the hedge delay.
+        :param budget: Fraction of requests that may be hedged.
+        :param burst: Most hedges that may be sent in a row when tokens were saved up.
+        :param methods: HTTP methods that are hedged. Only use idempotent methods.
+        :param endpoints: Routes that are hedged, e.g. ``{"GET project/{id}", "GET version/{id}"}``.
+            None hedges every request of the given methods.
+        :param window: Latencies kept per route to compute the percentile from.
+        :param min_samples: Latencies needed before the percentile is used.
+        """
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.burst = burst
+        self.methods = frozenset(method.upper() for method in methods)
+        self.endpoints = frozenset(endpoints) if endpoints is not None else None
+        self.window = window
+        self.min_samples = min_samples
+        self.tokens = 0.0
+        self.requests = 0
+        self.hedged = 0
+        self.wins = 0
+        self.denied = 0
+        self.throttled = 0
+        self._latencies: Dict[str, _Latencies] = {}
+
+    def applies(self, method: str, route: str) -> bool:
+        """
+        :param method: HTTP method of the request.
+        :param route: Route name, e.g. ``GET project/{id}``.
+        """
+        return method in self.methods and (self.endpoints is None or route in self.endpoints)
+
+    def delay(self, route: str) -> float:
+        """
+        Counts an eligible request and returns how long to wait for it before hedging.
+        """
+        self.requests += 1
+        self.tokens = min(self.burst, self.tokens + self.budget)
+        latencies = self._latencies.get(route)
+        if latencies is None or len(latencies.samples) < self.min_samples:
+            return self.max_delay
+        # Sorting the window on every request would cost more than the rest of the bookkeeping.
+        if latencies.delay is None or latencies.pending >= 16:
+            ordered = sorted(latencies.samples)
+            value = ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+            latencies.delay = min(max(value, self.min_delay), self.max_delay)
+            latencies.pending = 0
+        return latencies.delay
+
+    def observe(self, route: str, seconds: float):
+        latencies = self._latencies.get(route)
+        if latencies is None:
+            latencies = self._latencies[route] = _Latencies(self.window)
+        latencies.samples.append(seconds)
+        latencies.pending += 1
+
+    def acquire(self) -> bool:
+        """
+        Spends a token for a hedge, or counts it as denied when the budget is used up.
+        """
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.hedged += 1
+            return True
+        self.denied += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "wins": self.wins,
+            "denied": self.denied,
+            "throttled": self.throttled,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "win_rate": self.wins / self.hedged if self.hedged else 0.0,
+            "delays": {route: latencies.delay for route, latencies in sorted(self._latencies.items())
+                       if latencies.delay is not None},
+        }
@@ -0,0 +1,543 @@
+import heapq
+import math
+import os
+import re
+import sys
+from array import array
+from base64 import b64decode, b64encode
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from .codec import JSONCodec, default_codec
+from .models import Project, SearchResult
+from .utils import parse_timestamp
+
+FORMAT_VERSION = 1
+
+# Search hits mix loaders into ``categories``; these are split out into the ``loaders`` facet.
+KNOWN_LOADERS = frozenset({
+    "fabric", "forge", "neoforge", "quilt", "liteloader", "modloader", "rift", "babric", "bta-babric",
+    "java-agent", "legacy-fabric", "nilloader", "ornithe", "bukkit", "spigot", "paper", "purpur", "folia",
+    "sponge", "bungeecord", "waterfall", "velocity", "geyser", "datapack", "minecraft", "iris", "optifine",
+    "canvas", "vanilla", "mrpack",
+})
+
+# Weight of one occurrence of a word in each indexed field.
+FIELD_WEIGHTS = (("title", 4), ("slug", 3), ("description", 1))
+
+FACETS = ("categories", "loaders", "versions", "project_type", "client_side", "server_side", "license", "author")
+FACET_ALIASES = {"game_versions": "versions", "loader": "loaders", "category": "categories"}
+
+SORTS = {
+    "downloads": "downloads",
+    "follows": "follows",
+    "newest": "date_created",
+    "updated": "date_modified",
+}
+_DATES = ("date_created", "date_modified")
+
+_WORD = re.compile(r"\w+")
+_FACET = re.compile(r"^\s*([a-z_]+)\s*(!=|:|=)\s*(.*?)\s*$")
+
+# Prefix matching of the last query word stops after this many words, so one typed letter stays cheap.
+MAX_EXPANSIONS = 256
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Splits text into lowercase words; slugs split on their dashes.
+    """
+    return _WORD.findall(text.lower().replace("_", " ")) if text else []
+
+
+class SearchHits(list):
+    """
+    Page of :class:`SearchResult` returned by :meth:`SearchIndex.search`.
+
+    :ivar total_hits: Number of projects matching the query and facets, on all pages.
+    """
+
+    def __init__(self, results: Iterable[SearchResult] = (), total_hits: int = 0):
+        super().__init__(results)
+        self.total_hits = total_hits
+
+    def __repr__(self) -> str:
+        return f"<SearchHits {len(self)} of {self.total_hits}>"
+
+
+class SearchIndex:
+    """
+    In-memory full-text and facet index over search hits and projects, for answering searches
+    without a request per keystroke.
+
+    Titles, slugs and descriptions go into an inverted index; categories, loaders, game versions,
+    project type, client and server side, license and author into facet indexes. Queries accept the
+    same ``facets`` and ``index`` (sort) values as :meth:`ModrinthClient.search_projects`. The index
+    is filled from crawled search pages or projects, kept current with :meth:`update`, and saved to
+    a file that loads without re-tokenizing or decoding anything.
+
+    >>> index = SearchIndex()
+    >>> await index.update(client)
+    >>> index.search("sodi", facets=[["versions:1.20.1"], ["loaders:fabric"]], index="downloads")
+    """
+
+    def __init__(self, loaders: Optional[Iterable[str]] = None, codec: Optional[JSONCodec] = None):
+        """
+        :param loaders: Names in a search hit's ``categories`` that are loaders. Defaults to
+            :data:`KNOWN_LOADERS`; loaders of added projects are learned.
+        :param codec: JSON codec used by :meth:`save` and :meth:`load`.
+        """
+        self.loaders = set(loaders if loaders is not None else KNOWN_LOADERS)
+        self.codec = codec or default_codec()
+        # Documents are numbered; a removed project leaves a None behind so numbers stay stable.
+        # Documents read from disk stay encoded until they are needed.
+        self._docs: List[Union[None, bytes, Dict[str, Any]]] = []
+        self._numbers: Dict[str, int] = {}
+        self._free: List[int] = []
+        # Values are {doc: weight} dicts and sets of docs, or their packed form read from disk until first use.
+        self._postings: Dict[str, Union[Dict[int, int], str]] = {}
+        self._facets: Dict[str, Dict[str, Union[Set[int], str]]] = {name: {} for name in FACETS}
+        self._terms: Optional[List[str]] = None
+        # Sort values by document number, with dates parsed to timestamps; None for removed documents.
+        self._sort: Dict[str, List[Optional[float]]] = {field: [] for field in SORTS.values()}
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __contains__(self, project_id: str) -> bool:
+        return project_id in self._numbers
+
+    def __repr__(self) -> str:
+        return f"<SearchIndex projects={len(self)} terms={len(self._postings)}>"
+
+    @property
+    def last_modified(self) -> float:
+        """
+        Newest ``date_modified`` of any indexed project, in seconds since the epoch.
+        """
+        return max(filter(None, self._sort["date_modified"]), default=0.0)
+
+    def get(self, project_id: str) -> Optional[SearchResult]:
+        number = self._numbers.get(project_id)
+        return None if number is None else SearchResult(self._document_at(number))
+
+    def _document_at(self, number: int) -> Dict[str, Any]:
+        document = self._docs[number]
+        if isinstance(document, bytes):
+            document = self._docs[number] = self.codec.loads(document)
+        return document
+
+    # Indexing
+
+    def _document(self, item: Any) -> Dict[str, Any]:
+        """
+        Converts a search hit or project into the search hit layout the index stores.
+        """
+        data = item.to_dict() if hasattr(item, "to_dict") else item
+        if not isinstance(item, Project) and ("project_id" in data or "id" not in data):
+            return dict(data)
+
+        loaders = list(data.get("loaders") or ())
+        # Remember loaders named by projects so search hits listing them are recognized too.
+        self.loaders.update(loaders)
+        license = data.get("license")
+        previous = self._numbers.get(data.get("id"))
+        previous = self._document_at(previous) if previous is not None else {}
+        return {
+            "slug": data.get("slug"),
+            "title": data.get("title"),
+            "description": data.get("description"),
+            "categories": list(data.get("categories") or ()) + loaders,
+            "client_side": data.get("client_side"),
+            "server_side": data.get("server_side"),
+            "project_type": data.get("project_type"),
+            "downloads": data.get("downloads"),
+            "icon_url": data.get("icon_url"),
+            "color": data.get("color"),
+            "thread_id": data.get("thread_id"),
+            "monetization_status": data.get("monetization_status"),
+            "project_id": data.get("id"),
+            # Projects do not name their author or latest version; keep what an earlier search hit said.
+            "author": previous.get("author"),
+            "display_categories": list(data.get("categories") or ()) + list(data.get("additional_categories") or ()),
+            "versions": list(data.get("game_versions") or ()),
+            "follows": data.get("followers"),
+            "date_created": data.get("published"),
+            "date_modified": data.get("updated"),
+            "latest_version": previous.get("latest_version"),
+            "license": license.get("id") if isinstance(license, dict) else getattr(license, "id", license),
+            "gallery": [entry.get("url") if isinstance(entry, dict) else getattr(entry, "url", entry)
+                        for entry in data.get("gallery") or ()],
+            "featured_gallery": previous.get("featured_gallery"),
+        }
+
+    @staticmethod
+    def _weights(document: Dict[str, Any]) -> Dict[str, int]:
+        weights: Dict[str, int] = {}
+        for field, weight in FIELD_WEIGHTS:
+            for word in tokenize(document.get(field)):
+                weights[word] = weights.get(word, 0) + weight
+        return weights
+
+    def _facet_values(self, document: Dict[str, Any], name: str) -> List[str]:
+        if name == "loaders":
+            return [value for value in document.get("categories") or () if value in self.loaders]
+        value = document.get(name)
+        if value is None:
+            return []
+        if isinstance(value, list):
+            return [str(item) for item in value]
+        return [str(value)]
+
+    def add(self, items: Iterable[Any]) -> int:
+        """
+        Adds or replaces projects.
+
+        :param items: :class:`SearchResult` or :class:`Project` models, or their dictionaries.
+        :return: Number of projects that were new or had changed.
+        """
+        changed = 0
+        for item in items:
+            document = self._document(item)
+            project_id = document.get("project_id")
+            if not project_id:
+                continue
+            number = self._numbers.get(project_id)
+            if number is not None:
+                if self._document_at(number) == document:
+                    continue
+                self._unindex(number)
+            elif self._free:
+                number = self._free.pop()
+            else:
+                number = len(self._docs)
+                self._docs.append(None)
+            self._docs[number] = document
+            self._numbers[project_id] = number
+            self._index(number, document)
+            changed += 1
+        return changed
+
+    def remove(self, project_id: str) -> bool:
+        """
+        Removes a project, e.g. one that was deleted or hidden.
+
+        :return: Whether the project was indexed.
+        """
+        number = self._numbers.pop(project_id, None)
+        if number is None:
+            return False
+        self._unindex(number)
+        self._docs[number] = None
+        self._free.append(number)
+        return True
+
+    def _index(self, number: int, document: Dict[str, Any]):
+        for word, weight in self._weights(document).items():
+            postings = self._postings_for(word)
+            if postings is None:
+                postings = self._postings[word] = {}
+                self._terms = None
+            postings[number] = weight
+        for name in FACETS:
+            values = self._facets[name]
+            for value in self._facet_values(document, name):
+                members = self._facet_for(name, value)
+                if members is None:
+                    members = values[value] = set()
+                members.add(number)
+        for field, values in self._sort.items():
+            if number == len(values):
+                values.append(None)
+            value = document.get(field)
+            values[number] = parse_timestamp(value) if field in _DATES else value or 0
+
+    def _unindex(self, number: int):
+        document = self._document_at(number)
+        for word in self._weights(document):
+            postings = self._postings_for(word)
+            postings.pop(number, None)
+            if not postings:
+                del self._postings[word]
+                self._terms = None
+        for name in FACETS:
+            for value in self._facet_values(document, name):
+                members = self._facet_for(name, value)
+                if members is None:
+                    continue
+                members.discard(number)
+                if not members:
+                    del self._facets[name][value]
+        for values in self._sort.values():
+            values[number] = None
+
+    def _postings_for(self, word: str) -> Optional[Dict[int, int]]:
+        postings = self._postings.get(word)
+        if isinstance(postings, str):
+            flat = _unpack(postings)
+            postings = self._postings[word] = dict(zip(flat[::2], flat[1::2]))
+        return postings
+
+    def _facet_for(self, name: str, value: str) -> Optional[Set[int]]:
+        values = self._facets[name]
+        members = values.get(value)
+        if isinstance(members, str):
+            members = values[value] = set(_unpack(members))
+        return members
+
+    async def update(self, client, query: str = "", page_size: int = 100, **params) -> int:
+        """
+        Crawls the search API into the index. An empty index is filled completely; otherwise
+        results are read most recently updated first, stopping at the first project that has not
+        changed since the newest one already indexed. Deleted projects are not detected.
+
+        :param client: Client used to send the requests.
+        :param query: Search query limiting which projects are mirrored.
+        :param page_size: Hits per request, at most 100.
+        :param params: Additional search parameters, e.g. ``facets``.
+        :return: Number of projects that were new or had changed.
+        """
+        since = self.last_modified if self._numbers else None
+        if since is not None:
+            params["index"] = "updated"
+        results = client.iter_search(query, page_size=page_size, **params)
+        changed = 0
+        page: List[SearchResult] = []
+        try:
+            # Results are read as models whatever format the client returns by default.
+            with client.options(response_format="model"):
+                async for result in results:
+                    if since is not None and parse_timestamp(result.date_modified) < since:
+                        break
+                    page.append(result)
+                    if len(page) >= page_size:
+                        changed += self.add(page)
+                        page = []
+        finally:
+            await results.aclose()
+        return changed + self.add(page)
+
+    # Queries
+
+    def _live(self) -> Set[int]:
+        return set(self._numbers.values())
+
+    def _filter(self, facets: Any) -> Optional[Set[int]]:
+        """
+        Evaluates facets in the API's format: a list of groups that must all match, each a list of
+        ``"name:value"`` or ``"name!=value"`` strings of which one must match.
+
+        :return: Matching documents, or None when there are no facets.
+        """
+        if not facets:
+            return None
+        if isinstance(facets, (str, bytes)):
+            facets = self.codec.loads(facets)
+        matches: Optional[Set[int]] = None
+        for group in facets:
+            if isinstance(group, str):
+                group = [group]
+            members: Set[int] = set()
+            for facet in group:
+                match = _FACET.match(facet)
+                if match is None:
+                    raise ValueError(f"Invalid facet {facet!r}, expected 'name:value' or 'name!=value'")
+                name, operator, value = match.groups()
+                name = FACET_ALIASES.get(name, name)
+                if name not in self._facets:
+                    raise ValueError(f"Unknown facet {name!r}, expected one of {', '.join(FACETS)}")
+                selected = self._facet_for(name, value) or set()
+                members |= self._live() - selected if operator == "!=" else selected
+            matches = members if matches is None else matches & members
+            if not matches:
+                break
+        return matches
+
+    def _score(self, words: List[str], prefix: bool) -> Dict[int, float]:
+        """
+        Scores documents containing every word, or a word starting with the last one when
+        ``prefix`` is set. Each match counts its field weight times the word's rarity.
+        """
+        total = len(self._numbers)
+        scores: Optional[Dict[int, float]] = None
+        for position, word in enumerate(words):
+            expansions = [word]
+            if prefix and position == len(words) - 1:
+                expansions = self._expand(word)
+            word_scores: Dict[int, float] = {}
+            for term in expansions:
+                postings = self._postings_for(term)
+                if not postings:
+                    continue
+                # Completions of a partly typed word rank below the exact word.
+                rarity = math.log(1 + total / len(postings)) * (1.0 if term == word else 0.8)
+                for number, weight in postings.items():
+                    score = weight * rarity
+                    if score > word_scores.get(number, 0.0):
+                        word_scores[number] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {number: score + word_scores[number] for number, score in scores.items()
+                          if number in word_scores}
+            if not scores:
+                return {}
+        return scores or {}
+
+    def _expand(self, word: str) -> List[str]:
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+        terms = self._terms
+        expansions = []
+        for position in range(bisect_left(terms, word), len(terms)):
+            term = terms[position]
+            if not term.startswith(word) or len(expansions) >= MAX_EXPANSIONS:
+                break
+            expansions.append(term)
+        return expansions
+
+    def _match(self, query: str, facets: Any, prefix: bool):
+        words = tokenize(query)
+        allowed = self._filter(facets)
+        if not words:
+            return None, self._live() if allowed is None else allowed
+        scores = self._score(words, prefix)
+        if allowed is not None:
+            scores = {number: score for number, score in scores.items() if number in allowed}
+        return scores, scores.keys()
+
+    def _sort_key(self, index: str, scores: Optional[Dict[int, float]]):
+        if index == "relevance":
+            if scores is None:
+                index = "downloads"
+            else:
+                downloads = self._sort["downloads"]
+                return lambda number: (scores[number], downloads[number])
+        field = SORTS.get(index)
+        if field is None:
+            raise ValueError(f"Unknown index {index!r}, expected relevance or one of {', '.join(SORTS)}")
+        return self._sort[field].__getitem__
+
+    def search(self, query: str = "", facets: Any = None, index: str = "relevance", offset: int = 0,
+               limit: int = 10, prefix: bool = True) -> SearchHits:
+        """
+        Searches the index like :meth:`ModrinthClient.search_projects`.
+
+        :param query: Words that must all appear in the title, slug or description.
+        :param facets: Filters such as ``[["categories:technology"], ["versions:1.20.1", "versions:1.20.4"]]``,
+            or the same as a JSON string. Besides the API's facet names, ``loaders`` filters on loaders only.
+        :param index: Sort order: ``relevance``, ``downloads``, ``follows``, ``newest`` or ``updated``.
+        :param offset: Number of results to skip.
+        :param limit: Maximum number of results.
+        :param prefix: Also match words starting with the last query word, for search-as-you-type.
+        :return: The requested page of results, with ``total_hits`` set.
+        """
+        scores, matches = self._match(query, facets, prefix)
+        key = self._sort_key(index, scores)
+        if offset + limit < len(matches) // 4:
+            ranked = heapq.nlargest(offset + limit, matches, key=key)
+        else:
+            ranked = sorted(matches, key=key, reverse=True)
+        return SearchHits((SearchResult(self._document_at(number)) for number in ranked[offset:offset + limit]),
+                          len(matches))
+
+    def facet_counts(self, name: str, query: str = "", facets: Any = None, prefix: bool = True) -> Dict[str, int]:
+        """
+        Counts the projects matching a query per value of one facet, e.g. to label filter toggles.
+
+        :param name: Facet to count, e.g. ``categories`` or ``versions``.
+        :return: Number of matching projects per value, largest first; values without matches are left out.
+        """
+        name = FACET_ALIASES.get(name, name)
+        if name not in self._facets:
+            raise ValueError(f"Unknown facet {name!r}, expected one of {', '.join(FACETS)}")
+        matches = self._match(query, facets, prefix)[1]
+        counts = {}
+        for value in list(self._facets[name]):
+            count = len(self._facet_for(name, value).intersection(matches))
+            if count:
+                counts[value] = count
+        return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+    # Persistence
+
+    def save(self, path: str):
+        """
+        Writes the index to a file, replacing it atomically. The file holds one line of JSON with the
+        postings, facets and sort values, followed by the documents as concatenated JSON.
+        """
+        postings = {}
+        for word, entries in self._postings.items():
+            if isinstance(entries, dict):
+                flat = array("I", bytes(8 * len(entries)))
+                flat[::2] = array("I", entries.keys())
+                flat[1::2] = array("I", entries.values())
+                entries = _pack(flat)
+            postings[word] = entries
+        facets = {name: {value: _pack(array("I", sorted(members))) if isinstance(members, set) else members
+                         for value, members in values.items()}
+                  for name, values in self._facets.items()}
+        docs = [b"" if document is None else document if isinstance(document, bytes)
+                else self.codec.dumps_bytes(document) for document in self._docs]
+        state = {
+            "format": FORMAT_VERSION,
+            "loaders": sorted(self.loaders),
+            "ids": self._numbers,
+            "sizes": _pack(array("I", map(len, docs))),
+            "sort": self._sort,
+            "postings": postings,
+            "facets": facets,
+        }
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as stream:
+            stream.write(self.codec.dumps_bytes(state))
+            stream.write(b"\n")
+            stream.writelines(docs)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str, codec: Optional[JSONCodec] = None) -> "SearchIndex":
+        """
+        Reads an index written by :meth:`save`. Documents, postings and facets stay encoded until a query
+        first needs them, so loading costs little more than reading the file.
+
+        :raises ValueError: The file was written by an incompatible version.
+        """
+        codec = codec or default_codec()
+        with open(path, "rb") as stream:
+            state = codec.loads(stream.readline())
+            if state.get("format") != FORMAT_VERSION:
+                raise ValueError(f"Unsupported search index format {state.get('format')!r}")
+            data = stream.read()
+        index = cls(state["loaders"], codec)
+        docs = index._docs
+        position = 0
+        for size in _unpack(state["sizes"]):
+            if size:
+                docs.append(data[position:position + size])
+                position += size
+            else:
+                index._free.append(len(docs))
+                docs.append(None)
+        index._numbers = state["ids"]
+        index._sort.update(state["sort"])
+        index._postings = state["postings"]
+        index._facets.update(state["facets"])
+        return index
+
+
+def _pack(numbers: array) -> str:
+    """
+    Encodes unsigned integers as base64 text, which JSON parsers read far faster than number lists.
+    """
+    if sys.byteorder != "little":
+        numbers = array("I", numbers)
+        numbers.byteswap()
+    return b64encode(numbers.tobytes()).decode()
+
+
+def _unpack(text: str) -> array:
+    numbers = array("I", b64decode(text))
+    if sys.byteorder != "little":
+        numbers.byteswap()
+    return numbers
@@ -0,0 +1,228 @@
+import bisect
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Upper bounds of the latency histogram buckets in seconds; the last bucket catches everything slower.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+# Second path segments that name a resource rather than identify one, e.g. ``user/email``.
+_LITERAL_SEGMENTS = frozenset({"email", "payouts", "update"})
+
+RequestHook = Callable[["RequestEvent"], Any]
+
+
+def endpoint_name(method: str, endpoint: str) -> str:
+    """
+    Groups requests by route, so ``project/sodium`` and ``project/AANobbMI`` count as ``GET project/{id}``.
+    """
+    parts = endpoint.split("/")
+    if len(parts) > 1 and parts[1] not in _LITERAL_SEGMENTS:
+        parts[1] = "{id}"
+    return f"{method} {'/'.join(parts)}"
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram. Observing a value is a binary search and two additions.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Upper bound of the bucket holding the given fraction of observations, capped at the maximum.
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+            "buckets": {str(bound): count for bound, count in zip(LATENCY_BUCKETS, self.counts) if count},
+        }
+
+
+class RequestEvent:
+    """
+    One request as seen by the hooks. Pre-request hooks receive it before anything is sent;
+    post-request hooks receive it completed, also when the request failed.
+
+    :ivar endpoint: Route name, e.g. ``GET project/{id}``.
+    :ivar path: Endpoint actually requested, e.g. ``project/sodium``.
+    :ivar status: Final status code, None if no response arrived.
+    :ivar cached: The response was served from the cache without a request.
+    :ivar error: Exception the request failed with.
+    :ivar attempts: Number of times the request was sent, including retries and 429 waits.
+    :ivar queue_wait: Seconds spent waiting for the rate limiter.
+    :ivar ttfb: Seconds until the response headers of the last attempt arrived.
+    :ivar decode: Seconds spent decoding the response body.
+    :ivar elapsed: Total seconds of the request.
+    :ivar hedged: A second copy of the request was sent because the first one was slow.
+    :ivar hedge_won: The second copy answered first.
+    """
+
+    __slots__ = ("method", "endpoint", "path", "started", "status", "cached", "error", "attempts",
+                 "bytes_out", "bytes_in", "queue_wait", "ttfb", "decode", "elapsed", "hedged", "hedge_won")
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.endpoint = endpoint_name(method, path)
+        self.path = path
+        self.started = time.perf_counter()
+        self.status: Optional[int] = None
+        self.cached = False
+        self.error: Optional[BaseException] = None
+        self.attempts = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.queue_wait = 0.0
+        self.ttfb: Optional[float] = None
+        self.decode: Optional[float] = None
+        self.elapsed = 0.0
+        self.hedged = False
+        self.hedge_won = False
+
+    def __repr__(self) -> str:
+        return f"<RequestEvent {self.endpoint} status={self.status} elapsed={self.elapsed:.4f}>"
+
+
+class EndpointMetrics:
+    __slots__ = ("requests", "errors", "cache_hits", "statuses", "bytes_out", "bytes_in", "hedged", "hedge_wins",
+                 "latency")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.statuses: Dict[int, int] = {}
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.latency = {name: Histogram() for name in ("total", "queue_wait", "ttfb", "decode")}
+
+    def record(self, event: RequestEvent):
+        self.requests += 1
+        if event.cached:
+            self.cache_hits += 1
+        if event.error is not None:
+            self.errors += 1
+        if event.status is not None:
+            self.statuses[event.status] = self.statuses.get(event.status, 0) + 1
+        self.bytes_out += event.bytes_out
+        self.bytes_in += event.bytes_in
+        if event.hedged:
+            self.hedged += 1
+            if event.hedge_won:
+                self.hedge_wins += 1
+        self.latency["total"].observe(event.elapsed)
+        if event.attempts:
+            self.latency["queue_wait"].observe(event.queue_wait)
+        if event.ttfb is not None:
+            self.latency["ttfb"].observe(event.ttfb)
+        if event.decode is not None:
+            self.latency["decode"].observe(event.decode)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "latency": {name: histogram.snapshot() for name, histogram in self.latency.items()},
+        }
+
+
+class Instrumentation:
+    """
+    Opt-in request metrics and hooks for a client.
+
+    Collects per-endpoint request, error, cache hit, status code and hedge counters, bytes sent and received,
+    and latency histograms for the whole request, rate limiter queue wait, time to first byte and body
+    decoding, plus model build times per model class. A client without instrumentation skips all of it.
+    """
+
+    def __init__(self, pre_request: Optional[List[RequestHook]] = None,
+                 post_request: Optional[List[RequestHook]] = None):
+        """
+        :param pre_request: Called with the :class:`RequestEvent` before a request is made.
+        :param post_request: Called with the completed :class:`RequestEvent` after a request finished.
+        """
+        self.pre_request: List[RequestHook] = list(pre_request or [])
+        self.post_request: List[RequestHook] = list(post_request or [])
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.models: Dict[str, Histogram] = {}
+
+    def add_pre_request_hook(self, hook: RequestHook):
+        self.pre_request.append(hook)
+
+    def add_post_request_hook(self, hook: RequestHook):
+        self.post_request.append(hook)
+
+    def start(self, method: str, path: str) -> RequestEvent:
+        event = RequestEvent(method, path)
+        for hook in self.pre_request:
+            hook(event)
+        return event
+
+    def finish(self, event: RequestEvent):
+        event.elapsed = time.perf_counter() - event.started
+        metrics = self.endpoints.get(event.endpoint)
+        if metrics is None:
+            metrics = self.endpoints[event.endpoint] = EndpointMetrics()
+        metrics.record(event)
+        for hook in self.post_request:
+            hook(event)
+
+    def observe_build(self, model: str, seconds: float):
+        histogram = self.models.get(model)
+        if histogram is None:
+            histogram = self.models[model] = Histogram()
+        histogram.observe(seconds)
+
+    def reset(self):
+        self.endpoints.clear()
+        self.models.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        :return: Plain dictionary of all metrics, ready to be serialized or exported.
+        """
+        return {
+            "endpoints": {name: metrics.snapshot() for name, metrics in sorted(self.endpoints.items())},
+            "models": {name: histogram.snapshot() for name, histogram in sorted(self.models.items())},
+        }
@@ -0,0 +1,236 @@
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from .codec import JSONCodec, default_codec
+from .models import Project, Version
+
+FORMAT_VERSION = 1
+
+PROJECT = "project"
+VERSION = "version"
+
+ADDED = "added"
+UPDATED = "updated"
+DELETED = "deleted"
+
+# Counters that change all the time without the version itself being edited.
+VOLATILE_VERSION_FIELDS = frozenset({"downloads"})
+
+
+class Change:
+    """
+    One difference between the mirror and the API.
+
+    :ivar kind: ``"project"`` or ``"version"``.
+    :ivar action: ``"added"``, ``"updated"`` or ``"deleted"``.
+    :ivar id: Project or version ID.
+    :ivar data: The project or version as it is now, None when it was deleted.
+    :ivar previous: The project or version as the mirror knew it, None when it was added.
+    """
+
+    __slots__ = ("kind", "action", "id", "data", "previous")
+
+    def __init__(self, kind: str, action: str, id: str, data: Any = None, previous: Any = None):
+        self.kind = kind
+        self.action = action
+        self.id = id
+        self.data = data
+        self.previous = previous
+
+    def __repr__(self) -> str:
+        return f"<Change {self.kind} {self.action} {self.id}>"
+
+
+class ProjectMirror:
+    """
+    Keeps a local copy of every project owned by a set of users, plus their versions, and reports
+    what changed since the last sync.
+
+    Each sync fetches the users' project lists, one request per user. Projects whose ``updated``
+    date is unchanged are skipped; for the rest, and for any project whose list of version IDs
+    changed, only the versions that are new are fetched, in bulk. The snapshot doubles as the
+    cursor and is saved to a JSON file, so a mirror where nothing changed costs one request per
+    user per sync.
+
+    >>> mirror = ProjectMirror(client, ["jellysquid3", "coderbot"], path="mirror.json")
+    >>> async for change in mirror.changes():
+    ...     print(change.kind, change.action, change.id)
+    >>> mirror.save()
+    """
+
+    def __init__(self, client, users: Iterable[str], path: Optional[str] = None, recheck_versions: bool = False,
+                 concurrency: int = 4, codec: Optional[JSONCodec] = None):
+        """
+        :param client: Client used to send the requests.
+        :param users: IDs or usernames of the users whose projects are mirrored.
+        :param path: JSON file the snapshot is loaded from and saved to. None keeps it in memory only.
+        :param recheck_versions: Also fetch every version of a project whose ``updated`` date changed,
+            to catch edits to existing versions. Without it only added and deleted versions are seen.
+        :param concurrency: Maximum number of requests in flight.
+        :param codec: JSON codec used to read and write the file.
+        """
+        self.client = client
+        self.users = list(users)
+        self.path = path
+        self.recheck_versions = recheck_versions
+        self.concurrency = concurrency
+        self.codec = codec or default_codec()
+        self.synced_at: Optional[float] = None
+        self._projects: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, "rb") as stream:
+                    state = self.codec.loads(stream.read())
+            except (OSError, ValueError):
+                state = None
+            if state and state.get("format") == FORMAT_VERSION:
+                self._projects = state["projects"]
+                self._versions = state["versions"]
+                self.synced_at = state.get("synced_at")
+
+    def __len__(self) -> int:
+        return len(self._projects)
+
+    def __repr__(self) -> str:
+        return (f"<ProjectMirror users={len(self.users)} projects={len(self._projects)} "
+                f"versions={len(self._versions)}>")
+
+    def projects(self) -> List[Project]:
+        return [Project(data) for data in self._projects.values()]
+
+    def versions(self, project_id: str) -> List[Version]:
+        """
+        Versions of a mirrored project, in the order the project lists them.
+        """
+        project = self._projects.get(project_id)
+        if project is None:
+            return []
+        versions = self._versions
+        return [Version(versions[id]) for id in project.get("versions") or () if id in versions]
+
+    async def _fetch_projects(self) -> Dict[str, Project]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(user: str) -> List[Project]:
+            async with semaphore:
+                with self.client.options(response_format="model"):
+                    return await self.client.get_user_projects(user)
+
+        current: Dict[str, Project] = {}
+        # A failed request raises before any change is reported, so a missing list never looks like deletions.
+        for projects in await asyncio.gather(*[fetch(user) for user in self.users]):
+            for project in projects:
+                current.setdefault(project.id, project)
+        return current
+
+    async def changes(self) -> AsyncIterator[Change]:
+        """
+        Compares the API with the snapshot and yields the differences: a project before its versions,
+        and deleted versions before their deleted project.
+
+        A change is recorded in the snapshot when the consumer asks for the next one, so stopping early
+        or failing half way reports that change and the remaining ones again on the next sync.
+        """
+        current = await self._fetch_projects()
+
+        fetch_ids: List[str] = []
+        for project_id, project in current.items():
+            known = self._projects.get(project_id)
+            ids = project.versions or ()
+            if self.recheck_versions and known is not None and known.get("updated") != project.updated:
+                fetch_ids.extend(ids)
+            else:
+                fetch_ids.extend(id for id in ids if id not in self._versions)
+        fetched: Dict[str, Version] = {}
+        if fetch_ids:
+            with self.client.options(response_format="model"):
+                versions = await self.client.get_versions(fetch_ids, concurrency=self.concurrency)
+            fetched = {version.id: version for version in versions}
+
+        for project_id, project in current.items():
+            known = self._projects.get(project_id)
+            data = project.to_dict()
+            if known is None:
+                yield Change(PROJECT, ADDED, project_id, project)
+            elif known.get("updated") != data.get("updated"):
+                yield Change(PROJECT, UPDATED, project_id, project, Project(known))
+            if known is None or known.get("updated") != data.get("updated"):
+                # The old version list is kept until the deleted versions were reported.
+                self._projects[project_id] = {**data, "versions": known.get("versions") if known else []}
+                self._dirty = True
+
+            ids = data.get("versions") or []
+            for version_id in ids:
+                version = fetched.get(version_id)
+                if version is None:
+                    continue
+                version_data = version.to_dict()
+                previous = self._versions.get(version_id)
+                if previous is None:
+                    yield Change(VERSION, ADDED, version_id, version)
+                elif _edited(previous, version_data):
+                    yield Change(VERSION, UPDATED, version_id, version, Version(previous))
+                else:
+                    continue
+                self._versions[version_id] = version_data
+                self._dirty = True
+
+            if known is not None and known.get("versions") != ids:
+                for version_id in set(known.get("versions") or ()).difference(ids):
+                    previous = self._versions.get(version_id)
+                    if previous is not None:
+                        yield Change(VERSION, DELETED, version_id, previous=Version(previous))
+                        del self._versions[version_id]
+                        self._dirty = True
+            if self._projects[project_id].get("versions") != ids:
+                self._projects[project_id] = data
+                self._dirty = True
+
+        for project_id in [project_id for project_id in self._projects if project_id not in current]:
+            known = self._projects[project_id]
+            for version_id in known.get("versions") or ():
+                previous = self._versions.get(version_id)
+                if previous is not None:
+                    yield Change(VERSION, DELETED, version_id, previous=Version(previous))
+                    del self._versions[version_id]
+                    self._dirty = True
+            yield Change(PROJECT, DELETED, project_id, previous=Project(known))
+            del self._projects[project_id]
+            self._dirty = True
+
+        self.synced_at = time.time()
+
+    async def sync(self) -> List[Change]:
+        """
+        Collects every change and saves the snapshot.
+        """
+        changes = [change async for change in self.changes()]
+        self.save()
+        return changes
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        state = {
+            "format": FORMAT_VERSION,
+            "users": self.users,
+            "synced_at": self.synced_at,
+            "projects": self._projects,
+            "versions": self._versions,
+        }
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as stream:
+            stream.write(self.codec.dumps_bytes(state))
+        os.replace(temporary, self.path)
+        self._dirty = False
+
+
+def _edited(previous: Dict[str, Any], current: Dict[str, Any]) -> bool:
+    for key, value in current.items():
+        if key not in VOLATILE_VERSION_FIELDS and previous.get(key) != value:
+            return True
+    return False
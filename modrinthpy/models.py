@@ -1,57 +1,326 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 import logging
+import sys
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class BaseModelWithAutoMapping:
+_EMPTY: Dict[str, Any] = {}
+
+
+def _class_annotations(namespace: Dict[str, Any]) -> Dict[str, Any]:
+    annotations = namespace.get('__annotations__')
+    if annotations is not None:
+        return annotations
+    try:
+        import annotationlib  # Python 3.14+ evaluates class annotations lazily.
+    except ImportError:
+        return {}
+    annotate = annotationlib.get_annotate_from_class_namespace(namespace)
+    if annotate is None:
+        return {}
+    return annotationlib.call_annotate_function(annotate, annotationlib.Format.FORWARDREF)
+
+
+def _compile_assign(fields: Tuple[str, ...], targets: Dict[str, str], defaults: Dict[str, Any]):
+    """
+    Builds a function that copies every field from a dictionary onto an instance with plain
+    attribute stores, which is considerably faster than a ``setattr`` loop.
+
+    :param targets: Attribute to store a field in, if it differs from the field name.
+    """
+    namespace = {}
+    lines = ["def _assign(self, data):", "    get = data.get"]
+    for index, key in enumerate(fields):
+        namespace[f"_default_{index}"] = defaults.get(key)
+        lines.append(f"    self.{targets.get(key, key)} = get({key!r}, _default_{index})")
+    if not fields:
+        lines.append("    pass")
+    exec("\n".join(lines), namespace)
+    return namespace["_assign"]
+
+
+def _nested_model_ref(annotation: Any) -> Optional[Tuple[Any, bool]]:
+    """
+    Detects annotations that refer to a model: ``Model``, ``'Model'``, ``List[Model]`` or an
+    ``Optional`` of these. String references can only be checked once they are resolved.
+
+    :return: The model class or reference and whether the field holds a list, or None.
+    """
+    origin = getattr(annotation, '__origin__', None)
+    args = getattr(annotation, '__args__', None) or ()
+    if origin is Union:
+        args = [arg for arg in args if arg is not type(None)]
+        return _nested_model_ref(args[0]) if len(args) == 1 else None
+    if origin in (list, List) and len(args) == 1:
+        ref = _nested_model_ref(args[0])
+        return (ref[0], True) if ref and not ref[1] else None
+    if isinstance(annotation, str):
+        return annotation, False
+    if hasattr(annotation, '__forward_arg__'):
+        return annotation.__forward_arg__, False
+    if isinstance(annotation, _ModelMeta):
+        return annotation, False
+    return None
+
+
+class _LazyModelField:
+    """
+    Descriptor that keeps the raw API value of a nested model field and decodes it into models on
+    first access. The decoded value is cached in a second slot; the raw value stays available
+    for :meth:`BaseModelWithAutoMapping.to_dict`.
+    """
+
+    def __init__(self, name: str, ref: Any, many: bool, module: str):
+        self.name = name
+        self.raw_attr = f"_raw_{name}"
+        self.cache_attr = f"_decoded_{name}"
+        self.ref = ref
+        self.many = many
+        self.module = module
+        self.raw_slot = None
+        self.cache_slot = None
+
+    def bind(self, cls):
+        self.raw_slot = cls.__dict__[self.raw_attr]
+        self.cache_slot = cls.__dict__[self.cache_attr]
+
+    def _model(self):
+        if isinstance(self.ref, str):
+            resolved = getattr(sys.modules.get(self.module), self.ref, None)
+            self.ref = resolved if isinstance(resolved, _ModelMeta) else None
+        return self.ref
+
+    def decode(self, raw: Any) -> Any:
+        model = self._model()
+        if model is None or raw is None:
+            return raw
+        if self.many:
+            if not isinstance(raw, list):
+                return raw
+            return [model(item) if isinstance(item, dict) else item for item in raw]
+        return model(raw) if isinstance(raw, dict) else raw
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return self.cache_slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.decode(self.raw_slot.__get__(instance, owner))
+            self.cache_slot.__set__(instance, value)
+            return value
+
+    def __set__(self, instance, value):
+        self.raw_slot.__set__(instance, value)
+        try:
+            self.cache_slot.__delete__(instance)
+        except AttributeError:
+            pass
+
+    def dump(self, instance) -> Any:
+        """
+        Returns the field as plain data, converting any models it holds back into dictionaries.
+        """
+        try:
+            value = self.cache_slot.__get__(instance, type(instance))
+        except AttributeError:
+            value = self.raw_slot.__get__(instance, type(instance))
+        if isinstance(value, list):
+            return [item.to_dict() if isinstance(item, BaseModelWithAutoMapping) else item for item in value]
+        return value.to_dict() if isinstance(value, BaseModelWithAutoMapping) else value
+
+
+class _ModelMeta(type):
+    """
+    Compiles the annotated fields of a model class once, when the class is created.
+
+    Every annotated field becomes a slot, and class-level defaults are moved into ``_defaults``
+    because a slot and a class attribute can't share a name. Fields annotated with other models
+    get a :class:`_LazyModelField` backed by two slots instead.
+    """
+
+    def __new__(mcls, name, bases, namespace):
+        annotations = _class_annotations(namespace)
+        fields = []
+        defaults = {}
+        lazy = {}
+        for base in reversed(bases):
+            for key in getattr(base, '_fields', ()):
+                if key not in fields:
+                    fields.append(key)
+            defaults.update(getattr(base, '_defaults', {}))
+            lazy.update(getattr(base, '_lazy_fields', {}))
+
+        own = [key for key in annotations if key not in fields]
+        for key in annotations:
+            if key in namespace:
+                defaults[key] = namespace.pop(key)
+
+        slots = []
+        own_lazy = []
+        for key in own:
+            ref = _nested_model_ref(annotations[key])
+            if ref is None:
+                slots.append(key)
+            else:
+                field = _LazyModelField(key, ref[0], ref[1], namespace.get('__module__'))
+                namespace[key] = field
+                slots.extend((field.raw_attr, field.cache_attr))
+                own_lazy.append(field)
+        namespace['__slots__'] = tuple(slots)
+
+        cls = super().__new__(mcls, name, bases, namespace)
+        for field in own_lazy:
+            field.bind(cls)
+            lazy[field.name] = field
+        cls._fields = tuple(fields + own)
+        cls._field_set = frozenset(cls._fields)
+        cls._defaults = defaults
+        cls._lazy_fields = lazy
+        cls._assign = _compile_assign(cls._fields, {key: field.raw_attr for key, field in lazy.items()}, defaults)
+        cls._unknown_fields = set()
+        return cls
+
+
+class BaseModelWithAutoMapping(metaclass=_ModelMeta):
+    __slots__ = ()
+
     def __init__(self, data: Optional[Dict[str, Any]] = None, **kwargs):
         """
         Initialize the model. Supports both dictionary data and keyword arguments.
+        Fields missing from both are set to their class default, or None.
 
         :param data: A dictionary with field names and values.
         :param kwargs: Field names and values as keyword arguments.
         """
+        if kwargs:
+            data = {**data, **kwargs} if data else kwargs
+        elif not data:
+            data = _EMPTY
         cls = self.__class__
-        hints = getattr(cls, '__annotations__', {})
-
-        if data:
-            for key, value in data.items():
-                if key in hints:
-                    setattr(self, key, value)
-                else:
-                    logger.warning(
-                        f"Unknown field '{key}' for class '{cls.__name__}'")
-
-        for key, value in kwargs.items():
-            if key in hints:
-                setattr(self, key, value)
-            else:
-                logger.warning(
-                    f"Unknown field '{key}' for class '{cls.__name__}'")
+        if not cls._field_set.issuperset(data):
+            cls._note_unknown_fields(data)
+        cls._assign(self, data)
+
+    @classmethod
+    def _note_unknown_fields(cls, data: Dict[str, Any]):
+        for key in data.keys() - cls._field_set - cls._unknown_fields:
+            cls._unknown_fields.add(key)
+            logger.debug("Unknown field '%s' for class '%s'", key, cls.__name__)
 
-        for key in hints:
-            if not hasattr(self, key):
-                setattr(self, key, None)
+    @classmethod
+    def unknown_fields(cls) -> List[str]:
+        """
+        Returns the names of fields received from the API that this model does not declare.
+        """
+        return sorted(cls._unknown_fields)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]):
         return cls(data)
 
+    @classmethod
+    def proxy(cls, data: Dict[str, Any]) -> "ModelProxy":
+        """
+        Wraps ``data`` in a :class:`ModelProxy` that reads fields from it on access.
+        """
+        return ModelProxy(cls, data)
+
     def to_dict(self):
-        cls = self.__class__
-        hints = getattr(cls, '__annotations__', {})
-        return {
-            key: getattr(self, key, getattr(cls, key, None)) for key in hints
-        }
+        lazy = self._lazy_fields
+        return {key: lazy[key].dump(self) if key in lazy else getattr(self, key) for key in self._fields}
 
     def __repr__(self) -> str:
-        annotations = list(self.__annotations__.keys())[:3]
-        repr_str = ", ".join([f"{key}={getattr(self, key, None)}" for key in annotations])
+        repr_str = ", ".join([f"{key}={getattr(self, key, None)}" for key in self._fields[:3]])
         return f"<{self.__class__.__name__} {repr_str}>"
 
 
+class ModelProxy:
+    """
+    Read-through view of an API dictionary with the attributes of a model.
+
+    Nothing is copied or converted up front: each attribute access reads the dictionary, nested
+    models are returned as proxies as well, and :meth:`to_dict` returns the wrapped dictionary
+    itself. Cheaper than a model when most fields are never read or the data is passed on as JSON.
+    Assigning a field writes it into the dictionary.
+    """
+
+    __slots__ = ("_model", "_data")
+
+    def __init__(self, model: type, data: Dict[str, Any]):
+        """
+        :param model: Model class whose fields and defaults the proxy exposes.
+        :param data: Decoded API object; it is shared, not copied.
+        """
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "_data", data)
+
+    def __getattr__(self, name: str) -> Any:
+        # Private and special names are never fields. Looking them up here would recurse through
+        # ``self._model`` on instances created without __init__, e.g. by copy and pickle.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        model = self._model
+        if name not in model._field_set:
+            raise AttributeError(f"{model.__name__!r} has no field {name!r}")
+        value = self._data.get(name, model._defaults.get(name))
+        field = model._lazy_fields.get(name)
+        if field is None or value is None:
+            return value
+        nested = field._model()
+        if nested is None:
+            return value
+        if field.many:
+            if not isinstance(value, list):
+                return value
+            return [ModelProxy(nested, item) if isinstance(item, dict) else item for item in value]
+        return ModelProxy(nested, value) if isinstance(value, dict) else value
+
+    def __setattr__(self, name: str, value: Any):
+        if name not in self._model._field_set:
+            raise AttributeError(f"{self._model.__name__!r} has no field {name!r}")
+        self._data[name] = value.to_dict() if isinstance(value, (BaseModelWithAutoMapping, ModelProxy)) else value
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ModelProxy):
+            return self._model is other._model and self._data == other._data
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return ModelProxy, (self._model, self._data)
+
+    def __dir__(self) -> List[str]:
+        return sorted(set(object.__dir__(self)) | self._model._field_set)
+
+    def materialize(self):
+        """
+        Builds the regular model from the wrapped dictionary.
+        """
+        return self._model(self._data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+    def __repr__(self) -> str:
+        repr_str = ", ".join([f"{key}={getattr(self, key, None)}" for key in self._model._fields[:3]])
+        return f"<{self._model.__name__}Proxy {repr_str}>"
+
+
+class BulkResult(list):
+    """
+    List of models returned by a bulk fetch, in input order.
+
+    :ivar missing: Requested IDs the API returned nothing for.
+    """
+
+    def __init__(self, items=(), missing: Optional[List[str]] = None):
+        super().__init__(items)
+        self.missing = missing or []
+
+
 class DonationUrl(BaseModelWithAutoMapping):
     id: Optional[str]
     platform: Optional[str]
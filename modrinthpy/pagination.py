@@ -0,0 +1,111 @@
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from .models import SearchResult
+
+
+class SearchIterator:
+    """
+    Asynchronous iterator over every search hit, page by page.
+
+    While the consumer works on the current page, up to ``prefetch`` following pages are already
+    being fetched. Iteration stops at ``total_hits`` or after ``max_results`` hits.
+
+    >>> async for result in client.iter_search("shaders", prefetch=3):
+    ...     print(result.slug)
+    """
+
+    def __init__(self, client, query: str, page_size: int = 100, prefetch: int = 2,
+                 max_results: Optional[int] = None, params: Optional[Dict[str, Any]] = None):
+        """
+        :param client: Client used to send the requests.
+        :param query: Search query.
+        :param page_size: Hits per request, at most 100.
+        :param prefetch: Number of pages fetched ahead of the consumer.
+        :param max_results: Stop after this many hits.
+        :param params: Additional search parameters, e.g. ``facets`` or ``index``.
+        """
+        self.client = client
+        self.query = query
+        self.page_size = page_size
+        self.prefetch = max(prefetch, 0)
+        self.max_results = max_results
+        self.params = dict(params or {})
+        self.total_hits: Optional[int] = None
+        self._end: Optional[int] = None
+        self._next_offset = 0
+        self._pending: Deque[asyncio.Future] = deque()
+        self._buffer: Deque[SearchResult] = deque()
+        # Nothing is requested when no hits are wanted.
+        self._exhausted = max_results is not None and max_results <= 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> SearchResult:
+        while not self._buffer:
+            if self._exhausted:
+                raise StopAsyncIteration
+            try:
+                await self._load_next_page()
+            except BaseException:
+                self._cancel_pending()
+                raise
+        return self._buffer.popleft()
+
+    async def _fetch(self, offset: int, limit: int) -> Dict[str, Any]:
+        params = {**self.params, "query": self.query, "offset": offset, "limit": limit}
+        with self.client._decoding():
+            return await self.client._request("GET", "search", params=params)
+
+    def _schedule(self):
+        while len(self._pending) < self.prefetch and self._next_offset < self._end:
+            limit = min(self.page_size, self._end - self._next_offset)
+            self._pending.append(asyncio.ensure_future(self._fetch(self._next_offset, limit)))
+            self._next_offset += limit
+
+    async def _load_next_page(self):
+        if self._end is None:
+            limit = self.page_size if self.max_results is None else min(self.page_size, self.max_results)
+            response = await self._fetch(0, limit)
+            self.total_hits = response.get("total_hits", 0)
+            self._end = self.total_hits if self.max_results is None else min(self.total_hits, self.max_results)
+            self._next_offset = limit
+        elif self._pending:
+            response = await self._pending.popleft()
+        elif self._next_offset < self._end:
+            limit = min(self.page_size, self._end - self._next_offset)
+            response = await self._fetch(self._next_offset, limit)
+            self._next_offset += limit
+        else:
+            self._exhausted = True
+            return
+
+        hits = response.get("hits", [])
+        if not hits:
+            self._exhausted = True
+            self._cancel_pending()
+            return
+        self._buffer.extend(self.client._build_list(SearchResult, hits))
+        self._schedule()
+        if not self._pending and self._next_offset >= self._end:
+            self._exhausted = True
+
+    def _cancel_pending(self):
+        while self._pending:
+            task = self._pending.popleft()
+            if task.done():
+                # Marks a failed prefetch as retrieved, nobody will await it anymore.
+                if not task.cancelled():
+                    task.exception()
+            else:
+                task.cancel()
+
+    async def aclose(self):
+        """
+        Cancels page requests that are still running.
+        """
+        self._cancel_pending()
+        self._exhausted = True
+        self._buffer.clear()
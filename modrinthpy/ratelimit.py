@@ -0,0 +1,157 @@
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class RateLimiter:
+    """
+    Client-side token bucket fed by Modrinth's ``X-Ratelimit-*`` response headers.
+
+    Every request takes a token before it is sent. When the bucket is empty, requests wait in a
+    priority queue until the window resets; lower :class:`Priority` values are served first and
+    requests of equal priority keep their arrival order.
+    """
+
+    def __init__(self, limit: int = 300, window: float = 60.0):
+        """
+        :param limit: Requests allowed per window until the first response reports the real limit.
+        :param window: Window length in seconds until the first response reports the real reset time.
+        """
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = time.monotonic() + window
+        self._in_flight = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.requests = 0
+        self.queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, waiter in self._waiters if not waiter.done())
+
+    @property
+    def saturated(self) -> bool:
+        """
+        Requests are waiting, or the next one would have to wait for the window to reset.
+        """
+        if self.queue_depth:
+            return True
+        return self.remaining <= 0 and time.monotonic() < self.reset_at
+
+    def _take(self) -> bool:
+        now = time.monotonic()
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.window
+        if self.remaining > 0:
+            self.remaining -= 1
+            self._in_flight += 1
+            return True
+        return False
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiters:
+            waiter = self._waiters[0][2]
+            if waiter.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._take():
+                break
+            heapq.heappop(self._waiters)
+            waiter.set_result(None)
+        if self._waiters:
+            delay = max(self.reset_at - time.monotonic(), 0.0)
+            self._timer = asyncio.get_event_loop().call_later(delay, self._dispatch)
+
+    async def acquire(self, priority: int = Priority.NORMAL):
+        """
+        Waits until a request of the given priority may be sent.
+        """
+        self.requests += 1
+        if not self._waiters and self._take():
+            return
+
+        started = time.monotonic()
+        waiter = asyncio.get_event_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._order), waiter))
+        self.queued += 1
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if not waiter.cancelled():
+                # The slot was granted just before cancellation, hand it back.
+                self._in_flight -= 1
+                self.remaining += 1
+            raise
+        finally:
+            waited = time.monotonic() - started
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def release(self, headers: Optional[Mapping[str, str]] = None, limited: bool = False):
+        """
+        Returns the slot taken by :meth:`acquire` and syncs the bucket with the server.
+
+        :param headers: Response headers, if a response was received.
+        :param limited: The response was 429 Too Many Requests, so the bucket is emptied.
+        """
+        self._in_flight = max(self._in_flight - 1, 0)
+        if headers:
+            limit = _header_number(headers, "X-Ratelimit-Limit")
+            remaining = _header_number(headers, "X-Ratelimit-Remaining")
+            reset = _header_number(headers, "X-Ratelimit-Reset")
+            if reset is None:
+                reset = _header_number(headers, "Retry-After")
+            if limit is not None:
+                self.limit = int(limit)
+            if reset is not None:
+                self.reset_at = time.monotonic() + reset
+            if remaining is not None:
+                # Requests still in flight were counted locally but not yet by the server.
+                self.remaining = max(int(remaining) - self._in_flight, 0)
+        if limited:
+            self.remaining = 0
+        if self._waiters:
+            self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_in": max(self.reset_at - time.monotonic(), 0.0),
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            "requests": self.requests,
+            "queued": self.queued,
+            "total_wait": self.total_wait,
+            "max_wait": self.max_wait,
+            "avg_wait": self.total_wait / self.queued if self.queued else 0.0,
+        }
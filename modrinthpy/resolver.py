@@ -0,0 +1,246 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .exceptions import ModrinthAPIError
+from .models import Dependency, Version
+from .utils import chunk_ids
+
+REQUIRED = "required"
+OPTIONAL = "optional"
+INCOMPATIBLE = "incompatible"
+EMBEDDED = "embedded"
+
+
+class Conflict:
+    """
+    Problem found while resolving.
+
+    :ivar project_id: Project the conflict is about.
+    :ivar reason: ``"incompatible"`` (a resolved project is declared incompatible by another one),
+        ``"version"`` (two different versions of the project were pinned) or ``"target"`` (a pinned
+        version does not support the requested loaders or game versions).
+    :ivar required_by: Project IDs that caused the conflict.
+    """
+
+    __slots__ = ("project_id", "reason", "required_by")
+
+    def __init__(self, project_id: str, reason: str, required_by: List[Optional[str]]):
+        self.project_id = project_id
+        self.reason = reason
+        self.required_by = required_by
+
+    def __repr__(self) -> str:
+        return f"<Conflict {self.reason} project={self.project_id} required_by={self.required_by}>"
+
+
+class Resolution:
+    """
+    Result of a dependency resolution.
+
+    :ivar versions: Resolved version of every project, keyed by project ID.
+    :ivar required_by: Projects that pulled each project in; roots map to ``[None]``.
+    :ivar optional: Optional dependencies that were not followed, keyed by project ID.
+    :ivar missing: Dependencies without a compatible or existing version.
+    :ivar conflicts: Incompatibilities and version clashes.
+    :ivar cycles: Dependency cycles as lists of project IDs, first and last being the same.
+    :ivar requests: Number of API requests the resolution made.
+    """
+
+    def __init__(self):
+        self.versions: Dict[str, Version] = {}
+        self.required_by: Dict[str, List[Optional[str]]] = {}
+        self.optional: Dict[str, List[str]] = {}
+        self.missing: List[Tuple[str, Optional[str]]] = []
+        self.conflicts: List[Conflict] = []
+        self.cycles: List[List[str]] = []
+        self.requests = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.conflicts
+
+    def __repr__(self) -> str:
+        return (f"<Resolution versions={len(self.versions)} missing={len(self.missing)} "
+                f"conflicts={len(self.conflicts)} requests={self.requests}>")
+
+
+class _Requirement:
+    __slots__ = ("project_id", "version_id", "required_by")
+
+    def __init__(self, project_id: Optional[str], version_id: Optional[str], required_by: Optional[str]):
+        self.project_id = project_id
+        self.version_id = version_id
+        self.required_by = required_by
+
+
+class DependencyResolver:
+    """
+    Resolves the transitive dependency closure of projects or versions for a loader and game version.
+
+    Dependencies are expanded breadth-first. Each level fetches all pinned versions with one batched
+    ``versions`` request and the latest compatible version of all unpinned projects concurrently.
+    Every project and version is fetched at most once per resolver.
+    """
+
+    def __init__(self, client, loaders: Optional[List[str]] = None, game_versions: Optional[List[str]] = None,
+                 include_optional: bool = False, concurrency: int = 8):
+        """
+        :param client: Client used for the lookups.
+        :param loaders: Target loaders, e.g. ``["fabric"]``.
+        :param game_versions: Target game versions, e.g. ``["1.20.1"]``.
+        :param include_optional: Follow optional dependencies as well.
+        :param concurrency: Maximum number of project version listings fetched at the same time.
+        """
+        self.client = client
+        self.loaders = loaders
+        self.game_versions = game_versions
+        self.include_optional = include_optional
+        self.concurrency = concurrency
+        self._versions: Dict[str, Optional[Version]] = {}
+        self._latest: Dict[str, Optional[Version]] = {}
+        self.requests = 0
+
+    def compatible(self, version: Version) -> bool:
+        if self.loaders and not set(self.loaders) & set(version.loaders or ()):
+            return False
+        if self.game_versions and not set(self.game_versions) & set(version.game_versions or ()):
+            return False
+        return True
+
+    async def _fetch_versions(self, ids: Iterable[str]):
+        ids = [version_id for version_id in dict.fromkeys(ids) if version_id not in self._versions]
+        if not ids:
+            return
+        self.requests += len(chunk_ids(ids, self.client.MAX_IDS_PARAM_LENGTH))
+        result = await self.client.get_versions(ids)
+        for version in result:
+            self._versions[version.id] = version
+        for version_id in result.missing:
+            self._versions[version_id] = None
+
+    async def _fetch_latest(self, project_ids: Iterable[str]):
+        project_ids = [project_id for project_id in dict.fromkeys(project_ids) if project_id not in self._latest]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(project_id: str):
+            async with semaphore:
+                self.requests += 1
+                try:
+                    versions = await self.client.get_project_versions(
+                        id=project_id, loaders=self.loaders, game_versions=self.game_versions)
+                except ModrinthAPIError as error:
+                    if error.status_code != 404:
+                        raise
+                    versions = []
+            compatible = [version for version in versions if self.compatible(version)]
+            releases = [version for version in compatible if version.version_type == "release"]
+            latest = (releases or compatible or [None])[0]
+            self._latest[project_id] = latest
+            if versions:
+                # A project given by slug is also known under its ID, which dependencies refer to.
+                self._latest.setdefault(versions[0].project_id, latest)
+            if latest is not None:
+                self._versions.setdefault(latest.id, latest)
+
+        await asyncio.gather(*[fetch(project_id) for project_id in project_ids])
+
+    @staticmethod
+    def _path_to(resolution: Resolution, start: str, target: str) -> Optional[List[str]]:
+        """
+        Finds a chain of ``required_by`` links from ``start`` back to ``target``.
+        """
+        stack = [(start, [start])]
+        seen = set()
+        while stack:
+            project_id, path = stack.pop()
+            if project_id == target:
+                return path
+            if project_id in seen:
+                continue
+            seen.add(project_id)
+            for parent in resolution.required_by.get(project_id, ()):
+                if parent is not None:
+                    stack.append((parent, path + [parent]))
+        return None
+
+    async def resolve(self, projects: Iterable[str] = (), versions: Iterable[str] = ()) -> Resolution:
+        """
+        :param projects: Root project IDs or slugs; their latest compatible version is used.
+        :param versions: Root version IDs, used as they are.
+        """
+        resolution = Resolution()
+        requests_before = self.requests
+        level = [_Requirement(None, version_id, None) for version_id in versions]
+        level += [_Requirement(project_id, None, None) for project_id in projects]
+        incompatible: Dict[str, List[str]] = {}
+        expanded: Set[str] = set()
+
+        while level:
+            # The resolver reads model attributes whatever format the client returns by default.
+            with self.client.options(response_format="model"):
+                await asyncio.gather(
+                    self._fetch_versions(req.version_id for req in level if req.version_id),
+                    self._fetch_latest(req.project_id for req in level
+                                       if not req.version_id and req.project_id
+                                       and req.project_id not in resolution.versions),
+                )
+
+            next_level = []
+            for req in level:
+                if req.version_id:
+                    version = self._versions.get(req.version_id)
+                elif req.project_id in resolution.versions:
+                    version = resolution.versions[req.project_id]
+                else:
+                    version = self._latest.get(req.project_id)
+                if version is None:
+                    resolution.missing.append((req.version_id or req.project_id, req.required_by))
+                    continue
+
+                project_id = version.project_id
+                parents = resolution.required_by.setdefault(project_id, [])
+                if req.required_by not in parents:
+                    parents.append(req.required_by)
+                resolved = resolution.versions.get(project_id)
+                if resolved is not None:
+                    if req.version_id and resolved.id != version.id:
+                        resolution.conflicts.append(Conflict(project_id, "version", list(parents)))
+                    if req.required_by is not None:
+                        cycle = self._path_to(resolution, req.required_by, project_id)
+                        if cycle is not None:
+                            resolution.cycles.append([project_id] + cycle)
+                    continue
+
+                resolution.versions[project_id] = version
+                if req.version_id and not self.compatible(version):
+                    resolution.conflicts.append(Conflict(project_id, "target", [req.required_by]))
+                if project_id in expanded:
+                    continue
+                expanded.add(project_id)
+
+                for dependency in version.dependencies or ():
+                    if not isinstance(dependency, Dependency):
+                        dependency = Dependency(dependency)
+                    kind = dependency.dependency_type or REQUIRED
+                    if kind == EMBEDDED:
+                        continue
+                    if kind == INCOMPATIBLE:
+                        if dependency.project_id:
+                            incompatible.setdefault(dependency.project_id, []).append(project_id)
+                        continue
+                    if kind == OPTIONAL and not self.include_optional:
+                        if dependency.project_id:
+                            resolution.optional.setdefault(dependency.project_id, []).append(project_id)
+                        continue
+                    if dependency.version_id or dependency.project_id:
+                        next_level.append(_Requirement(dependency.project_id, dependency.version_id, project_id))
+            level = next_level
+
+        for project_id, declared_by in incompatible.items():
+            if project_id in resolution.versions:
+                resolution.conflicts.append(Conflict(project_id, INCOMPATIBLE, declared_by))
+        for project_id in list(resolution.optional):
+            if project_id in resolution.versions:
+                del resolution.optional[project_id]
+        resolution.requests = self.requests - requests_before
+        return resolution
@@ -0,0 +1,94 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Reads the ``Retry-After`` header, given either in seconds or as an HTTP date.
+
+    :return: Delay in seconds, or None if the header is missing or malformed.
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is sent again and how long to wait before it.
+
+    Delays use exponential backoff with full jitter: attempt ``n`` sleeps a random time between
+    zero and ``min(backoff_cap, backoff_base * 2 ** (n - 1))``. A ``Retry-After`` header from the
+    server takes precedence when ``respect_retry_after`` is set, up to ``max_retry_after``.
+
+    ``retries`` and ``exhausted`` are counted by the code sending the requests: the number of retries
+    made and of retryable failures given up after ``max_attempts``.
+    """
+
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 0.5, backoff_cap: float = 30.0,
+                 retry_statuses: Iterable[int] = RETRYABLE_STATUSES,
+                 methods: Iterable[str] = IDEMPOTENT_METHODS,
+                 retry_connection_errors: bool = True, respect_retry_after: bool = True,
+                 max_retry_after: float = 60.0, deadline: Optional[float] = None):
+        """
+        :param max_attempts: Total attempts per call, including the first one.
+        :param backoff_base: Upper bound in seconds of the first backoff delay.
+        :param backoff_cap: Upper bound in seconds of any backoff delay.
+        :param retry_statuses: Response status codes that are retried.
+        :param methods: HTTP methods that are retried. Only idempotent methods by default.
+        :param retry_connection_errors: Retry connection resets, timeouts and broken payloads.
+        :param respect_retry_after: Wait as long as the ``Retry-After`` header asks.
+        :param max_retry_after: Longest wait in seconds taken from a ``Retry-After`` header.
+        :param deadline: Overall time limit in seconds for a call, including all retries and waits.
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_statuses = frozenset(retry_statuses)
+        self.methods = frozenset(method.upper() for method in methods)
+        self.retry_connection_errors = retry_connection_errors
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.deadline = deadline
+        self.retries = 0
+        self.exhausted = 0
+
+    def retryable(self, method: str, status: Optional[int] = None) -> bool:
+        """
+        :param method: HTTP method of the failed request.
+        :param status: Response status code, or None if the request failed without a response.
+        """
+        if method.upper() not in self.methods:
+            return False
+        if status is None:
+            return self.retry_connection_errors
+        return status in self.retry_statuses
+
+    def should_retry(self, method: str, attempt: int, status: Optional[int] = None) -> bool:
+        """
+        :param method: HTTP method of the failed request.
+        :param attempt: Number of attempts made so far.
+        :param status: Response status code, or None if the request failed without a response.
+        """
+        return attempt < self.max_attempts and self.retryable(method, status)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None and self.respect_retry_after:
+            return min(retry_after, self.max_retry_after)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"retries": self.retries, "exhausted": self.exhausted}
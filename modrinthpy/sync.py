@@ -0,0 +1,159 @@
+import asyncio
+import functools
+import inspect
+import threading
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .client import ModrinthClient
+from .models import SearchResult
+
+# A batch call is ``(method_name,)``, ``(method_name, args)`` or ``(method_name, args, kwargs)``.
+BatchCall = Tuple[Any, ...]
+
+
+class SyncModrinthClient:
+    """
+    Blocking client for threaded code such as Flask or Django workers and scripts.
+
+    Every public coroutine method of :class:`ModrinthClient` is mirrored as a regular method. The calls run
+    on one event loop in a background thread, so all callers share one warm connection pool, cache and
+    rate limiter. Any number of threads may call the client at the same time.
+    """
+
+    def __init__(self, *args, client: Optional[ModrinthClient] = None, **kwargs):
+        """
+        :param client: Async client to run the calls on. By default one is created from the remaining
+            arguments, which are those of :class:`ModrinthClient`.
+        """
+        self.client = client or ModrinthClient(*args, **kwargs)
+        self._options = threading.local()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="modrinthpy-loop", daemon=True)
+        self._thread.start()
+        self._closed = False
+
+    def _submit(self, coro) -> "asyncio.Future":
+        if self._closed:
+            coro.close()
+            raise RuntimeError("SyncModrinthClient is closed")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _run(self, coro) -> Any:
+        future = self._submit(coro)
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    async def _invoke(self, overrides: Dict[str, Any], method: Callable[..., Awaitable[Any]], args: Sequence[Any],
+                      kwargs: Dict[str, Any]) -> Any:
+        if not overrides:
+            return await method(*args, **kwargs)
+        # Options are set on the calling thread, so they are applied again on the loop thread.
+        with self.client.options(**overrides):
+            return await method(*args, **kwargs)
+
+    def call(self, name: str, *args, **kwargs) -> Any:
+        """
+        Runs the client method ``name`` and waits for its result.
+        """
+        return self._run(self._invoke(self._current_options(), getattr(self.client, name), args, kwargs))
+
+    def _current_options(self) -> Dict[str, Any]:
+        return getattr(self._options, "values", {})
+
+    @contextmanager
+    def options(self, **overrides):
+        """
+        Applies per-call options, see :meth:`ModrinthClient.options`, to calls made by this thread inside the block.
+        """
+        previous = self._current_options()
+        self._options.values = {**previous, **overrides}
+        try:
+            yield self
+        finally:
+            self._options.values = previous
+
+    def batch(self, calls: Iterable[BatchCall], return_exceptions: bool = False) -> List[Any]:
+        """
+        Runs several calls concurrently on the loop and waits for all of them.
+
+        :param calls: ``(method_name, args, kwargs)`` tuples; ``args`` and ``kwargs`` may be left out,
+            e.g. ``[("get_project", (), {"slug": "sodium"}), ("get_version", ("AABBCCDD",))]``.
+        :param return_exceptions: Return exceptions in place of results instead of raising the first one.
+        :return: Results in the order of ``calls``.
+        """
+        overrides = self._current_options()
+        coros = []
+        for call in calls:
+            name, args, kwargs = (tuple(call) + ((), {}))[:3]
+            coros.append(self._invoke(overrides, getattr(self.client, name), args, kwargs or {}))
+
+        async def gather():
+            return list(await asyncio.gather(*coros, return_exceptions=return_exceptions))
+
+        return self._run(gather())
+
+    def map(self, name: str, items: Iterable[Any], return_exceptions: bool = False) -> List[Any]:
+        """
+        Calls the method ``name`` once per item concurrently, e.g. ``client.map("get_version", version_ids)``.
+
+        :return: Results in the order of ``items``.
+        """
+        return self.batch([(name, (item,)) for item in items], return_exceptions)
+
+    def iter_search(self, query: str, page_size: int = 100, prefetch: int = 2,
+                    max_results: Optional[int] = None, **kwargs) -> Iterator[SearchResult]:
+        """
+        Iterates over all search results. Following pages are fetched on the loop while results are consumed.
+        The options of this thread when iteration starts apply to every page.
+        """
+        overrides = self._current_options()
+        iterator = self.client.iter_search(query, page_size, prefetch, max_results, **kwargs)
+        try:
+            while True:
+                try:
+                    yield self._run(self._invoke(overrides, iterator.__anext__, (), {}))
+                except StopAsyncIteration:
+                    return
+        finally:
+            if not self._closed:
+                self._run(self._invoke(overrides, iterator.aclose, (), {}))
+
+    def close(self):
+        """
+        Closes the async client and stops the loop thread.
+        """
+        if self._closed:
+            return
+        try:
+            self._run(self.client.close())
+        finally:
+            self._closed = True
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _mirror(name: str, method):
+    @functools.wraps(method)
+    def call(self, *args, **kwargs):
+        return self._run(self._invoke(self._current_options(), getattr(self.client, name), args, kwargs))
+
+    return call
+
+
+for _name, _method in inspect.getmembers(ModrinthClient, inspect.isfunction):
+    if (not _name.startswith("_") and _name not in ("start", "close", "run")
+            and not hasattr(SyncModrinthClient, _name)
+            and inspect.iscoroutinefunction(inspect.unwrap(_method))):
+        setattr(SyncModrinthClient, _name, _mirror(_name, _method))
+del _name, _method
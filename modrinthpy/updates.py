@@ -0,0 +1,171 @@
+import asyncio
+import fnmatch
+import hashlib
+import os
+from concurrent.futures import Executor
+from typing import Dict, Iterable, List, Optional
+
+from .codec import JSONCodec, default_codec
+from .models import Version
+
+
+def hash_file(path: str, algorithm: str = "sha1", chunk_size: int = 1 << 20) -> str:
+    """
+    Hashes a file in chunks. Module-level so it can run in a process pool.
+    """
+    hasher = hashlib.new(algorithm)
+    with open(path, "rb") as stream:
+        for chunk in iter(lambda: stream.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class HashCache:
+    """
+    Persistent map of file hashes keyed by path, modification time and size.
+    A file whose mtime and size are unchanged is never read again.
+    """
+
+    def __init__(self, path: Optional[str] = None, codec: Optional[JSONCodec] = None):
+        """
+        :param path: JSON file the cache is loaded from and saved to. None keeps it in memory only.
+        :param codec: JSON codec used to read and write the file.
+        """
+        self.path = path
+        self.codec = codec or default_codec()
+        self._entries: Dict[str, list] = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, "rb") as stream:
+                    self._entries = self.codec.loads(stream.read())
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def get(self, path: str, stat: os.stat_result, algorithm: str) -> Optional[str]:
+        entry = self._entries.get(path)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2].get(algorithm)
+        return None
+
+    def set(self, path: str, stat: os.stat_result, algorithm: str, digest: str):
+        entry = self._entries.get(path)
+        if not entry or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+            entry = self._entries[path] = [stat.st_mtime_ns, stat.st_size, {}]
+        entry[2][algorithm] = digest
+        self._dirty = True
+
+    def prune(self, keep: Iterable[str], directory: str):
+        """
+        Forgets every file of ``directory`` not in ``keep``, e.g. mods that were removed. Entries of
+        other directories sharing the cache file are kept.
+        """
+        keep = set(keep)
+        directory = os.path.abspath(directory)
+        for path in [path for path in self._entries if path not in keep and os.path.dirname(path) == directory]:
+            del self._entries[path]
+            self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as stream:
+            stream.write(self.codec.dumps_bytes(self._entries))
+        os.replace(temporary, self.path)
+        self._dirty = False
+
+
+async def hash_directory(directory: str, algorithm: str = "sha1", pattern: str = "*.jar",
+                         cache: Optional[HashCache] = None, executor: Optional[Executor] = None) -> Dict[str, str]:
+    """
+    Hashes every file in ``directory`` matching ``pattern`` in parallel.
+
+    :param cache: Hash cache consulted before reading a file and updated afterwards.
+    :param executor: Pool the files are hashed in. Defaults to the event loop's thread pool,
+        which runs in parallel because ``hashlib`` releases the GIL for large buffers.
+    :return: Hash of every file, keyed by absolute path.
+    """
+    loop = asyncio.get_event_loop()
+    cache = cache or HashCache()
+    hashes = {}
+    pending = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file() or not fnmatch.fnmatch(entry.name, pattern):
+                continue
+            path = os.path.abspath(entry.path)
+            stat = entry.stat()
+            digest = cache.get(path, stat, algorithm)
+            if digest is None:
+                pending[path] = (stat, loop.run_in_executor(executor, hash_file, path, algorithm))
+            else:
+                hashes[path] = digest
+
+    digests = await asyncio.gather(*[future for _, future in pending.values()])
+    for (path, (stat, _)), digest in zip(pending.items(), digests):
+        hashes[path] = digest
+        cache.set(path, stat, algorithm, digest)
+    cache.prune(hashes, directory)
+    return hashes
+
+
+class ModUpdate:
+    """
+    Update status of one local file.
+
+    :ivar current: Version the file belongs to, or None if Modrinth does not know the file.
+    :ivar latest: Newest version compatible with the requested loaders and game versions, or None.
+    """
+
+    __slots__ = ("path", "hash", "current", "latest")
+
+    def __init__(self, path: str, hash: str, current: Optional[Version], latest: Optional[Version]):
+        self.path = path
+        self.hash = hash
+        self.current = current
+        self.latest = latest
+
+    @property
+    def update_available(self) -> bool:
+        return self.current is not None and self.latest is not None and self.latest.id != self.current.id
+
+    def __repr__(self) -> str:
+        current = self.current.version_number if self.current else None
+        latest = self.latest.version_number if self.latest else None
+        return f"<ModUpdate {os.path.basename(self.path)} current={current} latest={latest}>"
+
+
+async def check_updates(client, directory: str, loaders: Optional[List[str]] = None,
+                        game_versions: Optional[List[str]] = None, algorithm: str = "sha1",
+                        pattern: str = "*.jar", cache_path: Optional[str] = None,
+                        executor: Optional[Executor] = None) -> List[ModUpdate]:
+    """
+    Finds the Modrinth version of every mod in a directory and its newest compatible version.
+
+    Hashes are looked up with the bulk ``version_files`` and ``version_files/update`` endpoints,
+    so the whole directory needs only two requests (more for very large directories).
+
+    :param client: Client used for the lookups.
+    :param directory: Directory with the mod files.
+    :param loaders: Loaders the latest version must support, e.g. ``["fabric"]``.
+    :param game_versions: Game versions the latest version must support, e.g. ``["1.20.1"]``.
+    :param algorithm: ``sha1`` or ``sha512``.
+    :param pattern: Glob pattern of the files to check.
+    :param cache_path: Hash cache file, e.g. in the application's cache directory. It should not be
+        placed in ``directory``, which belongs to the game. None hashes every file on every call.
+    :param executor: Pool the files are hashed in, e.g. a ``ProcessPoolExecutor``.
+    :return: One :class:`ModUpdate` per file, sorted by path.
+    """
+    cache = HashCache(cache_path, client.json_codec)
+    hashes = await hash_directory(directory, algorithm, pattern, cache, executor)
+    cache.save()
+
+    digests = list(dict.fromkeys(hashes.values()))
+    with client.options(response_format="model"):
+        current, latest = await asyncio.gather(
+            client.get_versions_from_hashes(digests, algorithm),
+            client.get_latest_versions_from_hashes(digests, algorithm, loaders, game_versions),
+        )
+    return [ModUpdate(path, digest, current.get(digest), latest.get(digest))
+            for path, digest in sorted(hashes.items())]
@@ -0,0 +1,146 @@
+import hashlib
+import io
+import mmap
+import os
+from typing import Any, BinaryIO, Callable, Dict, Optional, Union
+
+UploadSource = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, mmap.mmap, BinaryIO]
+ProgressCallback = Callable[[str, int, int], Any]
+
+
+class UploadFile(io.RawIOBase):
+    """
+    Readable view of a file to upload that hashes the bytes and reports progress as they are read.
+
+    Accepts a path, an open binary file object, ``bytes`` or a memory-mapped file. Paths and file
+    objects are read chunk by chunk while the request body is written, so the file is never held
+    in memory as a whole.
+    """
+
+    def __init__(self, source: UploadSource, name: Optional[str] = None,
+                 algorithms=("sha1", "sha512"), progress: Optional[ProgressCallback] = None):
+        """
+        :param source: Path, binary file object, bytes-like object or ``mmap``.
+        :param name: File name reported to ``progress``. Defaults to the file name of the source.
+        :param algorithms: Hash algorithms computed while reading.
+        :param progress: Called as ``progress(name, bytes_read, total_bytes)`` after every chunk.
+        """
+        super().__init__()
+        self._view: Optional[memoryview] = None
+        self._stream: Optional[BinaryIO] = None
+        self._owns_stream = False
+        if isinstance(source, (str, os.PathLike)):
+            self._stream = open(source, "rb")
+            self._owns_stream = True
+            name = name or os.path.basename(os.fspath(source))
+        elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+            self._view = memoryview(source).cast("B")
+        elif hasattr(source, "read"):
+            self._stream = source
+            name = name or os.path.basename(getattr(source, "name", "") or "") or None
+        else:
+            raise TypeError(f"Can not upload {type(source).__name__}, expected a path, file object or bytes")
+
+        self.name = name or "file"
+        self.algorithms = tuple(algorithms)
+        self.progress = progress
+        if self._view is not None:
+            self._start = 0
+            self.length = len(self._view)
+        else:
+            self._start = self._stream.tell()
+            self.length = self._stream.seek(0, os.SEEK_END) - self._start
+            self._stream.seek(self._start)
+        self._reset()
+
+    def _reset(self):
+        self.bytes_read = 0
+        self._hashers = {algorithm: hashlib.new(algorithm) for algorithm in self.algorithms}
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.length - self.bytes_read
+        if self._view is not None:
+            chunk = self._view[self.bytes_read:self.bytes_read + size].tobytes()
+        else:
+            chunk = self._stream.read(size)
+        if chunk:
+            for hasher in self._hashers.values():
+                hasher.update(chunk)
+            self.bytes_read += len(chunk)
+            if self.progress is not None:
+                self.progress(self.name, self.bytes_read, self.length)
+        return chunk
+
+    def tell(self) -> int:
+        return self.bytes_read
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """
+        Only rewinding to the start is supported, which happens when a request is sent again.
+        """
+        position = {os.SEEK_SET: 0, os.SEEK_CUR: self.bytes_read, os.SEEK_END: self.length}[whence] + offset
+        if position == self.bytes_read:
+            return position
+        if position != 0:
+            raise io.UnsupportedOperation("UploadFile can only be rewound to the start")
+        if self._stream is not None:
+            self._stream.seek(self._start)
+        self._reset()
+        return 0
+
+    def hexdigests(self) -> Dict[str, str]:
+        """
+        Hashes of the bytes read so far, keyed by algorithm.
+        """
+        return {algorithm: hasher.hexdigest() for algorithm, hasher in self._hashers.items()}
+
+    def close(self):
+        if self._owns_stream and self._stream is not None:
+            self._stream.close()
+        if self._view is not None:
+            self._view.release()
+        super().close()
+
+
+def _define_upload_payload() -> type:
+    # aiohttp is only imported once an upload is made.
+    from aiohttp.payload import IOBasePayload
+
+    class UploadPayload(IOBasePayload):
+        """
+        Streams an :class:`UploadFile` into a request body with a known ``Content-Length``.
+
+        The file is left open after the body is written, so a retried request can rewind and send it
+        again; whoever created the :class:`UploadFile` closes it.
+        """
+
+        def __init__(self, value: UploadFile, *args, **kwargs):
+            kwargs.setdefault("filename", value.name)
+            super().__init__(value, *args, **kwargs)
+
+        @property
+        def size(self) -> int:
+            return self._value.length
+
+        def _close(self):
+            pass
+
+        async def close(self):
+            pass
+
+    UploadPayload.__qualname__ = "UploadPayload"
+    return UploadPayload
+
+
+def __getattr__(name: str) -> Any:
+    if name == "UploadPayload":
+        globals()[name] = payload = _define_upload_payload()
+        return payload
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
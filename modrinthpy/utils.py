@@ -1,46 +1,116 @@
+import calendar
 import json
-from typing import List, Tuple
-
-from aiohttp import FormData
-from requests_toolbelt import MultipartEncoder
+import re
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, Union
+from urllib.parse import quote
 
+from .codec import JSONCodec, default_codec
 from .objects import CreatableProject, CreatableVersion
+from .upload import UploadFile, UploadSource
+
+if TYPE_CHECKING:
+    from aiohttp import FormData
 
 
-def create_project_payload(project: CreatableProject) -> FormData:
+def create_project_payload(project: CreatableProject, codec: Optional[JSONCodec] = None) -> "FormData":
     """
     Creates a payload to create a project.
 
     :param project: An instance of the Project model.
+    :param codec: JSON codec used to encode the project data.
     :return: FormData to send in the request.
     """
+    from aiohttp import FormData
+
+    codec = codec or default_codec()
     fields = FormData()
 
-    fields.add_field('data', json.dumps(project.to_dict()), content_type='application/json')
+    fields.add_field('data', codec.dumps(project.to_dict()), content_type='application/json')
 
     # fields.add_field('icon', open('path_to_icon.png', 'rb'), filename='icon.png', content_type='image/png')
 
     return fields
 
 
-def create_version_payload(version: dict, files: List[Tuple[str, bytes, str]]) -> FormData:
+def create_version_payload(version: dict, files: List[Tuple[str, Union[UploadSource, UploadFile], str]],
+                           codec: Optional[JSONCodec] = None) -> "FormData":
     """
     Creates a payload for the version creation request using aiohttp.FormData.
+    File contents are streamed into the request body while it is sent.
     
     :param version: An instance of the CreatableVersion model.
-    :param files: List of files to upload.
+    :param files: List of ``(filename, content, mime_type)`` tuples to upload. The content may be
+        a path, an open binary file, bytes, an ``mmap`` or an :class:`UploadFile`.
+    :param codec: JSON codec used to encode the version data.
     :return: FormData to send in the request.
     """
+    from aiohttp import FormData
+
+    from .upload import UploadPayload
+
+    codec = codec or default_codec()
     form_data = FormData()
 
-    form_data.add_field('data', json.dumps(version), content_type='application/json')
+    form_data.add_field('data', codec.dumps(version), content_type='application/json')
 
     for i, (filename, file_content, mime_type) in enumerate(files):
+        if not isinstance(file_content, UploadFile):
+            file_content = UploadFile(file_content, name=filename)
         form_data.add_field(
             f'file_{i}',
-            file_content,
+            UploadPayload(file_content, filename=filename, content_type=mime_type),
             filename=filename,
             content_type=mime_type
         )
 
     return form_data
+
+
+def chunk_ids(ids: Iterable[str], max_length: int) -> List[List[str]]:
+    """
+    Splits IDs into groups whose URL-encoded JSON array stays within ``max_length`` characters.
+
+    :param ids: IDs or slugs to split.
+    :param max_length: Maximum encoded length of one ``ids`` query parameter.
+    :return: List of ID groups, in input order.
+    """
+    chunks = []
+    chunk = []
+    length = len(quote("[]", safe=""))
+    separator = len(quote(",", safe=""))
+    for item in ids:
+        cost = len(quote(json.dumps(item), safe="")) + (separator if chunk else 0)
+        if chunk and length + cost > max_length:
+            chunks.append(chunk)
+            chunk = []
+            length = len(quote("[]", safe=""))
+            cost -= separator
+        chunk.append(item)
+        length += cost
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+_TIMESTAMP = re.compile(r"(\d{4})-(\d\d)-(\d\d)(?:[T ](\d\d):(\d\d):(\d\d)(\.\d+)?(Z|[+-]\d\d:?\d\d)?)?$")
+
+
+def parse_timestamp(value: Optional[str]) -> float:
+    """
+    Converts an API timestamp such as ``2024-01-01T12:00:00.123456Z`` to seconds since the epoch.
+    The API varies the number of fraction digits, so the strings cannot be compared directly.
+    A bare date such as ``2024-01-01`` is read as midnight UTC.
+
+    :return: The timestamp, or 0.0 if the value is missing or malformed.
+    """
+    match = _TIMESTAMP.match(value) if value else None
+    if match is None:
+        return 0.0
+    year, month, day, hour, minute, second, fraction, zone = match.groups()
+    seconds = calendar.timegm((int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0)))
+    if fraction:
+        seconds += float(fraction)
+    if zone and zone != "Z":
+        offset = int(zone[1:3]) * 3600 + int(zone[-2:]) * 60
+        seconds -= offset if zone[0] == "+" else -offset
+    return float(seconds)
@@ -0,0 +1,79 @@
+"""
+Local stand-in for the API: a handler per test, served by aiohttp on a free port.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from aiohttp import web
+
+from modrinthpy import ModrinthClient
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+def json_response(data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    return web.json_response(data, status=status, headers=headers)
+
+
+def project(id: str, **fields) -> Dict[str, Any]:
+    return {"id": id, "slug": id.lower(), "title": id, "versions": [], "updated": "2024-01-01T00:00:00Z", **fields}
+
+
+def version(id: str, project_id: str, **fields) -> Dict[str, Any]:
+    return {"id": id, "project_id": project_id, "name": id, "version_number": "1.0.0", "downloads": 0,
+            "loaders": ["fabric"], "game_versions": ["1.20.1"], "version_type": "release",
+            "dependencies": [], "files": [], **fields}
+
+
+class Requests(list):
+    """
+    ``(method, path)`` of every request the server received, in arrival order.
+    """
+
+    def count(self, method: str, path: Optional[str] = None) -> int:
+        return sum(1 for sent, sent_path in self if sent == method and (path is None or sent_path == path))
+
+
+@asynccontextmanager
+async def serve(handler: Handler, **client_options):
+    """
+    Starts the server and yields a client pointed at it, plus the list of received requests.
+    """
+    requests = Requests()
+
+    async def record(request: web.Request) -> web.StreamResponse:
+        requests.append((request.method, request.path[len("/v2/"):]))
+        return await handler(request)
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", record)
+    runner = web.AppRunner(app, handle_signals=False)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    client = ModrinthClient(**client_options)
+    client.BASE_URL = f"http://127.0.0.1:{port}/v2"
+    try:
+        async with client:
+            yield client, requests
+    finally:
+        await runner.cleanup()
+
+
+def run(coro: Awaitable[Any]) -> Any:
+    return asyncio.run(coro)
+
+
+async def elapsed(coro: Awaitable[Any]) -> List[Any]:
+    """
+    :return: ``[result or exception, seconds]``.
+    """
+    loop = asyncio.get_event_loop()
+    started = loop.time()
+    try:
+        result = await coro
+    except Exception as error:
+        result = error
+    return [result, loop.time() - started]
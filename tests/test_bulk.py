@@ -0,0 +1,103 @@
+import collections
+
+from aiohttp import web
+
+from modrinthpy import Mutation, RetryPolicy
+
+from tests.support import json_response, run, serve, version
+
+
+def flaky(failures):
+    """
+    Answers each target with the queued statuses first, then succeeds.
+    """
+    queued = {target: list(statuses) for target, statuses in failures.items()}
+    deleted = set()
+
+    async def handler(request):
+        target = request.path.rsplit("/", 1)[-1]
+        statuses = queued.get(target)
+        if statuses:
+            status = statuses.pop(0)
+            if status == "deleted":
+                # The delete went through, but the client only saw a gateway error.
+                deleted.add(target)
+                status = 502
+            return json_response({"error": "failed", "description": "injected"}, status=status)
+        if request.method == "DELETE":
+            if target in deleted:
+                return json_response({"error": "not_found", "description": "gone"}, status=404)
+            return web.Response(status=204)
+        if request.method == "PATCH" and target == "projects":
+            assert isinstance(await request.json(), dict)
+            return web.Response(status=204)
+        return json_response(version(target, "P1"))
+
+    return handler
+
+
+def fast_retry(**options) -> RetryPolicy:
+    return RetryPolicy(**{"backoff_base": 0.001, "backoff_cap": 0.001, "methods": ("PATCH", "DELETE"), **options})
+
+
+def test_attempts_count_every_request_when_the_client_retries_too():
+    async def main():
+        handler = flaky({"V1": [503, 503, 503], "V2": [503]})
+        # The client's own policy must not multiply the mutator's attempts.
+        async with serve(handler, api_key="token", retry=fast_retry(max_attempts=3)) as (client, requests):
+            policy = fast_retry(max_attempts=3)
+            report = await client.bulk_mutate([Mutation.update_version("V1", {"featured": False}),
+                                               Mutation.update_version("V2", {"featured": False})],
+                                              retry=policy)
+            first, second = report
+            assert first.status == "error" and first.attempts == 3
+            assert second.ok and second.attempts == 2
+            assert requests.count("PATCH", "version/V1") == 3
+            assert requests.count("PATCH", "version/V2") == 2
+            assert client.retry.retries == 0
+            assert policy.stats() == {"retries": 3, "exhausted": 1}
+    run(main())
+
+
+def test_retried_delete_answered_with_404_succeeded():
+    async def main():
+        async with serve(flaky({"V1": ["deleted"]}), api_key="token") as (client, requests):
+            report = await client.bulk_mutate([Mutation.delete_version("V1"), Mutation.delete_version("V2")],
+                                              retry=fast_retry())
+            assert report.ok
+            assert [result.attempts for result in report] == [2, 1]
+    run(main())
+
+
+def test_first_delete_answered_with_404_is_an_error():
+    async def main():
+        async def handler(request):
+            return json_response({"error": "not_found", "description": "gone"}, status=404)
+
+        async with serve(handler, api_key="token") as (client, requests):
+            report = await client.bulk_mutate([Mutation.delete_version("V1")], retry=fast_retry())
+            assert [result.status for result in report] == ["error"]
+            assert report[0].error.status_code == 404
+    run(main())
+
+
+def test_failures_do_not_stop_the_other_mutations():
+    async def main():
+        async with serve(flaky({"V1": [400]}), api_key="token") as (client, requests):
+            report = await client.bulk_mutate((Mutation.update_version(f"V{index}", {"featured": False})
+                                               for index in range(1, 6)), concurrency=2, retry=fast_retry())
+            assert [result.ok for result in report] == [False, True, True, True, True]
+            assert report[0].attempts == 1
+    run(main())
+
+
+def test_eligible_project_updates_use_the_bulk_endpoint():
+    async def main():
+        async with serve(flaky({}), api_key="token") as (client, requests):
+            mutations = [Mutation.update_project(f"P{index}", {"add_categories": ["utility"]}) for index in range(5)]
+            mutations.append(Mutation.update_project("P9", {"title": "Own request"}))
+            report = await client.bulk_mutate(mutations, retry=fast_retry())
+            assert report.ok
+            assert [result.bulk for result in report] == [True] * 5 + [False]
+            assert collections.Counter(path for _, path in requests) == {"projects": 1, "project/P9": 1}
+    run(main())
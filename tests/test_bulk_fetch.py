@@ -0,0 +1,63 @@
+import asyncio
+import json
+from urllib.parse import quote
+
+from modrinthpy.utils import chunk_ids
+
+from tests.support import json_response, project, run, serve, version
+
+
+def test_chunks_stay_within_the_encoded_length():
+    ids = [f"id{index:05d}" for index in range(500)]
+    chunks = chunk_ids(ids, 200)
+    assert [item for chunk in chunks for item in chunk] == ids
+    assert len(chunks) > 1
+    assert all(len(quote(json.dumps(chunk, separators=(",", ":")), safe="")) <= 200 for chunk in chunks)
+
+
+def test_projects_are_fetched_in_chunks_and_returned_in_input_order():
+    in_flight = []
+    peak = []
+
+    async def handler(request):
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        ids = json.loads(request.query["ids"])
+        return json_response([project(item) for item in reversed(ids) if item != "GONE"])
+
+    async def main():
+        async with serve(handler) as (client, requests):
+            client.MAX_IDS_PARAM_LENGTH = 100
+            ids = [f"P{index}" for index in range(40)] + ["GONE", "P3"]
+            result = await client.get_projects(ids, concurrency=2)
+            assert [item.id for item in result] == [f"P{index}" for index in range(40)]
+            assert result.missing == ["GONE"]
+            assert requests.count("GET", "projects") > 2
+            assert max(peak) <= 2
+    run(main())
+
+
+def test_projects_are_matched_by_slug():
+    async def handler(request):
+        return json_response([project("P1")])
+
+    async def main():
+        async with serve(handler) as (client, requests):
+            result = await client.get_projects(["p1", "P1"])
+            assert [item.id for item in result] == ["P1"]
+            assert result.missing == []
+    run(main())
+
+
+def test_get_versions():
+    async def handler(request):
+        return json_response([version(item, "P1") for item in json.loads(request.query["ids"]) if item != "V3"])
+
+    async def main():
+        async with serve(handler) as (client, requests):
+            result = await client.get_versions(["V1", "V2", "V3"])
+            assert [item.id for item in result] == ["V1", "V2"]
+            assert result.missing == ["V3"]
+    run(main())
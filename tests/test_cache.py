@@ -0,0 +1,125 @@
+from aiohttp import web
+
+from modrinthpy import ModrinthClient, ResponseCache
+from modrinthpy.cache import make_cache_key
+
+from tests.support import json_response, project, run, serve, version
+
+
+def with_etag(etag="\"v1\""):
+    async def handler(request):
+        if request.method == "PATCH":
+            return web.Response(status=204)
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        return json_response(project("P1"), headers={"ETag": etag})
+
+    return handler
+
+
+def test_fresh_entries_are_served_without_a_request():
+    async def main():
+        async with serve(with_etag(), cache=ResponseCache(ttls={"project/": 60})) as (client, requests):
+            first = await client.get_project(id="P1")
+            second = await client.get_project(id="P1")
+            assert first.id == second.id == "P1"
+            assert requests.count("GET") == 1
+            assert client.cache.stats()["hits"] == 1
+    run(main())
+
+
+def test_stale_entries_are_revalidated():
+    async def main():
+        async with serve(with_etag(), cache=ResponseCache(ttls={"project/": 0})) as (client, requests):
+            await client.get_project(id="P1")
+            assert (await client.get_project(id="P1")).id == "P1"
+            assert requests.count("GET") == 2
+            assert client.cache.stats()["revalidations"] == 1
+    run(main())
+
+
+def test_mutations_invalidate_affected_entries():
+    async def main():
+        async with serve(with_etag(), api_key="token", cache=ResponseCache()) as (client, requests):
+            await client.get_project(id="P1")
+            await client.update_project({"title": "New"}, id="P1")
+            await client.get_project(id="P1")
+            assert requests.count("GET") == 2
+    run(main())
+
+
+def test_responses_are_cached_per_token():
+    async def handler(request):
+        return json_response({"email": request.headers.get("Authorization", "") + "@example.com"})
+
+    async def main():
+        cache = ResponseCache()
+        async with serve(handler, api_key="alice", cache=cache) as (alice, requests):
+            bob = ModrinthClient(api_key="bob", cache=cache)
+            bob.BASE_URL = alice.BASE_URL
+            async with bob:
+                assert (await alice.get_email())["email"] == "alice@example.com"
+                assert (await bob.get_email())["email"] == "bob@example.com"
+                assert (await alice.get_email())["email"] == "alice@example.com"
+            assert requests.count("GET") == 2
+    run(main())
+
+
+def test_cached_responses_are_copies():
+    async def main():
+        async with serve(with_etag(), cache=ResponseCache(), response_format="json") as (client, requests):
+            (await client.get_project(id="P1"))["categories"] = ["changed"]
+            hit = await client.get_project(id="P1")
+            assert "categories" not in hit
+            hit["title"] = "Changed"
+            assert (await client.get_project(id="P1"))["title"] == "P1"
+            assert requests.count("GET") == 1
+    run(main())
+
+
+def test_version_mutations_drop_version_file_lookups():
+    async def handler(request):
+        if request.method == "PATCH":
+            return web.Response(status=204)
+        return json_response(version("V1", "P1"))
+
+    async def main():
+        async with serve(handler, api_key="token", cache=ResponseCache()) as (client, requests):
+            await client.get_version_from_hash("abc")
+            await client.get_version_from_hash("abc")
+            await client.update_version("V1", {"name": "New"})
+            await client.get_version_from_hash("abc")
+            assert requests.count("GET", "version_file/abc") == 2
+    run(main())
+
+
+def test_lru_eviction_and_longest_prefix_ttl():
+    cache = ResponseCache(max_entries=2, default_ttl=5, ttls={"project/": 10, "project/P1": 20})
+    assert cache.ttl_for("project/P1") == 20
+    assert cache.ttl_for("project/P2") == 10
+    assert cache.ttl_for("search") == 5
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.evictions == 1
+
+
+def test_cache_key_does_not_depend_on_parameter_order():
+    assert make_cache_key("search", {"query": "x", "limit": 10}) == make_cache_key("search", {"limit": 10, "query": "x"})
+    assert make_cache_key("search", {"query": "x"}) != make_cache_key("search", {"query": "y"})
+
+
+def test_cache_key_contains_a_hash_of_the_token():
+    key = make_cache_key("user/email", None, "secret-token")
+    assert key.startswith("user/email") and "secret-token" not in key
+    assert key != make_cache_key("user/email", None, "other-token") != make_cache_key("user/email")
+
+
+def test_expired_entries_without_validators_are_not_stored():
+    cache = ResponseCache(default_ttl=0)
+    cache.set("search", [1])
+    assert len(cache) == 0
+    cache.set("project/P1", {}, etag="\"v1\"")
+    assert len(cache) == 1 and not cache.get("project/P1").fresh
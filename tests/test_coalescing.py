@@ -0,0 +1,48 @@
+import asyncio
+
+from tests.support import json_response, project, run, serve
+
+
+def slow_project(delay: float):
+    async def handler(request):
+        await asyncio.sleep(delay)
+        return json_response(project(request.match_info["tail"].split("/")[-1]))
+    return handler
+
+
+def test_concurrent_identical_requests_share_one_call():
+    async def main():
+        async with serve(slow_project(0.05)) as (client, requests):
+            results = await asyncio.gather(*[client.get_project(id="P1") for _ in range(10)])
+            assert [result.id for result in results] == ["P1"] * 10
+            assert requests.count("GET") == 1
+            assert client.coalesced_requests == 9
+    run(main())
+
+
+def test_different_parameters_are_not_shared():
+    async def main():
+        async with serve(slow_project(0.02)) as (client, requests):
+            await asyncio.gather(client.get_project(id="P1"), client.get_project(id="P2"))
+            assert requests.count("GET") == 2
+    run(main())
+
+
+def test_cancelled_follower_does_not_cancel_the_shared_request():
+    async def main():
+        async with serve(slow_project(0.1)) as (client, requests):
+            leader = asyncio.ensure_future(client.get_project(id="P1"))
+            follower = asyncio.ensure_future(client.get_project(id="P1"))
+            await asyncio.sleep(0.02)
+            follower.cancel()
+            assert (await leader).id == "P1"
+            assert requests.count("GET") == 1
+    run(main())
+
+
+def test_coalescing_can_be_disabled():
+    async def main():
+        async with serve(slow_project(0.02), coalesce_requests=False) as (client, requests):
+            await asyncio.gather(client.get_project(id="P1"), client.get_project(id="P1"))
+            assert requests.count("GET") == 2
+    run(main())
@@ -0,0 +1,46 @@
+import importlib.util
+import json
+
+from modrinthpy import JSONCodec
+from modrinthpy.codec import default_codec
+
+from tests.support import json_response, project, run, serve
+
+
+def test_dumps_returns_text_and_dumps_bytes_returns_bytes():
+    for codec in (JSONCodec.stdlib(), default_codec()):
+        assert codec.dumps({"a": [1, "é"]}) == '{"a":[1,"é"]}'
+        assert codec.dumps_bytes({"a": 1}) == b'{"a":1}'
+        assert codec.loads(b'{"a":1}') == {"a": 1}
+
+
+def test_default_codec_prefers_installed_accelerators():
+    if importlib.util.find_spec("orjson") is not None:
+        assert default_codec().name == "orjson"
+
+
+def test_client_encodes_and_decodes_with_its_codec():
+    calls = []
+
+    def loads(data):
+        calls.append("loads")
+        return json.loads(data)
+
+    def dumps(obj):
+        calls.append("dumps")
+        return json.dumps(obj)
+
+    async def handler(request):
+        if request.method == "PATCH":
+            assert await request.json() == {"title": "New"}
+            return json_response(project("P1", title="New"))
+        return json_response(project("P1"))
+
+    async def main():
+        codec = JSONCodec(loads, dumps)
+        async with serve(handler, api_key="token", json_codec=codec) as (client, requests):
+            await client.get_project(id="P1")
+            assert calls == ["loads"]
+            await client.update_project({"title": "New"}, id="P1")
+            assert calls == ["loads", "dumps", "loads"]
+    run(main())
@@ -0,0 +1,84 @@
+from modrinthpy.columns import CategoryColumn, ColumnarResult, DateColumn, ListColumn, NumberColumn
+from modrinthpy.models import SearchResult, Version
+
+from tests.support import json_response, project, run, serve, version
+
+
+def hit(project_id: str, downloads: int, categories, created: str, project_type: str = "mod"):
+    return {"project_id": project_id, "slug": project_id.lower(), "title": project_id, "downloads": downloads,
+            "categories": list(categories), "date_created": created, "project_type": project_type}
+
+
+HITS = [
+    hit("A", 900, ["fabric", "optimization"], "2023-01-01T00:00:00Z"),
+    hit("B", 300, ["forge"], "2023-06-01T12:30:00.250Z", "modpack"),
+    hit("C", 500, ["fabric", "utility"], "2024-02-01T00:00:00Z"),
+    hit("D", 700, [], "2022-05-01T00:00:00Z"),
+]
+
+
+def test_fields_are_stored_in_compact_columns():
+    result = ColumnarResult.from_dicts(SearchResult, HITS)
+    assert len(result) == 4 and set(result.columns) == set(SearchResult._fields)
+    assert isinstance(result["downloads"], NumberColumn) and result["downloads"].sum() == 2400
+    assert isinstance(result["project_type"], CategoryColumn)
+    assert isinstance(result["categories"], ListColumn) and result["categories"][3] == []
+    assert isinstance(result["date_created"], DateColumn)
+    assert result["description"].to_list() == [None] * 4
+
+
+def test_rows_round_trip_to_models():
+    result = ColumnarResult.from_dicts(SearchResult, HITS)
+    row = result[1]
+    assert isinstance(row, SearchResult)
+    assert (row.project_id, row.downloads, row.categories) == ("B", 300, ["forge"])
+    assert result.row(1)["date_created"] == "2023-06-01T12:30:00.250000Z"
+    assert result[-1].project_id == "D"
+    assert [item.project_id for item in result[1:3]] == ["B", "C"]
+    try:
+        result[4]
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("an out of range row was returned")
+
+
+def test_filter_sort_and_group_without_models():
+    result = ColumnarResult.from_dicts(SearchResult, HITS)
+    assert result.filter(categories="fabric")["project_id"].to_list() == ["A", "C"]
+    assert result.filter(downloads=(400, 800))["project_id"].to_list() == ["C", "D"]
+    assert result.filter(date_created=("2023-03-01", None), project_type={"mod"})["project_id"].to_list() == ["C"]
+    assert result.filter([True, False, True, False], downloads=lambda value: value > 600)["project_id"].to_list() \
+        == ["A"]
+    assert result.sort("downloads", descending=True)["project_id"].to_list() == ["A", "D", "C", "B"]
+    assert result.sort("date_created")["project_id"].to_list() == ["D", "A", "B", "C"]
+    assert {key: len(rows) for key, rows in result.group_by("project_type").items()} == {"mod": 3, "modpack": 1}
+    assert result.aggregate("categories", downloads=("downloads", sum), projects=("slug", len)) == {
+        "fabric": {"downloads": 1400, "projects": 2},
+        "optimization": {"downloads": 900, "projects": 1},
+        "forge": {"downloads": 300, "projects": 1},
+        "utility": {"downloads": 500, "projects": 1},
+    }
+
+
+def test_client_listings_can_be_columnar():
+    versions = [version("V1", "P1", downloads=10), version("V2", "P1", downloads=20, loaders=["forge"])]
+
+    async def handler(request):
+        path = request.path[len("/v2/"):]
+        if path == "search":
+            return json_response({"hits": HITS, "offset": 0, "limit": 10, "total_hits": 4})
+        if path == "projects":
+            return json_response([project("P1"), project("P2")])
+        return json_response(versions)
+
+    async def main():
+        async with serve(handler) as (client, requests):
+            hits = await client.search_projects("x", columnar=True)
+            assert isinstance(hits, ColumnarResult) and hits["project_id"].to_list() == ["A", "B", "C", "D"]
+            user_versions = await client.get_user_versions("alice", columnar=True)
+            assert user_versions.model is Version and user_versions["downloads"].sum() == 30
+            assert user_versions.filter(loaders="forge")[0].id == "V2"
+            projects = await client.get_projects(["P1", "P3", "P2", "P1"], columnar=True)
+            assert projects["id"].to_list() == ["P1", "P2"] and projects.missing == ["P3"]
+    run(main())
@@ -0,0 +1,74 @@
+import asyncio
+
+from modrinthpy import Priority
+from modrinthpy.exceptions import DeadlineExceededError
+
+from tests.support import elapsed, json_response, project, run, serve
+
+
+def slow_project(delay: float):
+    async def handler(request):
+        await asyncio.sleep(delay)
+        return json_response(project(request.match_info["tail"].split("/")[-1]))
+    return handler
+
+
+def test_client_deadline_and_per_call_override():
+    async def main():
+        async def slow(request):
+            await asyncio.sleep(0.2)
+            return json_response(project("P1"))
+
+        async with serve(slow, deadline=0.05) as (client, requests):
+            try:
+                await client.get_project(id="P1")
+            except DeadlineExceededError as error:
+                assert error.deadline == 0.05
+            else:
+                raise AssertionError("the deadline did not apply")
+            with client.options(deadline=None):
+                assert (await client.get_project(id="P1")).id == "P1"
+    run(main())
+
+
+def test_different_priorities_are_not_shared():
+    async def main():
+        async with serve(slow_project(0.02)) as (client, requests):
+            async def fetch(priority):
+                with client.options(priority=priority):
+                    return await client.get_project(id="P1")
+
+            await asyncio.gather(fetch(Priority.INTERACTIVE), fetch(Priority.BACKGROUND), fetch(Priority.BACKGROUND))
+            assert requests.count("GET") == 2
+    run(main())
+
+
+def test_follower_keeps_its_own_shorter_deadline():
+    async def main():
+        async with serve(slow_project(0.5)) as (client, requests):
+            async def fetch(deadline, delay=0.0):
+                await asyncio.sleep(delay)
+                with client.options(deadline=deadline):
+                    return await elapsed(client.get_project(id="P1"))
+
+            (leader, _), (follower, seconds) = await asyncio.gather(fetch(None), fetch(0.1, 0.01))
+            assert leader.id == "P1"
+            assert isinstance(follower, DeadlineExceededError)
+            assert seconds < 0.3
+            assert requests.count("GET") == 1
+    run(main())
+
+
+def test_follower_without_deadline_survives_the_leaders_deadline():
+    async def main():
+        async with serve(slow_project(0.3)) as (client, requests):
+            async def fetch(deadline, delay=0.0):
+                await asyncio.sleep(delay)
+                with client.options(deadline=deadline):
+                    return await client.get_project(id="P1")
+
+            leader, follower = await asyncio.gather(fetch(0.1), fetch(None, 0.01), return_exceptions=True)
+            assert isinstance(leader, DeadlineExceededError)
+            assert follower.id == "P1"
+            assert requests.count("GET") == 2
+    run(main())
@@ -0,0 +1,79 @@
+import hashlib
+import os
+
+from aiohttp import web
+
+from modrinthpy.exceptions import HashMismatchError
+
+from tests.support import run, serve
+
+CONTENT = bytes(range(256)) * 1024
+
+
+def file_server(content: bytes = CONTENT, ranges: bool = True):
+    async def handler(request):
+        sent = request.headers.get("Range")
+        if sent and ranges:
+            start = int(sent[len("bytes="):-1])
+            if start >= len(content):
+                return web.Response(status=416)
+            return web.Response(status=206, body=content[start:])
+        return web.Response(body=content)
+
+    return handler
+
+
+def file_entry(client, name: str = "mod.jar", content: bytes = CONTENT):
+    return {"url": f"{client.BASE_URL}/files/{name}", "filename": name, "size": len(content),
+            "primary": True, "hashes": {"sha512": hashlib.sha512(content).hexdigest(),
+                                        "sha1": hashlib.sha1(content).hexdigest()}}
+
+
+def test_files_are_downloaded_and_then_skipped(tmp_path):
+    async def main():
+        async with serve(file_server()) as (client, requests):
+            files = [file_entry(client, "a.jar"), file_entry(client, "b.jar")]
+            results = await client.download_files(files, str(tmp_path), concurrency=1)
+            assert [result.status for result in results] == ["downloaded", "downloaded"]
+            assert (tmp_path / "a.jar").read_bytes() == CONTENT
+            assert sorted(os.listdir(tmp_path)) == ["a.jar", "b.jar"]
+            results = await client.download_files(files, str(tmp_path))
+            assert [result.status for result in results] == ["skipped", "skipped"]
+            assert requests.count("GET") == 2
+    run(main())
+
+
+def test_partial_downloads_are_resumed(tmp_path):
+    (tmp_path / "mod.jar.part").write_bytes(CONTENT[:1000])
+
+    async def main():
+        async with serve(file_server()) as (client, requests):
+            [result] = await client.download_files([file_entry(client)], str(tmp_path))
+            assert result.status == "resumed"
+            assert result.bytes_downloaded == len(CONTENT) - 1000
+            assert (tmp_path / "mod.jar").read_bytes() == CONTENT
+    run(main())
+
+
+def test_partial_download_is_restarted_when_the_range_is_refused(tmp_path):
+    (tmp_path / "mod.jar.part").write_bytes(CONTENT[:1000])
+
+    async def main():
+        async with serve(file_server(ranges=False)) as (client, requests):
+            [result] = await client.download_files([file_entry(client)], str(tmp_path))
+            assert result.status == "downloaded"
+            assert (tmp_path / "mod.jar").read_bytes() == CONTENT
+    run(main())
+
+
+def test_hash_mismatch_is_raised_and_the_file_removed(tmp_path):
+    async def main():
+        async with serve(file_server(content=b"tampered")) as (client, requests):
+            try:
+                await client.download_files([file_entry(client)], str(tmp_path))
+            except HashMismatchError as error:
+                assert error.algorithm == "sha512"
+            else:
+                raise AssertionError("the mismatch was not detected")
+            assert os.listdir(tmp_path) == []
+    run(main())
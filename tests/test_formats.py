@@ -0,0 +1,105 @@
+import asyncio
+import copy
+import json
+import pickle
+
+from modrinthpy import ModrinthClient, ResponseCache
+from modrinthpy.columns import ColumnarResult
+from modrinthpy.models import ModelProxy, Project, Version
+
+from tests.support import json_response, project, run, serve, version
+
+PROJECT = project("P1", title="Sodium", license={"id": "LGPL-3.0", "name": "LGPL"})
+VERSION = version("V1", "P1", files=[{"filename": "sodium.jar", "hashes": {"sha1": "abc"}, "url": "u",
+                                      "primary": True, "size": 3}])
+SEARCH = {"hits": [{"project_id": "P1", "slug": "p1", "title": "P1"}], "offset": 0, "limit": 10, "total_hits": 41}
+
+
+async def handler(request):
+    path = request.path[len("/v2/"):]
+    if path == "search":
+        return json_response(SEARCH)
+    if path.startswith("version/"):
+        return json_response(VERSION)
+    return json_response(PROJECT)
+
+
+def test_formats_per_client_and_per_call():
+    async def main():
+        async with serve(handler) as (client, requests):
+            assert isinstance(await client.get_project(id="P1"), Project)
+            with client.options(response_format="json"):
+                assert await client.get_project(id="P1") == PROJECT
+                assert await client.search_projects("x") == SEARCH
+            with client.options(response_format="bytes"):
+                body = await client.get_project(id="P1")
+                assert isinstance(body, bytes) and json.loads(body) == PROJECT
+            with client.options(response_format="proxy"):
+                proxy = await client.get_version("V1")
+            assert isinstance(proxy, ModelProxy)
+            assert isinstance(await client.get_version("V1"), Version)
+        async with serve(handler, response_format="json") as (client, requests):
+            assert (await client.search_projects("x"))["total_hits"] == 41
+            assert isinstance(await client.search_projects("x", columnar=True), ColumnarResult)
+            with client.options(response_format="model"):
+                assert isinstance(await client.get_project(id="P1"), Project)
+    run(main())
+
+
+def test_bodies_are_cached_decoded_and_served_in_the_requested_format():
+    async def main():
+        async with serve(handler, cache=ResponseCache()) as (client, requests):
+            with client.options(response_format="bytes"):
+                first, second = await asyncio.gather(client.get_project(id="P1"), client.get_project(id="P1"))
+            assert isinstance(first, bytes) and first == second
+            # Undecoded bodies are not cached.
+            assert isinstance(await client.get_project(id="P1"), Project)
+            assert requests.count("GET") == 2
+            with client.options(response_format="bytes"):
+                assert json.loads(await client.get_project(id="P1")) == PROJECT
+            assert requests.count("GET") == 2
+    run(main())
+
+
+def test_proxy_reads_and_writes_the_wrapped_dictionary():
+    data = copy.deepcopy(VERSION)
+    proxy = ModelProxy(Version, data)
+    assert proxy.to_dict() is data
+    assert proxy.files[0].filename == "sodium.jar" and isinstance(proxy.files[0], ModelProxy)
+    assert proxy.changelog is None
+    proxy.name = "Renamed"
+    assert data["name"] == "Renamed"
+    assert proxy.materialize().name == "Renamed"
+    assert proxy == ModelProxy(Version, copy.deepcopy(data))
+    for name in ("nope", "_hidden"):
+        try:
+            getattr(proxy, name)
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError(f"{name} resolved")
+    try:
+        proxy.nope = 1
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("an unknown field was assigned")
+
+
+def test_proxy_survives_copy_and_pickle():
+    proxy = ModelProxy(Project, copy.deepcopy(PROJECT))
+    shallow = copy.copy(proxy)
+    assert shallow.to_dict() is proxy.to_dict()
+    deep = copy.deepcopy(proxy)
+    assert deep == proxy and deep.to_dict() is not proxy.to_dict()
+    loaded = pickle.loads(pickle.dumps(proxy))
+    assert loaded == proxy and loaded.license.id == "LGPL-3.0"
+
+
+def test_unknown_format_is_rejected():
+    try:
+        ModrinthClient(response_format="xml")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an unknown format was accepted")
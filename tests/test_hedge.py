@@ -0,0 +1,130 @@
+import asyncio
+
+from modrinthpy import HedgePolicy, Instrumentation, RateLimiter
+from modrinthpy.exceptions import DeadlineExceededError
+
+from tests.support import json_response, project, run, serve
+
+
+def delayed(delays):
+    """
+    Answers the n-th request after ``delays[n]`` seconds, and later ones at once.
+    """
+    state = {"count": 0}
+
+    async def handler(request):
+        index = state["count"]
+        state["count"] += 1
+        await asyncio.sleep(delays[index] if index < len(delays) else 0.0)
+        return json_response(project("P1"))
+
+    return handler
+
+
+def policy(**options) -> HedgePolicy:
+    hedge = HedgePolicy(**{"max_delay": 0.05, "budget": 1.0, **options})
+    hedge.tokens = hedge.burst
+    return hedge
+
+
+def test_slow_request_is_hedged_and_the_copy_wins():
+    async def main():
+        instrumentation = Instrumentation()
+        async with serve(delayed([1.0]), hedge=policy(), instrumentation=instrumentation) as (client, requests):
+            project = await asyncio.wait_for(client.get_project(id="P1"), 0.5)
+            assert project.id == "P1"
+            assert requests.count("GET") == 2
+            assert client.hedge.stats()["hedged"] == 1
+            assert client.hedge.stats()["wins"] == 1
+            metrics = instrumentation.snapshot()["endpoints"]["GET project/{id}"]
+            assert metrics["hedged"] == 1 and metrics["hedge_wins"] == 1
+    run(main())
+
+
+def test_fast_request_is_not_hedged():
+    async def main():
+        async with serve(delayed([0.0]), hedge=policy()) as (client, requests):
+            await client.get_project(id="P1")
+            assert requests.count("GET") == 1
+            assert client.hedge.stats()["hedged"] == 0
+    run(main())
+
+
+def test_budget_caps_hedges():
+    async def main():
+        hedge = HedgePolicy(max_delay=0.02, budget=0.25)
+        async with serve(delayed([0.1] * 16), hedge=hedge) as (client, requests):
+            for index in range(8):
+                await client.get_project(id=f"P{index}")
+            # Eight requests earn two tokens.
+            assert hedge.hedged == 2
+            assert hedge.denied == 6
+    run(main())
+
+
+def test_hedging_can_be_turned_off_per_call():
+    async def main():
+        async with serve(delayed([0.1]), hedge=policy()) as (client, requests):
+            with client.options(hedge=False):
+                await client.get_project(id="P1")
+            assert requests.count("GET") == 1
+            assert client.hedge.requests == 0
+    run(main())
+
+
+def test_deadline_cancels_both_copies():
+    async def main():
+        handler = delayed([1.0, 1.0])
+        async with serve(handler, hedge=policy(), deadline=0.2) as (client, requests):
+            try:
+                await client.get_project(id="P1")
+            except DeadlineExceededError as error:
+                assert error.deadline == 0.2
+            else:
+                raise AssertionError("the deadline did not apply")
+            await asyncio.sleep(0)
+            assert requests.count("GET") == 2
+            leftover = [task for task in asyncio.all_tasks()
+                        if "ModrinthClient" in getattr(task.get_coro(), "__qualname__", "")]
+            assert leftover == []
+    run(main())
+
+
+def test_failed_copy_falls_back_to_the_other():
+    state = {"count": 0}
+
+    async def handler(request):
+        state["count"] += 1
+        if state["count"] == 1:
+            await asyncio.sleep(0.1)
+            return json_response({"error": "internal", "description": "boom"}, status=500)
+        await asyncio.sleep(0.2)
+        return json_response(project("P1"))
+
+    async def main():
+        async with serve(handler, hedge=policy()) as (client, requests):
+            assert (await client.get_project(id="P1")).id == "P1"
+            assert client.hedge.wins == 1
+    run(main())
+
+
+def test_time_queued_in_the_rate_limiter_does_not_trigger_hedges():
+    async def main():
+        limiter = RateLimiter(limit=2, window=0.3)
+        # The mock does not send rate limit headers, so the limiter keeps its local window.
+        async with serve(delayed([0.0] * 6), hedge=policy(), rate_limiter=limiter) as (client, requests):
+            await asyncio.gather(*[client.get_project(id=f"P{index}") for index in range(6)])
+            assert requests.count("GET") == 6
+            assert client.hedge.hedged == 0
+    run(main())
+
+
+def test_no_hedge_while_the_rate_limiter_is_saturated():
+    async def main():
+        limiter = RateLimiter(limit=1, window=0.5)
+        async with serve(delayed([0.2, 0.0]), hedge=policy(), rate_limiter=limiter) as (client, requests):
+            await asyncio.gather(client.get_project(id="P1"), client.get_project(id="P2"))
+            assert requests.count("GET") == 2
+            assert client.hedge.hedged == 0
+            assert client.hedge.throttled >= 1
+    run(main())
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import modrinthpy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_after(code: str) -> set:
+    """
+    Runs ``code`` in a fresh interpreter and returns the modules it imported.
+    """
+    script = f"import sys; before = set(sys.modules); {code}; print(' '.join(sorted(set(sys.modules) - before)))"
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True,
+                            check=True).stdout
+    return set(output.split())
+
+
+def test_importing_the_package_loads_no_submodules():
+    loaded = loaded_after("import modrinthpy")
+    assert "modrinthpy" in loaded
+    assert not {name for name in loaded if name.startswith("modrinthpy.")}
+    assert "aiohttp" not in loaded
+
+
+def test_the_client_does_not_import_aiohttp_until_a_session_is_needed():
+    loaded = loaded_after("from modrinthpy import ModrinthClient; ModrinthClient()")
+    assert "modrinthpy.client" in loaded
+    assert "aiohttp" not in loaded and "sqlite3" not in loaded
+
+
+def test_every_export_resolves():
+    for name in modrinthpy.__all__:
+        assert getattr(modrinthpy, name) is not None
+    assert set(modrinthpy.__all__) <= set(dir(modrinthpy))
+    try:
+        modrinthpy.NotAnExport
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("an unknown name resolved")
@@ -0,0 +1,98 @@
+from modrinthpy import SearchIndex
+from modrinthpy.models import Project
+
+from tests.support import json_response, run, serve
+
+
+def hit(project_id: str, title: str, downloads: int = 0, categories=("technology", "fabric"),
+        versions=("1.20.1",), modified: str = "2023-06-01T00:00:00Z", **fields):
+    return {"project_id": project_id, "slug": title.lower().replace(" ", "-"), "title": title,
+            "description": fields.pop("description", ""), "categories": list(categories),
+            "versions": list(versions), "downloads": downloads, "follows": 0, "project_type": "mod",
+            "date_created": "2023-01-01T00:00:00Z", "date_modified": modified, **fields}
+
+
+HITS = [
+    hit("A", "Sodium", 900, description="Rendering engine"),
+    hit("B", "Sodium Extra", 300, categories=("utility", "fabric")),
+    hit("C", "Lithium", 500, categories=("optimization", "forge"), versions=("1.19.2",)),
+    hit("D", "Iris Shaders", 700, description="Shader loader compatible with sodium",
+        modified="2024-01-01T00:00:00Z"),
+]
+
+
+def ids(results):
+    return [result.project_id for result in results]
+
+
+def test_words_match_by_field_weight_and_prefix():
+    index = SearchIndex()
+    assert index.add(HITS) == 4
+    assert ids(index.search("sodium")) == ["A", "B", "D"]
+    assert ids(index.search("sod")) == ["A", "B", "D"]
+    assert ids(index.search("sod", prefix=False)) == []
+    assert ids(index.search("sodium extra")) == ["B"]
+    assert index.search("sodium").total_hits == 3
+
+
+def test_facets_and_sort_orders():
+    index = SearchIndex()
+    index.add(HITS)
+    assert ids(index.search(facets=[["loaders:fabric"]], index="downloads")) == ["A", "D", "B"]
+    assert ids(index.search(facets='[["versions:1.19.2"]]')) == ["C"]
+    assert ids(index.search(facets=[["categories:technology", "categories:utility"], ["loaders!=forge"]],
+                            index="downloads")) == ["A", "D", "B"]
+    assert "fabric" not in index.get("A").categories or "fabric" in index.facet_counts("loaders")
+    assert index.facet_counts("loaders") == {"fabric": 3, "forge": 1}
+    assert ids(index.search(index="downloads", offset=1, limit=2)) == ["D", "C"]
+
+
+def test_changed_projects_are_reindexed_and_removed_ones_dropped():
+    index = SearchIndex()
+    index.add(HITS)
+    assert index.add(HITS) == 0
+    assert index.add([hit("C", "Lithium Fork", 500)]) == 1
+    assert ids(index.search("fork")) == ["C"]
+    assert ids(index.search("lithium")) == ["C"]
+    assert index.remove("B") and not index.remove("B")
+    assert ids(index.search("sodium")) == ["A", "D"]
+    index.add([Project({"id": "E", "slug": "phosphor", "title": "Phosphor", "loaders": ["quilt"]})])
+    assert ids(index.search("phosphor", facets=[["loaders:quilt"]])) == ["E"]
+
+
+def test_saved_index_answers_the_same_queries(tmp_path):
+    path = str(tmp_path / "index.bin")
+    index = SearchIndex()
+    index.add(HITS)
+    index.remove("C")
+    index.save(path)
+    loaded = SearchIndex.load(path)
+    assert len(loaded) == 3 and "C" not in loaded
+    for query, facets in (("sodium", None), ("", [["loaders:fabric"]]), ("shad", None)):
+        assert ids(loaded.search(query, facets)) == ids(index.search(query, facets))
+    assert loaded.get("D").title == "Iris Shaders"
+
+
+def test_update_stops_at_the_first_unchanged_project():
+    pages = {
+        "relevance": HITS,
+        "updated": [hit("D", "Iris Shaders", 800, modified="2024-03-01T00:00:00Z"),
+                    hit("F", "Indium", 50, modified="2024-02-01T00:00:00Z")] + HITS[:3]
+                   + [hit(f"OLD{index}", f"Old {index}") for index in range(20)],
+    }
+
+    async def handler(request):
+        results = pages[request.query.get("index", "relevance")]
+        offset, limit = int(request.query["offset"]), int(request.query["limit"])
+        return json_response({"hits": results[offset:offset + limit], "offset": offset, "limit": limit,
+                              "total_hits": len(results)})
+
+    async def main():
+        index = SearchIndex()
+        async with serve(handler, response_format="json") as (client, requests):
+            assert await index.update(client, page_size=2) == 4
+            assert await index.update(client, page_size=2) == 2
+            # Two pages up to the first unchanged project, plus at most two prefetched ones.
+            assert requests.count("GET") <= 2 + 4
+        assert index.get("D").downloads == 800 and "F" in index
+    run(main())
@@ -0,0 +1,68 @@
+import logging
+import os
+import subprocess
+import sys
+
+from modrinthpy import Instrumentation, ResponseCache
+from modrinthpy.exceptions import ModrinthAPIError
+from modrinthpy.instrumentation import Histogram, endpoint_name
+
+from tests.support import json_response, project, run, serve
+
+
+async def handler(request):
+    if request.path.endswith("/GONE"):
+        return json_response({"error": "not_found", "description": "missing"}, status=404)
+    return json_response(project("P1"))
+
+
+def test_requests_are_recorded_per_route_and_passed_to_hooks():
+    started, finished = [], []
+    instrumentation = Instrumentation(pre_request=[started.append], post_request=[finished.append])
+
+    async def main():
+        async with serve(handler, instrumentation=instrumentation, cache=ResponseCache()) as (client, requests):
+            await client.get_project(id="P1")
+            await client.get_project(slug="p1")
+            await client.get_project(id="P1")
+            try:
+                await client.get_project(id="GONE")
+            except ModrinthAPIError:
+                pass
+    run(main())
+
+    assert [event.path for event in started] == ["project/P1", "project/p1", "project/P1", "project/GONE"]
+    assert finished == started
+    assert finished[2].cached and finished[2].attempts == 0
+    assert finished[0].status == 200 and finished[0].ttfb is not None and finished[0].bytes_in > 0
+    assert finished[3].status == 404 and finished[3].error is not None
+    snapshot = instrumentation.snapshot()
+    metrics = snapshot["endpoints"]["GET project/{id}"]
+    assert metrics["requests"] == 4 and metrics["cache_hits"] == 1 and metrics["errors"] == 1
+    assert metrics["statuses"] == {"200": 2, "404": 1}
+    assert metrics["latency"]["total"]["count"] == 4
+    assert snapshot["models"]["Project"]["count"] == 3
+
+
+def test_routes_group_ids_but_keep_literal_segments():
+    assert endpoint_name("GET", "project/sodium/version") == "GET project/{id}/version"
+    assert endpoint_name("GET", "user/email") == "GET user/email"
+    assert endpoint_name("POST", "version_files/update") == "POST version_files/update"
+    assert endpoint_name("GET", "search") == "GET search"
+
+
+def test_histogram_percentiles_use_bucket_bounds():
+    histogram = Histogram()
+    for seconds in [0.001] * 90 + [0.2] * 10:
+        histogram.observe(seconds)
+    assert histogram.percentile(0.5) == 0.001
+    assert histogram.percentile(0.99) == 0.2
+    assert histogram.snapshot()["count"] == 100
+
+
+def test_importing_the_package_leaves_logging_alone():
+    code = "import logging, modrinthpy.client; print(len(logging.getLogger().handlers), logging.getLogger().level)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True,
+                            check=True).stdout
+    assert output.split() == ["0", str(logging.WARNING)]
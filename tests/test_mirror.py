@@ -0,0 +1,99 @@
+import copy
+import json
+from contextlib import nullcontext
+
+from modrinthpy import ProjectMirror
+from modrinthpy.mirror import ADDED, DELETED, PROJECT, UPDATED, VERSION
+from modrinthpy.models import Project, Version
+
+from tests.support import project, run, version
+
+
+class FakeClient:
+    def __init__(self):
+        self.projects = {"alice": [project("P1", versions=["V1", "V2"]), project("P2", versions=["V3"])]}
+        self.versions = {id: version(id, "P1" if id != "V3" else "P2") for id in ("V1", "V2", "V3")}
+        self.calls = []
+
+    def options(self, **overrides):
+        return nullcontext(self)
+
+    async def get_user_projects(self, user):
+        self.calls.append(("user", user))
+        return [Project(copy.deepcopy(data)) for data in self.projects[user]]
+
+    async def get_versions(self, ids, concurrency=4):
+        self.calls.append(("versions", sorted(ids)))
+        return [Version(copy.deepcopy(self.versions[id])) for id in ids if id in self.versions]
+
+
+def summary(changes):
+    return [(change.kind, change.action, change.id) for change in changes]
+
+
+def test_first_sync_adds_everything_and_second_sync_costs_one_request(tmp_path):
+    client = FakeClient()
+    path = str(tmp_path / "mirror.json")
+    changes = run(ProjectMirror(client, ["alice"], path=path).sync())
+    assert summary(changes) == [(PROJECT, ADDED, "P1"), (VERSION, ADDED, "V1"), (VERSION, ADDED, "V2"),
+                                (PROJECT, ADDED, "P2"), (VERSION, ADDED, "V3")]
+    assert json.loads((tmp_path / "mirror.json").read_text())["versions"].keys() == {"V1", "V2", "V3"}
+
+    client.calls.clear()
+    mirror = ProjectMirror(client, ["alice"], path=path)
+    assert run(mirror.sync()) == []
+    assert client.calls == [("user", "alice")]
+
+
+def test_changes_are_reported():
+    client = FakeClient()
+    mirror = ProjectMirror(client, ["alice"])
+    run(mirror.sync())
+
+    p1 = client.projects["alice"][0]
+    p1["updated"] = "2025-01-01T00:00:00Z"
+    p1["versions"] = ["V2", "V4"]
+    client.versions["V4"] = version("V4", "P1")
+    del client.projects["alice"][1]
+
+    changes = run(mirror.sync())
+    assert summary(changes) == [(PROJECT, UPDATED, "P1"), (VERSION, ADDED, "V4"), (VERSION, DELETED, "V1"),
+                                (VERSION, DELETED, "V3"), (PROJECT, DELETED, "P2")]
+    assert [item.id for item in mirror.versions("P1")] == ["V2", "V4"]
+
+
+def test_stopping_before_deleted_versions_still_reports_them_later():
+    client = FakeClient()
+    mirror = ProjectMirror(client, ["alice"])
+    run(mirror.sync())
+
+    p1 = client.projects["alice"][0]
+    p1["updated"] = "2025-01-01T00:00:00Z"
+    p1["versions"] = ["V2", "V4"]
+    client.versions["V4"] = version("V4", "P1")
+
+    async def take(count):
+        changes = mirror.changes()
+        taken = [await changes.__anext__() for _ in range(count)]
+        await changes.aclose()
+        return taken
+
+    assert summary(run(take(2))) == [(PROJECT, UPDATED, "P1"), (VERSION, ADDED, "V4")]
+    # The change that was not acknowledged and everything after it are reported again.
+    assert summary(run(mirror.sync())) == [(VERSION, ADDED, "V4"), (VERSION, DELETED, "V1")]
+    assert run(mirror.sync()) == []
+    assert [item.id for item in mirror.versions("P1")] == ["V2", "V4"]
+
+
+def test_stopping_after_a_version_is_added_reports_the_rest_next_time():
+    client = FakeClient()
+    mirror = ProjectMirror(client, ["alice"])
+
+    async def take(count):
+        changes = mirror.changes()
+        taken = [await changes.__anext__() for _ in range(count)]
+        await changes.aclose()
+        return taken
+
+    assert summary(run(take(3))) == [(PROJECT, ADDED, "P1"), (VERSION, ADDED, "V1"), (VERSION, ADDED, "V2")]
+    assert summary(run(mirror.sync())) == [(VERSION, ADDED, "V2"), (PROJECT, ADDED, "P2"), (VERSION, ADDED, "V3")]
@@ -0,0 +1,75 @@
+from typing import List, Optional
+
+from modrinthpy.models import BaseModelWithAutoMapping, License, Notification, Project, Version
+
+
+class Sample(BaseModelWithAutoMapping):
+    id: str
+    tags: List[str]
+    score: Optional[int] = 10
+
+
+class Extended(Sample):
+    note: Optional[str]
+
+
+def test_fields_are_slots_with_class_defaults():
+    sample = Sample({"id": "S1"})
+    assert Sample._fields == ("id", "tags", "score")
+    assert not hasattr(sample, "__dict__")
+    assert (sample.id, sample.tags, sample.score) == ("S1", None, 10)
+    try:
+        sample.other = 1
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("an undeclared attribute was set")
+
+
+def test_keyword_arguments_override_the_dictionary():
+    sample = Sample({"id": "S1", "score": 1}, score=2)
+    assert sample.score == 2
+    assert Sample(id="S2").id == "S2"
+
+
+def test_subclasses_inherit_fields_and_defaults():
+    extended = Extended({"id": "E1", "note": "n"})
+    assert Extended._fields == ("id", "tags", "score", "note")
+    assert (extended.id, extended.score, extended.note) == ("E1", 10, "n")
+    assert extended.to_dict() == {"id": "E1", "tags": None, "score": 10, "note": "n"}
+
+
+def test_unknown_fields_are_recorded_once():
+    Notification({"id": "N1", "type": "t", "message": "m", "read": False, "new_field": 1})
+    Notification({"id": "N2", "new_field": 2})
+    assert Notification.unknown_fields() == ["new_field"]
+
+
+def test_nested_models_are_decoded_on_first_access():
+    project = Project({"id": "P1", "license": {"id": "MIT"}, "donation_urls": [{"id": "patreon"}]})
+    assert project._raw_license == {"id": "MIT"}
+    assert not hasattr(project, "_decoded_license")
+    license = project.license
+    assert isinstance(license, License) and license.id == "MIT"
+    assert project.license is license
+    assert [url.id for url in project.donation_urls] == ["patreon"]
+
+
+def test_forward_references_and_missing_values():
+    version = Version({"id": "V1", "files": [{"filename": "a.jar"}], "dependencies": None})
+    assert version.files[0].filename == "a.jar"
+    assert version.dependencies is None
+
+
+def test_assigned_nested_values_replace_the_decoded_ones():
+    project = Project({"id": "P1", "license": {"id": "MIT"}})
+    assert project.license.id == "MIT"
+    project.license = {"id": "GPL"}
+    assert project.license.id == "GPL"
+    project.license = License({"id": "LGPL"})
+    assert project.to_dict()["license"] == {"id": "LGPL", "name": None, "url": None}
+
+
+def test_to_dict_returns_undecoded_values_unchanged():
+    data = {"id": "V1", "files": [{"filename": "a.jar", "extra": 1}]}
+    assert Version(data).to_dict()["files"] == data["files"]
@@ -0,0 +1,102 @@
+import asyncio
+
+from modrinthpy.exceptions import ModrinthAPIError
+
+from tests.support import json_response, run, serve
+
+
+def search(total: int, delay: float = 0.0, fail_at: int = -1):
+    offsets = []
+
+    async def handler(request):
+        offset, limit = int(request.query["offset"]), int(request.query["limit"])
+        offsets.append((offset, limit))
+        await asyncio.sleep(delay)
+        if offset == fail_at:
+            return json_response({"error": "failed", "description": "injected"}, status=400)
+        hits = [{"project_id": f"P{index}", "slug": f"p{index}", "title": f"P{index}"}
+                for index in range(offset, min(offset + limit, total))]
+        return json_response({"hits": hits, "offset": offset, "limit": limit, "total_hits": total})
+
+    handler.offsets = offsets
+    return handler
+
+
+async def collect(iterator):
+    return [result async for result in iterator]
+
+
+def test_every_hit_is_returned_in_order():
+    handler = search(25)
+
+    async def main():
+        async with serve(handler) as (client, requests):
+            results = await collect(client.iter_search("x", page_size=10))
+            assert [result.project_id for result in results] == [f"P{index}" for index in range(25)]
+            assert sorted(handler.offsets) == [(0, 10), (10, 10), (20, 5)]
+    run(main())
+
+
+def test_max_results_limits_the_requests():
+    handler = search(1000)
+
+    async def main():
+        async with serve(handler) as (client, requests):
+            results = await collect(client.iter_search("x", page_size=10, max_results=15))
+            assert len(results) == 15
+            assert sorted(handler.offsets) == [(0, 10), (10, 5)]
+            assert await collect(client.iter_search("x", max_results=0)) == []
+            assert requests.count("GET") == 2
+    run(main())
+
+
+def test_following_pages_are_prefetched():
+    handler = search(100, delay=0.05)
+
+    async def main():
+        async with serve(handler) as (client, requests):
+            iterator = client.iter_search("x", page_size=10, prefetch=3)
+            await iterator.__anext__()
+            await asyncio.sleep(0.02)
+            assert len(handler.offsets) == 4
+            started = asyncio.get_event_loop().time()
+            results = [result async for result in iterator]
+            # Four pages already arrived or are in flight, so the rest takes far less than 9 round trips.
+            assert len(results) == 99
+            assert asyncio.get_event_loop().time() - started < 9 * 0.05
+    run(main())
+
+
+def test_aclose_cancels_pending_pages():
+    handler = search(100, delay=0.2)
+
+    async def main():
+        async with serve(handler) as (client, requests):
+            iterator = client.iter_search("x", page_size=10, prefetch=2)
+            await iterator.__anext__()
+            pending = list(iterator._pending)
+            assert pending
+            await iterator.aclose()
+            await asyncio.sleep(0)
+            assert all(task.cancelled() for task in pending)
+            assert await collect(iterator) == []
+    run(main())
+
+
+def test_failed_page_is_raised_to_the_consumer():
+    handler = search(30, fail_at=10)
+
+    async def main():
+        async with serve(handler) as (client, requests):
+            iterator = client.iter_search("x", page_size=10, prefetch=2)
+            results = []
+            try:
+                async for result in iterator:
+                    results.append(result)
+            except ModrinthAPIError as error:
+                assert error.status_code == 400
+            else:
+                raise AssertionError("the error was not raised")
+            assert len(results) == 10
+            assert not iterator._pending
+    run(main())
@@ -0,0 +1,71 @@
+import asyncio
+
+from modrinthpy import Priority, RateLimiter
+
+from tests.support import json_response, project, run, serve
+
+
+def test_waiters_are_served_by_priority_then_arrival():
+    async def main():
+        limiter = RateLimiter(limit=1, window=0.1)
+        await limiter.acquire()
+        order = []
+
+        async def wait(name, priority):
+            await limiter.acquire(priority)
+            order.append(name)
+            limiter.release()
+
+        tasks = [asyncio.ensure_future(wait(name, priority)) for name, priority in (
+            ("background", Priority.BACKGROUND), ("normal-1", Priority.NORMAL),
+            ("interactive", Priority.INTERACTIVE), ("normal-2", Priority.NORMAL))]
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 4
+        assert limiter.saturated
+        limiter.release()
+        await asyncio.gather(*tasks)
+        assert order == ["interactive", "normal-1", "normal-2", "background"]
+        assert limiter.stats()["queued"] == 4
+    run(main())
+
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    async def main():
+        limiter = RateLimiter(limit=1, window=0.05)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 0
+        limiter.release()
+        await asyncio.wait_for(limiter.acquire(), 0.2)
+    run(main())
+
+
+def test_headers_sync_the_bucket():
+    limiter = RateLimiter(limit=300)
+    limiter.release({"X-Ratelimit-Limit": "100", "X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset": "30"})
+    assert limiter.limit == 100
+    assert limiter.remaining == 0
+    assert limiter.saturated
+    assert 29 < limiter.stats()["reset_in"] <= 30
+
+
+def test_429_is_queued_again_instead_of_raised():
+    responses = [429, 200]
+
+    async def handler(request):
+        if responses.pop(0) == 429:
+            return json_response({"error": "ratelimited"}, status=429,
+                                 headers={"X-Ratelimit-Limit": "300", "X-Ratelimit-Remaining": "0",
+                                          "X-Ratelimit-Reset": "0"})
+        return json_response(project("P1"), headers={"X-Ratelimit-Limit": "300", "X-Ratelimit-Remaining": "299",
+                                                     "X-Ratelimit-Reset": "60"})
+
+    async def main():
+        async with serve(handler, rate_limiter=RateLimiter()) as (client, requests):
+            assert (await client.get_project(id="P1")).id == "P1"
+            assert requests.count("GET") == 2
+            assert client.rate_limiter.remaining == 299
+    run(main())
@@ -0,0 +1,67 @@
+import json
+
+from tests.support import json_response, run, serve, version
+
+
+def dependency(kind: str, project_id: str = None, version_id: str = None):
+    return {"project_id": project_id, "version_id": version_id, "dependency_type": kind}
+
+
+VERSIONS = {
+    "A2": version("A2", "A", dependencies=[dependency("required", "B"), dependency("required", version_id="C1"),
+                                           dependency("optional", "D"), dependency("incompatible", "E")]),
+    "A1": version("A1", "A", version_type="beta"),
+    "B1": version("B1", "B", dependencies=[dependency("required", "A")]),
+    "C1": version("C1", "C"),
+    "D1": version("D1", "D"),
+    "E1": version("E1", "E"),
+    "F1": version("F1", "F", loaders=["forge"]),
+    "G1": version("G1", "G", dependencies=[dependency("required", "GONE"), dependency("required", version_id="F1")]),
+}
+SLUGS = {"a-slug": "A"}
+
+
+async def catalog(request):
+    path = request.path[len("/v2/"):]
+    if path == "versions":
+        return json_response([VERSIONS[item] for item in json.loads(request.query["ids"]) if item in VERSIONS])
+    project_id = SLUGS.get(path.split("/")[1], path.split("/")[1])
+    listed = [item for item in VERSIONS.values() if item["project_id"] == project_id]
+    if not listed:
+        return json_response({"error": "not_found", "description": "missing"}, status=404)
+    return json_response(sorted(listed, key=lambda item: item["id"], reverse=True))
+
+
+def test_closure_with_cycles_and_optional_dependencies():
+    async def main():
+        async with serve(catalog) as (client, requests):
+            resolution = await client.resolve_dependencies(projects=["a-slug", "E"], loaders=["fabric"])
+            assert {project_id: item.id for project_id, item in resolution.versions.items()} == {
+                "A": "A2", "B": "B1", "C": "C1", "E": "E1"}
+            assert resolution.required_by["B"] == ["A"]
+            assert resolution.optional == {"D": ["A"]}
+            assert [conflict.reason for conflict in resolution.conflicts] == ["incompatible"]
+            assert ["A", "B", "A"] in resolution.cycles
+            # Every project is listed once, also when it is referred to by slug and by ID.
+            assert requests.count("GET", "project/a-slug/version") == 1
+            assert requests.count("GET", "project/A/version") == 0
+            assert resolution.requests == len(requests)
+    run(main())
+
+
+def test_missing_dependencies_and_incompatible_pins():
+    async def main():
+        async with serve(catalog) as (client, requests):
+            resolution = await client.resolve_dependencies(versions=["G1"], loaders=["fabric"])
+            assert resolution.missing == [("GONE", "G")]
+            assert [(conflict.project_id, conflict.reason) for conflict in resolution.conflicts] == [("F", "target")]
+            assert not resolution.ok
+    run(main())
+
+
+def test_optional_dependencies_can_be_followed():
+    async def main():
+        async with serve(catalog) as (client, requests):
+            resolution = await client.resolve_dependencies(projects=["A"], include_optional=True)
+            assert "D" in resolution.versions and resolution.optional == {}
+    run(main())
@@ -0,0 +1,112 @@
+import asyncio
+
+from modrinthpy import RetryPolicy
+from modrinthpy.exceptions import DeadlineExceededError, ModrinthAPIError
+from modrinthpy.retry import parse_retry_after
+
+from tests.support import json_response, project, run, serve
+
+
+def failing(statuses, retry_after=None):
+    queued = list(statuses)
+
+    async def handler(request):
+        if queued:
+            headers = {"Retry-After": retry_after} if retry_after is not None else None
+            return json_response({"error": "failed", "description": "injected"}, status=queued.pop(0),
+                                 headers=headers)
+        return json_response(project("P1"))
+
+    return handler
+
+
+def fast_retry(**options) -> RetryPolicy:
+    return RetryPolicy(**{"backoff_base": 0.001, "backoff_cap": 0.001, **options})
+
+
+def test_transient_failures_are_retried():
+    async def main():
+        async with serve(failing([503, 500]), retry=fast_retry()) as (client, requests):
+            assert (await client.get_project(id="P1")).id == "P1"
+            assert requests.count("GET") == 3
+            assert client.retry.stats() == {"retries": 2, "exhausted": 0}
+    run(main())
+
+
+def test_retries_stop_after_max_attempts():
+    async def main():
+        async with serve(failing([503] * 5), retry=fast_retry(max_attempts=2)) as (client, requests):
+            try:
+                await client.get_project(id="P1")
+            except ModrinthAPIError as error:
+                assert error.status_code == 503
+            else:
+                raise AssertionError("the error was not raised")
+            assert requests.count("GET") == 2
+            assert client.retry.exhausted == 1
+    run(main())
+
+
+def test_client_errors_and_unlisted_methods_are_not_retried():
+    async def main():
+        async with serve(failing([404]), retry=fast_retry()) as (client, requests):
+            try:
+                await client.get_project(id="P1")
+            except ModrinthAPIError:
+                pass
+            assert requests.count("GET") == 1
+        policy = fast_retry()
+        assert not policy.should_retry("POST", 1, 503)
+        assert not policy.should_retry("GET", 1, 400)
+        assert policy.should_retry("GET", 1, None)
+    run(main())
+
+
+def test_retry_after_is_honored():
+    async def main():
+        async with serve(failing([503], retry_after="0.2"), retry=fast_retry()) as (client, requests):
+            started = asyncio.get_event_loop().time()
+            await client.get_project(id="P1")
+            assert asyncio.get_event_loop().time() - started >= 0.2
+    run(main())
+
+
+def test_deadline_bounds_retries():
+    async def main():
+        retry = RetryPolicy(backoff_base=1.0, backoff_cap=1.0, respect_retry_after=True, deadline=0.3)
+        async with serve(failing([503] * 10, retry_after="0.2"), retry=retry) as (client, requests):
+            started = asyncio.get_event_loop().time()
+            try:
+                await client.get_project(id="P1")
+            except (ModrinthAPIError, DeadlineExceededError):
+                pass
+            else:
+                raise AssertionError("the error was not raised")
+            assert asyncio.get_event_loop().time() - started < 0.5
+            assert requests.count("GET") == 2
+    run(main())
+
+
+def test_backoff_uses_full_jitter_within_the_cap():
+    policy = RetryPolicy(backoff_base=0.5, backoff_cap=2.0, respect_retry_after=False)
+    for attempt, ceiling in ((1, 0.5), (2, 1.0), (3, 2.0), (8, 2.0)):
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0.0 <= delay <= ceiling for delay in delays)
+    assert policy.backoff(1, retry_after=7.0) <= 0.5
+    assert RetryPolicy().backoff(1, retry_after=7.0) == 7.0
+    assert RetryPolicy(max_retry_after=5.0).backoff(1, retry_after=3600.0) == 5.0
+
+
+def test_should_retry_has_no_side_effects():
+    policy = fast_retry(max_attempts=2)
+    assert policy.retryable("GET", 503) and not policy.retryable("GET", 404)
+    assert not policy.should_retry("GET", 2, 503)
+    assert policy.stats() == {"retries": 0, "exhausted": 0}
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"Retry-After": "3"}) == 3.0
+    assert parse_retry_after({"Retry-After": "-1"}) == 0.0
+    assert parse_retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert parse_retry_after({"Retry-After": "soon"}) is None
+    assert parse_retry_after({}) is None
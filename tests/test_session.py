@@ -0,0 +1,78 @@
+import asyncio
+
+import aiohttp
+
+from modrinthpy import ModrinthClient
+
+from tests.support import json_response, project, run, serve
+
+
+async def ok(request):
+    return json_response(project("P1"))
+
+
+def test_concurrent_first_requests_share_one_session():
+    async def main():
+        async with serve(ok, coalesce_requests=False) as (client, requests):
+            await client.close()
+            created = []
+            create = client._create_session
+
+            def counting():
+                created.append(create())
+                return created[-1]
+
+            client._create_session = counting
+            await asyncio.gather(*(client.get_project(id="P1") for _ in range(10)))
+            assert len(created) == 1
+            assert requests.count("GET") == 10
+    run(main())
+
+
+def test_pool_settings_are_applied_to_the_connector():
+    async def main():
+        client = ModrinthClient(connection_limit=7, connection_limit_per_host=3, keepalive_timeout=2.0)
+        async with client:
+            assert client.session.connector.limit == 7
+            assert client.session.connector.limit_per_host == 3
+        assert client.session is None
+    run(main())
+
+
+def test_shared_session_is_not_closed():
+    async def main():
+        async with aiohttp.ClientSession() as session:
+            async with serve(ok, session=session) as (client, requests):
+                await client.get_project(id="P1")
+            assert not session.closed
+            assert client.session is session
+        try:
+            await client.get_project(id="P1")
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("a closed shared session was used")
+    run(main())
+
+
+def test_client_can_be_reused_after_close():
+    async def main():
+        async with serve(ok) as (client, requests):
+            await client.get_project(id="P1")
+            first = client.session
+            await client.close()
+            assert first.closed
+            await client.get_project(id="P1")
+            assert client.session is not first and not client.session.closed
+    run(main())
+
+
+def test_run_returns_the_result_and_closes_the_client():
+    client = ModrinthClient()
+
+    async def work():
+        await client.start()
+        return client.session
+
+    session = client.run(work())
+    assert session.closed and client.session is None
@@ -0,0 +1,69 @@
+from modrinthpy import SQLiteCache
+
+from tests.support import json_response, project, run, serve
+
+
+def test_entries_persist_between_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SQLiteCache(path, ttls={"project/": 60})
+    cache.set("project/P1", {"id": "P1"}, etag="\"v1\"")
+    cache.close()
+    cache = SQLiteCache(path)
+    entry = cache.get("project/P1")
+    assert entry.data == {"id": "P1"} and entry.fresh
+    assert entry.conditional_headers() == {"If-None-Match": "\"v1\""}
+    assert cache._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    cache.invalidate("project/")
+    assert cache.get("project/P1") is None
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries=3)
+    cache.TOUCH_INTERVAL = 0
+    for index in range(3):
+        cache.set(f"project/P{index}", {"id": f"P{index}"})
+    cache.get("project/P0")
+    cache.set("project/P3", {"id": "P3"})
+    assert len(cache) <= 3
+    assert cache.get("project/P0") is not None and cache.get("project/P3") is not None
+    assert cache.get("project/P1") is None
+    cache.close()
+
+
+def test_total_size_is_bounded(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_bytes=2000)
+    for index in range(20):
+        cache.set(f"project/P{index}", {"id": f"P{index}", "body": "x" * 200})
+    assert cache.stats()["bytes"] <= 2000
+    assert cache.evictions > 0
+    assert cache.get("project/P19") is not None
+    cache.close()
+
+
+def test_refresh_extends_a_stale_entry(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), ttls={"project/": 0, "search": 60})
+    cache.set("project/P1", {"id": "P1"}, last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    assert not cache.get("project/P1").fresh
+    cache.ttls["project/"] = 60
+    cache.refresh("project/P1")
+    assert cache.get("project/P1").fresh
+    assert cache.revalidations == 1
+    cache.close()
+
+
+def test_a_new_client_is_served_from_disk(tmp_path):
+    path = str(tmp_path / "cache.db")
+
+    async def handler(request):
+        return json_response(project("P1"))
+
+    async def main():
+        async with serve(handler, cache=SQLiteCache(path)) as (client, requests):
+            await client.get_project(id="P1")
+            client.cache.close()
+        async with serve(handler, cache=SQLiteCache(path)) as (client, requests):
+            assert (await client.get_project(id="P1")).id == "P1"
+            assert requests.count("GET") == 0
+            client.cache.close()
+    run(main())
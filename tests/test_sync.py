@@ -0,0 +1,118 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from aiohttp import web
+
+from modrinthpy import SyncModrinthClient
+from modrinthpy.exceptions import ModrinthAPIError
+
+from tests.support import json_response, project
+
+
+async def handler(request):
+    path = request.path[len("/v2/"):]
+    if path == "search":
+        offset, limit = int(request.query["offset"]), int(request.query["limit"])
+        hits = [{"project_id": f"P{index}", "slug": f"p{index}", "title": f"P{index}"}
+                for index in range(offset, min(offset + limit, 5))]
+        return json_response({"hits": hits, "offset": offset, "limit": limit, "total_hits": 5})
+    project_id = path.split("/")[-1]
+    if project_id == "GONE":
+        return json_response({"error": "not_found", "description": "missing"}, status=404)
+    await asyncio.sleep(0.01)
+    return json_response(project(project_id))
+
+
+@contextmanager
+def sync_client(**options):
+    """
+    Serves ``handler`` from its own loop thread, as a blocking application talks to a remote API.
+    """
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    async def start():
+        runner = web.AppRunner(web.Application(), handle_signals=False)
+        runner.app.router.add_route("*", "/{tail:.*}", handler)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        return runner, site._server.sockets[0].getsockname()[1]
+
+    runner, port = asyncio.run_coroutine_threadsafe(start(), loop).result()
+    client = SyncModrinthClient(**options)
+    client.client.BASE_URL = f"http://127.0.0.1:{port}/v2"
+    try:
+        with client:
+            yield client
+    finally:
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def test_threads_share_one_loop_and_session():
+    with sync_client() as client:
+        with ThreadPoolExecutor(8) as pool:
+            projects = list(pool.map(lambda index: client.get_project(id=f"P{index}"), range(16)))
+        assert [item.id for item in projects] == [f"P{index}" for index in range(16)]
+        session = client.client.session
+        client.get_project(id="P1")
+        assert client.client.session is session
+
+
+def test_batch_and_map_keep_the_order():
+    with sync_client() as client:
+        results = client.batch([("get_project", (), {"id": "P1"}), ("get_project", (), {"slug": "p2"}),
+                                ("get_project", (), {"id": "GONE"})], return_exceptions=True)
+        assert [item.id for item in results[:2]] == ["P1", "p2"]
+        assert isinstance(results[2], ModrinthAPIError)
+        assert [item.id for item in client.map("get_version", ["V1", "V2"])] == ["V1", "V2"]
+        try:
+            client.get_project(id="GONE")
+        except ModrinthAPIError as error:
+            assert error.status_code == 404
+        else:
+            raise AssertionError("the error was not raised")
+
+
+def test_options_apply_to_the_calling_thread_only():
+    with sync_client() as client:
+        seen = {}
+        ready = threading.Barrier(2)
+
+        def worker(name, response_format):
+            with client.options(response_format=response_format):
+                ready.wait()
+                seen[name] = type(client.get_project(id="P1")).__name__
+
+        threads = [threading.Thread(target=worker, args=args) for args in (("json", "json"), ("model", "model"))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert seen == {"json": "dict", "model": "Project"}
+
+
+def test_iter_search_pages_through_results_with_the_thread_options():
+    with sync_client() as client:
+        assert [item.project_id for item in client.iter_search("x", page_size=2)] == [f"P{i}" for i in range(5)]
+        with client.options(response_format="json"):
+            hits = list(client.iter_search("x", page_size=2))
+        assert [type(item) for item in hits] == [dict] * 5
+
+
+def test_closed_client_rejects_calls():
+    with sync_client() as client:
+        pass
+    assert not client._thread.is_alive()
+    try:
+        client.get_project(id="P1")
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("a closed client accepted a call")
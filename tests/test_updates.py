@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import os
+
+from modrinthpy.updates import HashCache, hash_directory
+
+from tests.support import json_response, run, serve, version
+
+MODS = {"sodium.jar": b"sodium 0.5", "lithium.jar": b"lithium 0.11", "unknown.jar": b"local build"}
+
+
+def sha1(content: bytes) -> str:
+    return hashlib.sha1(content).hexdigest()
+
+
+def write_mods(directory):
+    for name, content in MODS.items():
+        (directory / name).write_bytes(content)
+    (directory / "notes.txt").write_text("not a mod")
+
+
+def lookup_server():
+    known = {sha1(MODS["sodium.jar"]): ("sodium-1", "sodium-2"), sha1(MODS["lithium.jar"]): ("lithium-1", "lithium-1")}
+    bodies = []
+
+    async def handler(request):
+        body = await request.json()
+        bodies.append((request.path, body))
+        index = 1 if request.path.endswith("/update") else 0
+        return json_response({digest: version(known[digest][index], "P")
+                              for digest in body["hashes"] if digest in known})
+
+    handler.bodies = bodies
+    return handler
+
+
+def test_updates_are_found_with_two_requests(tmp_path):
+    write_mods(tmp_path)
+    handler = lookup_server()
+
+    async def main():
+        async with serve(handler) as (client, requests):
+            updates = await client.check_mod_updates(str(tmp_path), loaders=["fabric"], game_versions=["1.20.1"])
+            by_name = {os.path.basename(update.path): update for update in updates}
+            assert sorted(by_name) == ["lithium.jar", "sodium.jar", "unknown.jar"]
+            assert by_name["sodium.jar"].update_available
+            assert by_name["sodium.jar"].latest.id == "sodium-2"
+            assert not by_name["lithium.jar"].update_available
+            assert by_name["unknown.jar"].current is None
+            assert requests.count("POST") == 2
+            update_body = dict(handler.bodies)["/v2/version_files/update"]
+            assert update_body["loaders"] == ["fabric"] and update_body["game_versions"] == ["1.20.1"]
+            assert sorted(update_body["hashes"]) == sorted(sha1(content) for content in MODS.values())
+    run(main())
+
+
+def test_unchanged_files_are_not_hashed_again(tmp_path):
+    mods = tmp_path / "mods"
+    mods.mkdir()
+    write_mods(mods)
+    cache_path = str(tmp_path / "hashes.json")
+
+    async def main():
+        cache = HashCache(cache_path)
+        first = await hash_directory(str(mods), cache=cache)
+        cache.save()
+        assert first == {str(mods / name): sha1(content) for name, content in MODS.items()}
+        cache = HashCache(cache_path)
+        (mods / "sodium.jar").write_bytes(b"sodium 0.6")
+        os.remove(mods / "lithium.jar")
+        hashed = []
+        loop = asyncio.get_event_loop()
+        original = loop.run_in_executor
+
+        def counting(executor, function, path, *args):
+            hashed.append(os.path.basename(path))
+            return original(executor, function, path, *args)
+
+        loop.run_in_executor = counting
+        try:
+            second = await hash_directory(str(mods), cache=cache)
+        finally:
+            del loop.run_in_executor
+        assert hashed == ["sodium.jar"]
+        assert second[str(mods / "sodium.jar")] == sha1(b"sodium 0.6")
+        assert str(mods / "lithium.jar") not in cache._entries
+    run(main())
+
+
+def test_hash_cache_is_kept_outside_the_directory(tmp_path):
+    write_mods(tmp_path)
+
+    async def main():
+        async with serve(lookup_server()) as (client, requests):
+            await client.check_mod_updates(str(tmp_path))
+        assert sorted(os.listdir(tmp_path)) == sorted(list(MODS) + ["notes.txt"])
+    run(main())
+
+
+def test_prune_keeps_entries_of_other_directories(tmp_path):
+    cache = HashCache()
+    stat = os.stat(__file__)
+    cache.set(str(tmp_path / "a" / "x.jar"), stat, "sha1", "1")
+    cache.set(str(tmp_path / "b" / "y.jar"), stat, "sha1", "2")
+    cache.prune([], str(tmp_path / "a"))
+    assert cache.get(str(tmp_path / "a" / "x.jar"), stat, "sha1") is None
+    assert cache.get(str(tmp_path / "b" / "y.jar"), stat, "sha1") == "2"
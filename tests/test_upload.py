@@ -0,0 +1,100 @@
+import hashlib
+import io
+import json
+
+from modrinthpy import RetryPolicy
+from modrinthpy.exceptions import HashMismatchError
+from modrinthpy.upload import UploadFile
+
+from tests.support import json_response, run, serve, version
+
+CONTENT = b"jar contents " * 5000
+
+
+def test_upload_file_hashes_and_reports_what_was_read(tmp_path):
+    path = tmp_path / "mod.jar"
+    path.write_bytes(CONTENT)
+    progress = []
+    for source in (str(path), CONTENT, io.BytesIO(CONTENT)):
+        upload = UploadFile(source, name="mod.jar", progress=lambda *args: progress.append(args))
+        assert upload.length == len(CONTENT)
+        assert upload.read(100) + upload.read() == CONTENT
+        assert upload.hexdigests()["sha1"] == hashlib.sha1(CONTENT).hexdigest()
+        assert progress[-1] == ("mod.jar", len(CONTENT), len(CONTENT))
+        upload.seek(0)
+        assert upload.tell() == 0 and upload.read() == CONTENT
+        try:
+            upload.seek(10)
+        except io.UnsupportedOperation:
+            pass
+        else:
+            raise AssertionError("seeking into the file was allowed")
+        upload.close()
+
+
+def upload_server(statuses=(), sha1=None):
+    queued = list(statuses)
+    received = []
+
+    async def handler(request):
+        reader = await request.multipart()
+        data, files = None, {}
+        async for part in reader:
+            if part.name == "data":
+                assert part.filename is None
+                data = json.loads(await part.read())
+            else:
+                files[part.filename] = await part.read()
+        received.append(files)
+        if queued:
+            return json_response({"error": "failed", "description": "injected"}, status=queued.pop(0))
+        hashes = [{"filename": name, "hashes": {"sha1": sha1 or hashlib.sha1(body).hexdigest()}}
+                  for name, body in files.items()]
+        return json_response(version("V1", data["project_id"], files=hashes))
+
+    handler.received = received
+    return handler
+
+
+VERSION = {"name": "1.0.0", "version_number": "1.0.0", "game_versions": ["1.20.1"], "version_type": "release",
+           "loaders": ["fabric"], "featured": False, "project_id": "P1", "file_parts": ["mod.jar"]}
+
+
+def test_files_are_streamed_from_paths(tmp_path):
+    path = tmp_path / "mod.jar"
+    path.write_bytes(CONTENT)
+    handler = upload_server()
+    progress = []
+
+    async def main():
+        async with serve(handler, api_key="token") as (client, requests):
+            created = await client.create_version(VERSION, [("mod.jar", str(path), "application/java-archive")],
+                                                  progress=lambda *args: progress.append(args))
+            assert created.id == "V1"
+            assert handler.received == [{"mod.jar": CONTENT}]
+            assert progress[-1] == ("mod.jar", len(CONTENT), len(CONTENT))
+    run(main())
+
+
+def test_retried_upload_sends_the_whole_file_again():
+    handler = upload_server(statuses=[503])
+
+    async def main():
+        retry = RetryPolicy(backoff_base=0.001, backoff_cap=0.001, methods=("POST",))
+        async with serve(handler, api_key="token", retry=retry) as (client, requests):
+            await client.create_version(VERSION, [("mod.jar", io.BytesIO(CONTENT), "application/java-archive")])
+            assert handler.received == [{"mod.jar": CONTENT}, {"mod.jar": CONTENT}]
+    run(main())
+
+
+def test_hash_mismatch_carries_the_created_version():
+    async def main():
+        async with serve(upload_server(sha1="0" * 40), api_key="token") as (client, requests):
+            try:
+                await client.create_version(VERSION, [("mod.jar", CONTENT, "application/java-archive")])
+            except HashMismatchError as error:
+                assert error.version.id == "V1"
+                assert error.expected == hashlib.sha1(CONTENT).hexdigest()
+            else:
+                raise AssertionError("the mismatch was not detected")
+    run(main())